@@ -1,20 +1,43 @@
 from functools import wraps
+from inspect import iscoroutinefunction
 from django.http import HttpResponseForbidden
 from django.contrib.auth.views import redirect_to_login
 
+
+async def aresolve_user(request):
+    """
+    Load request.user without blocking the event loop and pin the result, so
+    templates and later code in an async view read it without a sync query.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+def _check(request, roles):
+    """A response refusing ``request``, or None if the user may proceed."""
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if getattr(request.user, "is_disabled", False):
+        return HttpResponseForbidden("Account disabled by admin.")
+    if request.user.is_superuser:
+        return None
+    if getattr(request.user, "role", None) not in roles:
+        return HttpResponseForbidden("Insufficient permissions for this page.")
+    return None
+
+
 def role_required(*roles):
 
     def outer(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _awrapped(request, *args, **kwargs):
+                await aresolve_user(request)
+                return _check(request, roles) or await view_func(request, *args, **kwargs)
+            return _awrapped
+
         @wraps(view_func)
         def _wrapped(request, *args, **kwargs):
-            if not request.user.is_authenticated:
-                return redirect_to_login(request.get_full_path())
-            if getattr(request.user, "is_disabled", False):
-                return HttpResponseForbidden("Account disabled by admin.")
-            if request.user.is_superuser:
-                return view_func(request, *args, **kwargs)
-            if getattr(request.user, "role", None) not in roles:
-                return HttpResponseForbidden("Insufficient permissions for this page.")
-            return view_func(request, *args, **kwargs)
+            return _check(request, roles) or view_func(request, *args, **kwargs)
         return _wrapped
-    return outer
\ No newline at end of file
+    return outer
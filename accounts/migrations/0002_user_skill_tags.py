@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+def backfill_skill_tags(apps, schema_editor):
+    Skill = apps.get_model("core", "Skill")
+    User = apps.get_model("accounts", "User")
+    Through = User.skill_tags.through
+
+    rows = []
+    for pk, skills in User.objects.values_list("id", "skills").iterator():
+        names = {n.strip().lower()[:100] for n in (skills or "").split(",") if n.strip()}
+        rows.extend((pk, name) for name in names)
+    if not rows:
+        return
+    Skill.objects.bulk_create([Skill(name=n) for n in {name for _, name in rows}], ignore_conflicts=True)
+    ids = dict(Skill.objects.values_list("name", "id"))
+    Through.objects.bulk_create(
+        [Through(user_id=pk, skill_id=ids[name]) for pk, name in rows],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='users', to='core.skill'),
+        ),
+        migrations.RunPython(backfill_skill_tags, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from core.models import parse_skills
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ("admin", "Admin"),
@@ -13,6 +15,9 @@ class User(AbstractUser):
     is_disabled = models.BooleanField(default=False)
     summary = models.TextField(blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    skill_tags = models.ManyToManyField("core.Skill", related_name="users", blank=True)
 
     def skills_list(self):
-        return [s.strip().lower() for s in self.skills.split(",") if s.strip()]
\ No newline at end of file
+        if "skill_tags" in getattr(self, "_prefetched_objects_cache", {}):
+            return [s.name for s in self.skill_tags.all()]
+        return parse_skills(self.skills)
\ No newline at end of file
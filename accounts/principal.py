@@ -0,0 +1,92 @@
+"""
+Cached auth principal.
+
+AuthenticationMiddleware loads the whole User row on every request just so
+role_required can look at role, is_disabled and is_superuser. The principal
+is the handful of columns the decorators and templates use, plus the
+session auth hash, cached per user for AUTH_PRINCIPAL_TIMEOUT seconds.
+request.user is rebuilt from it as a User instance whose other fields are
+deferred, so it still works as a foreign key value and loads anything else
+(skills, summary, ...) on first access.
+
+Saving or deleting a User drops its principal (accounts.signals). Updates
+through QuerySet.update() bypass that and are picked up when the entry
+expires. Like the page cache, use a shared cache backend with several
+worker processes, or an admin's change only reaches the process that
+served it.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare
+
+from .models import User
+
+PRINCIPAL_TIMEOUT = getattr(settings, "AUTH_PRINCIPAL_TIMEOUT", 300)
+# from_db() expects values in concrete field order.
+PRINCIPAL_FIELDS = tuple(
+    f.attname
+    for f in User._meta.concrete_fields
+    if f.attname in {
+        "id", "username", "first_name", "last_name", "email", "role", "company",
+        "is_active", "is_staff", "is_superuser", "is_disabled",
+    }
+)
+
+
+def get_cache():
+    return caches[getattr(settings, "AUTH_PRINCIPAL_CACHE_ALIAS", "default")]
+
+
+def principal_key(user_id):
+    return f"accounts:principal:{user_id}"
+
+
+def invalidate(user_id):
+    get_cache().delete(principal_key(user_id))
+
+
+def _principal(user):
+    values = [getattr(user, name) for name in PRINCIPAL_FIELDS]
+    return values, user.get_session_auth_hash()
+
+
+def _load(user_id, backend_path):
+    key = principal_key(user_id)
+    cached = get_cache().get(key)
+    if cached is not None:
+        return cached
+    user = auth.load_backend(backend_path).get_user(user_id)
+    if user is None:
+        return None
+    cached = _principal(user)
+    get_cache().set(key, cached, PRINCIPAL_TIMEOUT)
+    return cached
+
+
+def get_user(request):
+    """django.contrib.auth.get_user that reads the principal cache first."""
+    try:
+        user_id = User._meta.pk.to_python(request.session[auth.SESSION_KEY])
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    cached = _load(user_id, backend_path)
+    if cached is None:
+        return AnonymousUser()
+    values, auth_hash = cached
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(session_hash, auth_hash)):
+        # Rotated SECRET_KEY or a stale session: Django's checks, flushing
+        # the session when nothing verifies it.
+        return auth.get_user(request)
+    return User.from_db("default", PRINCIPAL_FIELDS, values)
+
+
+async def aget_user(request):
+    return await sync_to_async(get_user)(request)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import sync_skill_tags
+
+from .models import User
+from .principal import PRINCIPAL_FIELDS, invalidate
+
+
+@receiver(post_save, sender=User)
+def sync_user_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "skills" not in update_fields):
+        return
+    sync_skill_tags(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_principal(sender, instance, raw=False, update_fields=None, **kwargs):
+    # login() saves last_login only; that leaves the principal as it was.
+    if update_fields is not None and not {"password", *PRINCIPAL_FIELDS} & set(update_fields):
+        return
+    invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_principal(sender, instance, **kwargs):
+    invalidate(instance.pk)
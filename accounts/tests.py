@@ -1,3 +1,57 @@
+from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .models import User
+from .principal import get_cache, principal_key
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_user("alice", "alice@example.com", "s3cret-pass", role="applicant")
+        self.client.force_login(self.user)
+        self.url = reverse("jobs:my_applications")
+
+    def auth_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        tables = ('FROM "django_session"', 'FROM "accounts_user"')
+        return response, [q["sql"] for q in captured if q["sql"].split(" WHERE ")[0].endswith(tables)]
+
+    def test_warm_requests_skip_session_and_user_queries(self):
+        self.auth_queries()
+        response, queries = self.auth_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertIsNotNone(get_cache().get(principal_key(self.user.pk)))
+
+    def test_admin_changes_apply_on_next_request(self):
+        self.auth_queries()
+        self.user.is_disabled = True
+        self.user.save()
+        self.assertEqual(self.auth_queries()[0].status_code, 403)
+
+        self.user.is_disabled = False
+        self.user.role = "employer"
+        self.user.save(update_fields=["is_disabled", "role"])
+        self.assertEqual(self.client.get(reverse("jobs:employer_jobs")).status_code, 200)
+
+    def test_password_change_ends_other_sessions(self):
+        self.auth_queries()
+        self.user.set_password("n3w-pass-word")
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(settings.LOGIN_URL))
+
+    def test_request_user_is_a_usable_instance(self):
+        self.auth_queries()
+        response = self.client.get(reverse("applicant_dashboard"))
+        user = response.wsgi_request.user
+        self.assertEqual(user, self.user)
+        self.assertEqual(user.role, "applicant")
+        self.assertIn("summary", user.get_deferred_fields())
+        self.assertEqual(user.summary, "")  # deferred fields load on demand
@@ -1,13 +1,18 @@
+import logging
+
 from django.contrib import messages
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
 from django.conf import settings
+from core.mail import enqueue_mail
+from core.metrics import timer
 from .models import User
 
 from .forms import LoginForm, SignupForm
 
+logger = logging.getLogger(__name__)
+
 def login_view(request):
     login_form = LoginForm(request.POST or None)
     signup_form = SignupForm()
@@ -65,16 +70,11 @@ def signup_view(request):
             )
 
             try:
-                send_mail(
-                    subject=subject,
-                    message=message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[user.email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                # In a real project you would log this; for now we avoid breaking signup
-                print("Error sending welcome email:", e)
+                with timer("email"):
+                    enqueue_mail(subject, message, [user.email], from_email=settings.DEFAULT_FROM_EMAIL)
+            except Exception:
+                # never break signup over the welcome email
+                logger.exception("Queueing welcome email for user %s failed", user.pk)
 
         messages.success(request, "Account created. Please log in.")
         return redirect("login")
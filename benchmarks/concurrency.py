@@ -0,0 +1,88 @@
+"""
+Concurrent apply_to_job throughput.
+
+Each worker thread has its own test client, logged in as its own applicant,
+and therefore its own database connection. All workers apply to the same
+set of open jobs, so they contend on the same Application, stats and outbox
+rows the way simultaneous gunicorn workers do. Failed requests (e.g.
+"database is locked") are counted, not retried.
+"""
+import threading
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from jobs.models import Job
+
+from .runner import percentile
+
+# SQLite settings compared by the benchmark; "tuned" is what settings.py uses.
+SQLITE_CONFIGS = {
+    "sqlite-default": {"init_command": "PRAGMA journal_mode=DELETE;", "transaction_mode": None, "timeout": 5},
+    "sqlite-tuned": None,  # the configured OPTIONS
+}
+
+
+def _worker(user, job_ids, latencies, failures, barrier):
+    client = Client(raise_request_exception=False)
+    client.force_login(user)
+    barrier.wait()
+    try:
+        for job_id in job_ids:
+            resume = SimpleUploadedFile("resume.pdf", b"%PDF-1.4\n%bench\n%%EOF\n", content_type="application/pdf")
+            start = time.perf_counter()
+            response = client.post(reverse("jobs:apply", args=[job_id]), {"resume": resume})
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 302:
+                failures.append(response.status_code)
+    finally:
+        connections.close_all()
+
+
+def run_apply(applicants, jobs_per_worker) -> dict:
+    """Every applicant applies to ``jobs_per_worker`` open jobs concurrently."""
+    job_ids = list(Job.objects.open().order_by("pk").values_list("pk", flat=True)[:jobs_per_worker])
+    latencies, failures = [], []
+    barrier = threading.Barrier(len(applicants) + 1)
+    threads = [
+        threading.Thread(target=_worker, args=(user, job_ids[i:] + job_ids[:i], latencies, failures, barrier))
+        for i, user in enumerate(applicants)
+    ]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    ok = len(latencies) - len(failures)
+    return {
+        "workers": len(applicants),
+        "requests": len(latencies),
+        "ok": ok,
+        "failed": len(failures),
+        "per_second": round(ok / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+    }
+
+
+def configurations(connection):
+    """(label, OPTIONS or None to keep the configured ones) for this backend."""
+    if connection.vendor == "sqlite":
+        return list(SQLITE_CONFIGS.items())
+    options = connection.settings_dict["OPTIONS"]
+    label = f"{connection.vendor}-{'pool' if options.get('pool') else 'conn_max_age'}"
+    return [(label, None)]
+
+
+def applicants_for(label, count):
+    return [
+        User.objects.create(username=f"bench_{label}_{i}", email=f"{label}{i}@bench.local", role="applicant", skills="Python, SQL")
+        for i in range(count)
+    ]
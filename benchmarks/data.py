@@ -0,0 +1,128 @@
+"""
+Synthetic portal data for benchmarks.
+
+Rows are bulk-inserted and the derived state the model signals would
+normally maintain (skill tags, search index, stats, recommendations, match
+scores) is rebuilt once at the end, so generating thousands of rows takes
+seconds. The same seed always produces the same data.
+"""
+import datetime
+import random
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import sync_skill_tags
+from jobs import matching, stats
+from jobs.models import Application, Job
+from jobs.search import get_search_backend
+from jobs.storage import resume_storage
+
+SKILLS = [
+    "Python", "Django", "Flask", "FastAPI", "SQL", "PostgreSQL", "MySQL", "Redis",
+    "JavaScript", "TypeScript", "React", "Vue", "Node.js", "HTML", "CSS", "Docker",
+    "Kubernetes", "AWS", "GCP", "Azure", "Terraform", "Linux", "Git", "Go", "Rust",
+    "Java", "Kotlin", "Spring", "C#", ".NET", "Pandas", "NumPy", "Machine Learning",
+    "Data Analysis", "Excel", "Tableau", "Figma", "Product Management", "Scrum", "Testing",
+]
+ROLES = [
+    "Backend Developer", "Frontend Engineer", "Full Stack Developer", "Data Analyst",
+    "Data Engineer", "DevOps Engineer", "Site Reliability Engineer", "QA Engineer",
+    "Machine Learning Engineer", "Product Designer", "Mobile Developer", "Platform Engineer",
+]
+LEVELS = ["Junior", "", "Senior", "Lead", "Staff"]
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Bangalore", "Toronto", "Lagos", "Sydney", "Hybrid - Paris"]
+SENTENCES = [
+    "You will design, build and operate services used by thousands of customers.",
+    "Our team values code review, testing and small, frequent releases.",
+    "Experience with {a} and {b} is expected; {c} is a plus.",
+    "You will work closely with product, design and support.",
+    "We offer flexible hours, a learning budget and health insurance.",
+    "On-call is shared across the team and rarely paged.",
+    "You will own features end to end, from design documents to monitoring.",
+]
+STATUS_WEIGHTS = {"applied": 50, "under_review": 20, "shortlisted": 10, "rejected": 15, "hired": 2, "withdrawn": 3}
+
+
+def _description(rng, skills):
+    a, b, c = rng.sample(skills + SKILLS, 3)
+    return " ".join(s.format(a=a, b=b, c=c) for s in rng.sample(SENTENCES, rng.randint(3, 6)))
+
+
+def _pdf(n):
+    # Minimal valid-looking PDF; a handful of distinct stubs exercises dedup.
+    return ContentFile(b"%PDF-1.4\n%benchmark resume " + str(n).encode() + b"\n%%EOF\n")
+
+
+def generate(employers=20, jobs=500, applicants=200, applications=2000, seed=42) -> dict:
+    """Populate the current database; returns the row counts created."""
+    rng = random.Random(seed)
+    today = timezone.now().date()
+
+    User.objects.bulk_create([
+        User(username=f"bench_employer{i}", email=f"employer{i}@bench.local", role="employer", company=f"Company {i}")
+        for i in range(employers)
+    ])
+    User.objects.bulk_create([
+        User(
+            username=f"bench_applicant{i}",
+            email=f"applicant{i}@bench.local",
+            role="applicant",
+            skills=", ".join(rng.sample(SKILLS, rng.randint(2, 8))),
+        )
+        for i in range(applicants)
+    ])
+    employer_ids = list(User.objects.filter(role="employer", username__startswith="bench_").values_list("pk", flat=True))
+    applicant_ids = list(User.objects.filter(role="applicant", username__startswith="bench_").values_list("pk", flat=True))
+
+    job_rows = []
+    for i in range(jobs):
+        skills = rng.sample(SKILLS, rng.randint(2, 7))
+        salary_min = rng.choice([None, rng.randrange(30, 120) * 1000])
+        job_rows.append(Job(
+            employer_id=rng.choice(employer_ids),
+            title=" ".join(filter(None, [rng.choice(LEVELS), rng.choice(ROLES)])),
+            description=_description(rng, skills),
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choice(Job.JOB_TYPES)[0],
+            salary_min=salary_min,
+            salary_max=salary_min + rng.randrange(5, 60) * 1000 if salary_min else None,
+            skills=", ".join(skills),
+            # ~10% already expired, the rest open for a few weeks
+            deadline=today + datetime.timedelta(days=rng.randint(-30, 60) if rng.random() < 0.1 else rng.randint(1, 60)),
+        ))
+    Job.objects.bulk_create(job_rows, batch_size=500)
+    job_ids = list(Job.objects.filter(employer_id__in=employer_ids).values_list("pk", flat=True))
+
+    resumes = [resume_storage.save("resume.pdf", _pdf(n)) for n in range(10)]
+    pairs = set()
+    limit = min(applications, len(job_ids) * len(applicant_ids))
+    while len(pairs) < limit:
+        pairs.add((rng.choice(job_ids), rng.choice(applicant_ids)))
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    Application.objects.bulk_create(
+        [
+            Application(
+                job_id=job_id,
+                applicant_id=applicant_id,
+                resume=rng.choice(resumes),
+                cover_letter="I would love to join your team.",
+                status=rng.choices(statuses, weights)[0],
+            )
+            for job_id, applicant_id in sorted(pairs)
+        ],
+        batch_size=500,
+    )
+
+    # bulk_create skipped the signals; rebuild what they maintain.
+    for instance in User.objects.filter(pk__in=applicant_ids).iterator():
+        sync_skill_tags(instance)
+    for instance in Job.objects.filter(pk__in=job_ids).iterator():
+        sync_skill_tags(instance)
+    get_search_backend().rebuild()
+    stats.reconcile()
+    for user in User.objects.filter(pk__in=applicant_ids).iterator():
+        matching.refresh_applicant(user)
+
+    return {"employers": employers, "jobs": jobs, "applicants": applicants, "applications": len(pairs)}
@@ -0,0 +1,82 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from benchmarks import data, report, runner
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot views against synthetic data in a throwaway test database "
+        "and compare with a stored baseline. Runs offline; never touches the real database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employers", type=int, default=20)
+        parser.add_argument("--jobs", type=int, default=500)
+        parser.add_argument("--applicants", type=int, default=200)
+        parser.add_argument("--applications", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--only", nargs="*", help="Scenario names to run.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare with.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline.")
+        parser.add_argument("--threshold", type=float, default=report.DEFAULT_THRESHOLD,
+                            help="Relative p50 slowdown reported as a regression.")
+        parser.add_argument("--json", dest="json_path", help="Also write the raw results here.")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        dataset = {k: options[k] for k in ("employers", "jobs", "applicants", "applications", "seed")}
+
+        # One log line per benchmark request would swamp the output.
+        request_log = logging.getLogger("jobportal.requests")
+        log_level = request_log.level
+        request_log.setLevel(logging.WARNING)
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with tempfile.TemporaryDirectory() as media, override_settings(
+                MEDIA_ROOT=media,
+                CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+            ):
+                self.stdout.write(f"Generating data: {dataset}")
+                data.generate(**{k: v for k, v in dataset.items()})
+                self.stdout.write(f"Running scenarios ({options['iterations']} iterations each)")
+                results = runner.run(options["iterations"], only=options["only"], stdout=self.stdout)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            request_log.setLevel(log_level)
+
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(report.snapshot(results, dataset), indent=2) + "\n")
+        if options["save_baseline"]:
+            report.save_baseline(options["baseline"], results, dataset)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}."))
+            return
+
+        baseline = {}
+        if Path(options["baseline"]).exists():
+            baseline = report.load_baseline(options["baseline"])
+            if baseline.get("dataset") != dataset:
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline was measured on {baseline.get('dataset')}; comparisons are only indicative."
+                ))
+        rows = report.compare(results, baseline, options["threshold"])
+        self.stdout.write(report.format_report(rows))
+        slower = report.regressions(rows)
+        if slower and options["fail_on_regression"]:
+            raise CommandError(f"Regressions: {', '.join(slower)}")
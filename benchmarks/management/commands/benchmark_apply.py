@@ -0,0 +1,65 @@
+import logging
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from benchmarks import concurrency, data
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent apply_to_job throughput against a throwaway test database on the "
+        "configured backend. SQLite is compared with and without the WAL/IMMEDIATE settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent clients.")
+        parser.add_argument("--jobs-per-worker", type=int, default=20)
+
+    def handle(self, *args, **options):
+        request_log = logging.getLogger("jobportal.requests")
+        log_level = request_log.level
+        request_log.setLevel(logging.WARNING)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == "sqlite":
+                # threads need a shared on-disk database, not the in-memory default
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp, "bench.sqlite3")
+            setup_test_environment()
+            old_config = setup_databases(verbosity=0, interactive=False)
+            original = connection.settings_dict["OPTIONS"]
+            results = []
+            try:
+                with override_settings(
+                    MEDIA_ROOT=os.path.join(tmp, "media"),
+                    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+                ):
+                    data.generate(employers=10, jobs=options["jobs_per_worker"] * 2, applicants=0, applications=0)
+                    for label, config in concurrency.configurations(connection):
+                        connections.close_all()
+                        connection.settings_dict["OPTIONS"] = original if config is None else {**original, **config}
+                        applicants = concurrency.applicants_for(label, options["workers"])
+                        connections.close_all()
+                        results.append((label, concurrency.run_apply(applicants, options["jobs_per_worker"])))
+            finally:
+                connection.settings_dict["OPTIONS"] = original
+                connections.close_all()
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+                request_log.setLevel(log_level)
+
+        self.stdout.write(f"{'configuration':<20} {'workers':>7} {'ok':>6} {'failed':>6} {'apply/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for label, r in results:
+            self.stdout.write(
+                f"{label:<20} {r['workers']:>7} {r['ok']:>6} {r['failed']:>6} {r['per_second']:>8} "
+                f"{r['p50_ms']:>8} {r['p99_ms']:>8}"
+            )
@@ -0,0 +1,68 @@
+"""
+Baseline storage and comparison for benchmark results.
+
+A baseline is the JSON written by ``manage.py benchmark --save-baseline``:
+the results per scenario plus the dataset size and versions they were
+measured with. A scenario regresses when its p50 latency grows by more than
+the threshold (relative) or it issues more queries than the baseline.
+"""
+import json
+import platform
+
+import django
+
+DEFAULT_THRESHOLD = 0.25
+
+
+def snapshot(results, dataset) -> dict:
+    return {
+        "dataset": dataset,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "results": results,
+    }
+
+
+def load_baseline(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, dataset) -> None:
+    with open(path, "w") as f:
+        json.dump(snapshot(results, dataset), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD) -> list[dict]:
+    """One row per scenario with the baseline values, the change and a verdict."""
+    rows = []
+    previous = baseline.get("results", {})
+    for name, current in results.items():
+        row = {"name": name, "p50_ms": current["p50_ms"], "queries": current["queries"], "verdict": "new"}
+        before = previous.get(name)
+        if before:
+            change = (current["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+            row.update(base_p50_ms=before["p50_ms"], base_queries=before["queries"], change=change)
+            if current["queries"] > before["queries"] or change > threshold:
+                row["verdict"] = "REGRESSION"
+            elif change < -threshold or current["queries"] < before["queries"]:
+                row["verdict"] = "improved"
+            else:
+                row["verdict"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_report(rows) -> str:
+    lines = [f"{'scenario':<22} {'p50 ms':>9} {'base':>9} {'change':>8} {'queries':>9}  verdict"]
+    for row in rows:
+        base = f"{row['base_p50_ms']:.2f}" if "base_p50_ms" in row else "-"
+        change = f"{row['change']:+.0%}" if "change" in row else "-"
+        queries = f"{row['queries']}" + (f"/{row['base_queries']}" if "base_queries" in row else "")
+        lines.append(f"{row['name']:<22} {row['p50_ms']:>9.2f} {base:>9} {change:>8} {queries:>9}  {row['verdict']}")
+    return "\n".join(lines)
+
+
+def regressions(rows) -> list[str]:
+    return [row["name"] for row in rows if row["verdict"] == "REGRESSION"]
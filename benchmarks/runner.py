@@ -0,0 +1,136 @@
+"""
+Micro-benchmarks of the portal's views through the Django test client.
+
+Each scenario issues the same request ``iterations`` times (after a few
+warm-up requests) and records wall-clock latency and the number of SQL
+queries per request. The page cache is replaced by a dummy backend so the
+views themselves are measured, not cache hits.
+"""
+import math
+import statistics
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from jobs import typeahead
+from jobs.models import Job
+
+WARMUP = 3
+
+
+class Scenario:
+    def __init__(self, name, request, user=None):
+        self.name = name
+        self.request = request  # callable(client) -> response, one per iteration
+        self.user = user
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _get(url, data=None):
+    return lambda client: client.get(url, data)
+
+
+def _apply_requests(applicant, jobs):
+    # Every iteration applies to a different job, so none hits the
+    # "already applied" shortcut.
+    targets = iter(jobs)
+
+    def request(client):
+        job = next(targets)
+        resume = SimpleUploadedFile("resume.pdf", b"%PDF-1.4\n%benchmark\n%%EOF\n", content_type="application/pdf")
+        return client.post(reverse("jobs:apply", args=[job.pk]), {"resume": resume, "cover_letter": "Hello"})
+
+    return request
+
+
+def build_scenarios(iterations) -> list[Scenario]:
+    """Scenarios over the data produced by benchmarks.data.generate."""
+    employer = (
+        User.objects.filter(role="employer", username__startswith="bench_")
+        .annotate(n=Count("jobs__applications"))
+        .order_by("-n")
+        .first()
+    )
+    busiest_job = Job.objects.filter(employer=employer).annotate(n=Count("applications")).order_by("-n").first()
+    applicant = (
+        User.objects.filter(role="applicant", username__startswith="bench_")
+        .annotate(n=Count("applications"))
+        .order_by("-n")
+        .first()
+    )
+    open_jobs = Job.objects.open().exclude(applications__applicant=applicant).order_by("pk")
+    newest = Job.objects.open().order_by("-created_at").first()
+    list_url = reverse("jobs:list")
+    # Serve typeahead from a finished index, as once the builder has run.
+    typeahead.reset()
+    typeahead.get_index(wait=True)
+
+    return [
+        Scenario("job_list", _get(list_url)),
+        Scenario("job_list_page_5", _get(list_url, {"page": 5})),
+        Scenario("job_list_cursor", _get(list_url, {"paging": "cursor"})),
+        Scenario("job_list_search", _get(list_url, {"q": "senior backend developer"})),
+        Scenario("job_list_filters", _get(list_url, {"location": "remote", "skills": "python,sql", "skills_match": "any"})),
+        Scenario("job_list_salary", _get(list_url, {"salary_min": 80000, "salary_max": 120000, "sort": "salary"})),
+        Scenario("job_list_salary_combo", _get(list_url, {
+            "location": "remote", "skills": "python", "salary_min": 60000, "sort": "salary",
+        })),
+        Scenario("job_detail", _get(newest.get_absolute_url())),
+        Scenario("typeahead", _get(reverse("jobs:typeahead"), {"field": "q", "prefix": "dev"})),
+        Scenario("apply_to_job", _apply_requests(applicant, list(open_jobs[: iterations + WARMUP])), applicant),
+        Scenario("my_applications", _get(reverse("jobs:my_applications")), applicant),
+        Scenario("applicant_dashboard", _get(reverse("applicant_dashboard")), applicant),
+        Scenario("job_applicants", _get(reverse("jobs:job_applicants", args=[busiest_job.pk])), employer),
+        Scenario("employer_jobs", _get(reverse("jobs:employer_jobs")), employer),
+        Scenario("employer_dashboard", _get(reverse("employer_dashboard")), employer),
+    ]
+
+
+def run_scenario(scenario, iterations) -> dict:
+    client = Client()
+    if scenario.user is not None:
+        client.force_login(scenario.user)
+    for _ in range(WARMUP):
+        scenario.request(client)
+
+    latencies, queries, statuses = [], [], set()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = scenario.request(client)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p90_ms": round(percentile(latencies, 90), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries": max(queries),
+        "status": sorted(statuses),
+    }
+
+
+def run(iterations=50, only=None, stdout=None) -> dict:
+    """Run every scenario (or those named in ``only``); returns results by name."""
+    results = {}
+    for scenario in build_scenarios(iterations):
+        if only and scenario.name not in only:
+            continue
+        results[scenario.name] = run_scenario(scenario, iterations)
+        if stdout is not None:
+            stdout.write(f"  {scenario.name}: p50 {results[scenario.name]['p50_ms']} ms")
+    return results
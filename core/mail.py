@@ -0,0 +1,172 @@
+"""
+Database-backed outbox for outgoing email.
+
+Request handlers only call enqueue_mail/enqueue_mass_mail, which insert
+OutboundEmail rows. A worker (``manage.py send_queued_mail --loop``) drains
+due rows over a single SMTP connection per batch, handing the batch to one
+send_messages() call, and retries failures with exponential backoff.
+"""
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+MAX_ATTEMPTS = getattr(settings, "EMAIL_QUEUE_MAX_ATTEMPTS", 5)
+BACKOFF_SECONDS = getattr(settings, "EMAIL_QUEUE_BACKOFF_SECONDS", 60)
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+# How long a worker owns the rows it claimed before others may retry them.
+CLAIM_SECONDS = 5 * 60
+
+
+def _default_from():
+    return getattr(settings, "DEFAULT_FROM_EMAIL", None) or "no-reply@jobportal.local"
+
+
+def enqueue_mail(subject: str, message: str, recipient_list: list[str], from_email: str | None = None):
+    """Queue one email; empty recipients are dropped. Returns the row or None."""
+    recipients = [e for e in recipient_list if e]
+    if not recipients:
+        return None
+    return OutboundEmail.objects.create(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or _default_from(),
+        recipients=recipients,
+    )
+
+
+def enqueue_mass_mail(datatuple) -> int:
+    """
+    Queue many emails in one INSERT. ``datatuple`` has the same shape as for
+    django.core.mail.send_mass_mail: (subject, message, from_email, recipient_list).
+    """
+    rows = []
+    for subject, message, from_email, recipient_list in datatuple:
+        recipients = [e for e in recipient_list if e]
+        if recipients:
+            rows.append(OutboundEmail(
+                subject=subject[:255],
+                body=message,
+                from_email=from_email or _default_from(),
+                recipients=recipients,
+            ))
+    OutboundEmail.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS))
+
+
+def _claim(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        rows = list(due)
+        OutboundEmail.objects.filter(pk__in=[r.pk for r in rows]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+        )
+    return rows
+
+
+def _failed(row, error):
+    row.attempts += 1
+    row.last_error = str(error)[:2000]
+    if row.attempts >= MAX_ATTEMPTS:
+        row.status = "failed"
+    else:
+        row.next_attempt_at = timezone.now() + backoff(row.attempts)
+
+
+class _TrackedMessages(list):
+    """A message list that remembers how far the backend iterated into it."""
+
+    position = 0
+
+    def __iter__(self):
+        for self.position, message in enumerate(super().__iter__()):
+            yield message
+
+
+def _sent(row):
+    row.status = "sent"
+    row.sent_at = timezone.now()
+    row.attempts += 1
+
+
+def _requeued(row):
+    """Release a claimed row that was not tried, without counting an attempt."""
+    row.next_attempt_at = timezone.now()
+
+
+def _send_batch(connection, rows) -> tuple[int, int]:
+    """
+    Send ``rows`` in as few send_messages() calls as possible. Backends send
+    in order and stop at the first error, so when a call raises, the rows
+    before the message it stopped on were sent, that row failed, and the
+    rest go out in the next call. If the server dropped the connection, the
+    next call goes over a new one; when that cannot be opened the rest are
+    requeued untried.
+    """
+    sent = failed = 0
+    while rows:
+        messages = _TrackedMessages(
+            EmailMessage(row.subject, row.body, row.from_email, row.recipients, connection=connection)
+            for row in rows
+        )
+        try:
+            connection.send_messages(messages)
+        except Exception as e:
+            stop = messages.position
+            _failed(rows[stop], e)
+            failed += 1
+            done, rows = rows[:stop], rows[stop + 1:]
+            if isinstance(e, SMTPServerDisconnected) and rows:
+                try:
+                    connection.close()
+                    connection.open()
+                except Exception:
+                    for row in rows:
+                        _requeued(row)
+                    rows = []
+        else:
+            done, rows = rows, []
+        for row in done:
+            _sent(row)
+        sent += len(done)
+    return sent, failed
+
+
+def send_queued_mail(batch_size: int = 100, connection=None) -> tuple[int, int]:
+    """
+    Send up to ``batch_size`` due emails over one connection.
+    Returns (sent, failed) counts for this batch.
+    """
+    rows = _claim(batch_size)
+    if not rows:
+        return 0, 0
+
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for row in rows:
+            _failed(row, e)
+        sent, failed = 0, len(rows)
+    else:
+        try:
+            sent, failed = _send_batch(connection, rows)
+        finally:
+            connection.close()
+
+    OutboundEmail.objects.bulk_update(rows, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"])
+    return sent, failed
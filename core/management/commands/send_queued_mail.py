@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound emails. Use --loop to run as a long-lived worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when the outbox is empty.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_queued_mail(batch_size=options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            if not options["loop"]:
+                break
+            if not (sent or failed):
+                time.sleep(options["interval"])
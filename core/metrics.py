@@ -0,0 +1,163 @@
+"""
+Per-request instrumentation.
+
+RequestMetricsMiddleware opens a RequestMetrics for each request and keeps
+it in a context variable; the pieces below add to it from wherever the time
+is spent:
+
+  * SQL: an execute wrapper installed on every database connection
+    (``connection_created``) counts queries and their duration.
+  * Templates: core.templates.DjangoTemplates times each top-level render.
+  * Email: functions decorated with ``@timed("email")``.
+
+Finished requests are logged as structured records and aggregated in an
+in-process registry rendered in the Prometheus text format at /metrics.
+Each worker process keeps its own registry.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_current = ContextVar("request_metrics", default=None)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TIMED_KINDS = ("sql", "template", "email")
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.seconds = dict.fromkeys(TIMED_KINDS, 0.0)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self, wall) -> dict:
+        return {
+            "duration_ms": round(wall * 1000, 2),
+            "queries": self.queries,
+            **{f"{kind}_ms": round(s * 1000, 2) for kind, s in self.seconds.items()},
+        }
+
+
+def current():
+    return _current.get()
+
+
+def start():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timer(kind):
+    """Add the time spent in the block to the current request's ``kind``."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.seconds[kind] += time.perf_counter() - started
+
+
+def timed(kind):
+    def outer(func):
+        @wraps(func)
+        def _wrapped(*args, **kwargs):
+            with timer(kind):
+                return func(*args, **kwargs)
+        return _wrapped
+    return outer
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.seconds["sql"] += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # connection_created fires on every reconnect of the same wrapper.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class Registry:
+    """Counters and a latency histogram per (view, method, status)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.buckets = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+        self.duration_sum = defaultdict(float)
+        self.queries = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def observe(self, view, method, status, metrics, wall):
+        with self._lock:
+            self.requests[(view, method, str(status))] += 1
+            self.buckets[view][bisect_left(BUCKETS, wall)] += 1
+            self.duration_sum[view] += wall
+            self.queries[view] += metrics.queries
+            for kind, s in metrics.seconds.items():
+                self.seconds[(view, kind)] += s
+
+    def render(self, gauges=()) -> str:
+        """Prometheus text exposition; ``gauges`` adds (name, help, value) lines."""
+        lines = [
+            "# HELP jobportal_requests_total Requests served.",
+            "# TYPE jobportal_requests_total counter",
+        ]
+        with self._lock:
+            for (view, method, status), n in sorted(self.requests.items()):
+                lines.append(f'jobportal_requests_total{{view="{view}",method="{method}",status="{status}"}} {n}')
+
+            lines += [
+                "# HELP jobportal_request_duration_seconds Wall time per request.",
+                "# TYPE jobportal_request_duration_seconds histogram",
+            ]
+            for view, counts in sorted(self.buckets.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), counts):
+                    cumulative += n
+                    lines.append(f'jobportal_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'jobportal_request_duration_seconds_sum{{view="{view}"}} {self.duration_sum[view]:.6f}')
+                lines.append(f'jobportal_request_duration_seconds_count{{view="{view}"}} {cumulative}')
+
+            lines += [
+                "# HELP jobportal_db_queries_total SQL queries issued by requests.",
+                "# TYPE jobportal_db_queries_total counter",
+            ]
+            lines += [f'jobportal_db_queries_total{{view="{v}"}} {n}' for v, n in sorted(self.queries.items())]
+            lines += [
+                "# HELP jobportal_time_seconds_total Request time spent in SQL, templates and email.",
+                "# TYPE jobportal_time_seconds_total counter",
+            ]
+            lines += [
+                f'jobportal_time_seconds_total{{view="{v}",kind="{k}"}} {s:.6f}'
+                for (v, k), s in sorted(self.seconds.items())
+            ]
+        for name, help_text, value in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
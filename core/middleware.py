@@ -0,0 +1,126 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+
+from . import metrics, profiling, replicas
+
+logger = logging.getLogger("jobportal.requests")
+
+
+class RequestMetricsMiddleware:
+    """
+    Times every request (wall, SQL, templates, email, query count), logs one
+    structured record per request, feeds the /metrics registry and adds a
+    Server-Timing header. Optionally samples the request's stack, see
+    core.profiling. Put it first in MIDDLEWARE so it covers the others.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        current, token = metrics.start()
+        sampler, forced = self._start_sampler(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish(token)
+            if sampler:
+                sampler.stop()
+        return self._record(request, response, current, sampler, forced)
+
+    async def __acall__(self, request):
+        current, token = metrics.start()
+        sampler, forced = self._start_sampler(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish(token)
+            if sampler:
+                sampler.stop()
+        return self._record(request, response, current, sampler, forced)
+
+    def _start_sampler(self, request):
+        profile, forced = profiling.should_profile(request)
+        return (profiling.StackSampler().start() if profile else None), forced
+
+    def _record(self, request, response, current, sampler, forced):
+        wall = current.elapsed()
+        view = getattr(request.resolver_match, "view_name", None) or "unresolved"
+        metrics.registry.observe(view, request.method, response.status_code, current, wall)
+
+        fields = current.as_dict(wall)
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={"metrics": {"view": view, "method": request.method, "path": request.path,
+                               "status": response.status_code, **fields}},
+        )
+        response["Server-Timing"] = ", ".join([
+            f"total;dur={fields['duration_ms']}",
+            f"db;dur={fields['sql_ms']}",
+            f"tpl;dur={fields['template_ms']}",
+            f"email;dur={fields['email_ms']}",
+        ])
+        if sampler and (forced or profiling.is_slow(wall)):
+            path = profiling.dump(sampler, request, wall)
+            logger.info("Profile written to %s", path, extra={"metrics": {"view": view, "profile": path}})
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Tracks database writes per request for core.replicas and, after a
+    write, keeps the client on the primary for REPLICA_STICKY_SECONDS via a
+    cookie. Does nothing visible while no replicas are configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state, token = replicas.begin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.end(token)
+        return self._pin(state, response)
+
+    async def __acall__(self, request):
+        state, token = replicas.begin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replicas.end(token)
+        return self._pin(state, response)
+
+    def _pin(self, state, response):
+        if state.wrote and replicas.replicas():
+            response.set_cookie(
+                replicas.PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_STICKY_SECONDS", 10),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -1,3 +1,85 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+SKILL_NAME_MAX_LENGTH = 100
+
+
+def parse_skills(text: str) -> list[str]:
+    """Split a comma-separated skills string into unique, lowercase names."""
+    seen = {}
+    for part in (text or "").split(","):
+        name = part.strip().lower()[:SKILL_NAME_MAX_LENGTH]
+        if name and name not in seen:
+            seen[name] = None
+    return list(seen)
+
+
+class SkillQuerySet(models.QuerySet):
+    def ensure(self, names):
+        """Return Skill rows for ``names``, creating any that are missing."""
+        if not names:
+            return self.none()
+        self.bulk_create([Skill(name=n) for n in names], ignore_conflicts=True)
+        return self.filter(name__in=names)
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=SKILL_NAME_MAX_LENGTH, unique=True)
+
+    objects = SkillQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+def sync_skill_tags(instance) -> None:
+    """Point ``instance.skill_tags`` at the skills in its ``skills`` string."""
+    instance.skill_tags.set(Skill.objects.ensure(parse_skills(instance.skills)))
+
+
+def bulk_sync_skill_tags(instances) -> None:
+    """sync_skill_tags for many saved rows of one model: one lookup, one delete, one insert."""
+    if not instances:
+        return
+    field = type(instances[0])._meta.get_field("skill_tags")
+    through = field.remote_field.through
+    source = f"{field.m2m_field_name()}_id"
+    names = {obj.pk: parse_skills(obj.skills) for obj in instances}
+    all_names = sorted({n for obj_names in names.values() for n in obj_names})
+    skill_ids = dict(Skill.objects.ensure(all_names).values_list("name", "pk"))
+    through.objects.filter(**{f"{source}__in": list(names)}).delete()
+    through.objects.bulk_create(
+        [through(**{source: pk, "skill_id": skill_ids[n]}) for pk, obj_names in names.items() for n in obj_names],
+        batch_size=500,
+    )
+
+
+class OutboundEmail(models.Model):
+    """Queued email, drained by core.mail.send_queued_mail."""
+
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)} ({self.status})"
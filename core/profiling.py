@@ -0,0 +1,95 @@
+"""
+Opt-in sampling profiler for slow requests.
+
+A background thread snapshots the stack of every thread in the process
+every PROFILE_INTERVAL_MS and counts identical stacks. Every thread, not
+just the one that started the request: async views run their ORM calls on
+sync_to_async executor threads, which is where a slow request spends its
+time. Each stack is rooted at its thread's name. The result is written in
+the collapsed ("folded") format, one ``thread;frame;frame count`` line per
+stack, which flamegraph.pl, speedscope and inferno read directly.
+
+A request is profiled when it carries ``X-Profile: <PROFILE_TOKEN>`` or is
+picked at random with probability PROFILE_SAMPLE_RATE. Sampled requests are
+dumped to PROFILE_DIR when forced by the header or slower than
+PROFILE_SLOW_MS.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+MAX_DEPTH = 128
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def should_profile(request):
+    """(profile?, forced?) for this request."""
+    token = _setting("PROFILE_TOKEN", "")
+    header = request.headers.get("X-Profile")
+    if token and header and constant_time_compare(header, token):
+        return True, True
+    rate = _setting("PROFILE_SAMPLE_RATE", 0.0)
+    return bool(rate) and random.random() < rate, False
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+class StackSampler:
+    def __init__(self, interval=None):
+        self.interval = (interval or _setting("PROFILE_INTERVAL_MS", 5)) / 1000
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def dump(sampler, request, wall) -> str:
+    """Write the samples to PROFILE_DIR; returns the file path."""
+    directory = _setting("PROFILE_DIR", os.path.join(settings.BASE_DIR, "profiles"))
+    os.makedirs(directory, exist_ok=True)
+    view = getattr(request.resolver_match, "view_name", None) or "unresolved"
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{view.replace(':', '.')}-{int(wall * 1000)}ms.folded"
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(sampler.collapsed())
+    return path
+
+
+def is_slow(wall) -> bool:
+    return wall * 1000 >= _setting("PROFILE_SLOW_MS", 500)
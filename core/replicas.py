@@ -0,0 +1,100 @@
+"""
+Read-replica routing.
+
+Writes always go to "default". Reads go to a replica (picked at random from
+DATABASE_REPLICAS) only inside views decorated with ``@read_from_replica``,
+and only for GET/HEAD requests; everything else reads from the primary.
+
+Read-your-writes: a write anywhere in a request pins the rest of that
+request to the primary, and ReplicaPinMiddleware then sets a short-lived
+cookie that keeps the client's following requests on the primary for
+REPLICA_STICKY_SECONDS, longer than replication is expected to lag. An
+applicant redirected to "My Applications" after applying therefore sees
+the new application even if the replica has not caught up.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+
+PIN_COOKIE = "primary_pin"
+READ_METHODS = ("GET", "HEAD")
+
+_state = ContextVar("replica_state", default=None)
+
+
+class RequestState:
+    # Shared by reference with sync_to_async threads, which run in a copy of
+    # the context: writes they record are seen by the middleware.
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.use_replica = False
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def begin(request):
+    state = RequestState(pinned=PIN_COOKIE in request.COOKIES)
+    return state, _state.set(state)
+
+
+def end(token):
+    _state.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.pinned or state.wrote:
+            return "default"
+        aliases = replicas()
+        return random.choice(aliases) if aliases else "default"
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {"default", *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+def _start_replica_reads(request):
+    state = _state.get()
+    if state is None or request.method not in READ_METHODS:
+        return None
+    previous, state.use_replica = state.use_replica, True
+    return previous
+
+
+def read_from_replica(view_func):
+    """Let the view's queries read from a replica (see module docstring)."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _awrapped(request, *args, **kwargs):
+            previous = _start_replica_reads(request)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                if previous is not None:
+                    _state.get().use_replica = previous
+        return _awrapped
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        previous = _start_replica_reads(request)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            if previous is not None:
+                _state.get().use_replica = previous
+    return _wrapped
@@ -0,0 +1,25 @@
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+
+from . import metrics
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with metrics.timer("template"):
+            return self.template.render(context, request)
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+    """The standard Django backend, with render time added to the request metrics."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
@@ -1,3 +1,195 @@
-from django.test import TestCase
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .mail import MAX_ATTEMPTS, enqueue_mail, enqueue_mass_mail, send_queued_mail
+from .metrics import registry
+from .profiling import StackSampler
+from .models import SKILL_NAME_MAX_LENGTH, OutboundEmail, Skill, parse_skills
+
+
+class SkillTests(TestCase):
+    def test_parse_skills_normalizes(self):
+        self.assertEqual(parse_skills(" Python, DJANGO ,,python, Machine Learning "), ["python", "django", "machine learning"])
+        self.assertEqual(parse_skills(""), [])
+        self.assertEqual(parse_skills(None), [])
+        self.assertEqual(len(parse_skills("x" * 300)[0]), SKILL_NAME_MAX_LENGTH)
+
+    def test_ensure_creates_missing_skills_once(self):
+        Skill.objects.create(name="go")
+        self.assertEqual(list(Skill.objects.ensure(["go", "rust"]).values_list("name", flat=True)), ["go", "rust"])
+        Skill.objects.ensure(["rust"])
+        self.assertEqual(Skill.objects.count(), 2)
+        self.assertFalse(Skill.objects.ensure([]).exists())
+
+
+class RefusingBackend(BaseEmailBackend):
+    """Stand-in for an SMTP server that rejects every message."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError("SMTP server unavailable")
+
+
+class PickyBackend(BaseEmailBackend):
+    """Delivers to mail.outbox but refuses recipients at bad.example; counts calls."""
+
+    calls = 0
+
+    def send_messages(self, email_messages):
+        PickyBackend.calls += 1
+        for message in email_messages:
+            if message.to[0].endswith("@bad.example"):
+                raise ConnectionRefusedError(f"Recipient refused: {message.to[0]}")
+            mail.outbox.append(message)
+        return len(email_messages)
+
+
+class DroppingBackend(BaseEmailBackend):
+    """Drops the connection on recipients at drop.example; counts opens."""
+
+    opens = 0
+    refuse_reopen = False
+
+    def open(self):
+        if DroppingBackend.opens and DroppingBackend.refuse_reopen:
+            raise ConnectionRefusedError("SMTP server unavailable")
+        DroppingBackend.opens += 1
+        self.connected = True
+        return True
+
+    def close(self):
+        self.connected = False
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if not self.connected or message.to[0].endswith("@drop.example"):
+                self.connected = False
+                raise SMTPServerDisconnected("Connection unexpectedly closed")
+            mail.outbox.append(message)
+        return len(email_messages)
+
+
+class OutboxTests(TestCase):
+    def test_enqueue_skips_empty_recipients(self):
+        self.assertIsNone(enqueue_mail("Hi", "Body", ["", None]))
+        self.assertEqual(enqueue_mass_mail([("A", "a", None, ["x@example.com"]), ("B", "b", None, [""])]), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_drain_sends_batch(self):
+        for i in range(3):
+            enqueue_mail(f"Subject {i}", "Body", [f"user{i}@example.com"])
+        self.assertEqual(send_queued_mail(batch_size=10), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboundEmail.objects.exclude(status="sent").exists())
+        self.assertEqual(send_queued_mail(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND="core.tests.PickyBackend")
+    def test_batch_in_one_call_with_failures_mapped_to_rows(self):
+        PickyBackend.calls = 0
+        for to in ["a@example.com", "b@example.com"]:
+            enqueue_mail("Hi", "Body", [to])
+        self.assertEqual(send_queued_mail(), (2, 0))
+        self.assertEqual(PickyBackend.calls, 1)
+
+        PickyBackend.calls = 0
+        for to in ["c@example.com", "x@bad.example", "d@example.com", "y@bad.example"]:
+            enqueue_mail("Hi", "Body", [to])
+        self.assertEqual(send_queued_mail(), (2, 2))
+        self.assertEqual(PickyBackend.calls, 2)  # resumed once, after x@bad.example
+        self.assertEqual([m.to[0] for m in mail.outbox[2:]], ["c@example.com", "d@example.com"])
+        statuses = dict(OutboundEmail.objects.values_list("recipients__0", "status"))
+        self.assertEqual(statuses["x@bad.example"], "pending")
+        self.assertEqual(statuses["d@example.com"], "sent")
+        self.assertIn("x@bad.example", OutboundEmail.objects.get(recipients__0="x@bad.example").last_error)
+
+    @override_settings(EMAIL_BACKEND="core.tests.DroppingBackend")
+    def test_dropped_connection_is_reopened(self):
+        DroppingBackend.opens, DroppingBackend.refuse_reopen = 0, False
+        for to in ["a@example.com", "x@drop.example", "b@example.com"]:
+            enqueue_mail("Hi", "Body", [to])
+        self.assertEqual(send_queued_mail(), (2, 1))
+        self.assertEqual(DroppingBackend.opens, 2)
+        self.assertEqual([m.to[0] for m in mail.outbox], ["a@example.com", "b@example.com"])
+
+    @override_settings(EMAIL_BACKEND="core.tests.DroppingBackend")
+    def test_rows_after_a_lost_connection_are_requeued_untried(self):
+        DroppingBackend.opens, DroppingBackend.refuse_reopen = 0, True
+        for to in ["x@drop.example", "a@example.com", "b@example.com"]:
+            enqueue_mail("Hi", "Body", [to])
+        self.assertEqual(send_queued_mail(), (0, 1))
+        untried = OutboundEmail.objects.exclude(recipients__0="x@drop.example")
+        self.assertEqual(set(untried.values_list("status", "attempts")), {("pending", 0)})
+        self.assertFalse(untried.filter(next_attempt_at__gt=timezone.now()).exists())
+        self.assertEqual(OutboundEmail.objects.get(recipients__0="x@drop.example").attempts, 1)
+
+    @override_settings(EMAIL_BACKEND="core.tests.RefusingBackend")
+    def test_failures_back_off_then_give_up(self):
+        row = enqueue_mail("Hi", "Body", ["user@example.com"])
+        self.assertEqual(send_queued_mail(), (0, 1))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ("pending", 1))
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        self.assertIn("unavailable", row.last_error)
+
+        # Not due yet, so nothing is retried.
+        self.assertEqual(send_queued_mail(), (0, 0))
+
+        for _ in range(MAX_ATTEMPTS - 1):
+            OutboundEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            send_queued_mail()
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), ("failed", MAX_ATTEMPTS))
+
+
+def _spin_until(event):
+    while not event.is_set():
+        pass
+
+
+@override_settings(METRICS_TOKEN="scrape")
+class MetricsTests(TestCase):
+    def test_request_metrics_exported(self):
+        response = self.client.get(reverse("jobs:list"))
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        body = self.client.get(reverse("metrics"), headers={"authorization": "Bearer scrape"}).content.decode()
+        self.assertRegex(body, r'jobportal_requests_total\{view="jobs:list",method="GET",status="200"\} \d+')
+        self.assertRegex(body, r'jobportal_db_queries_total\{view="jobs:list"\} [1-9]')
+        self.assertRegex(body, r'jobportal_time_seconds_total\{view="jobs:list",kind="template"\} 0\.\d*[1-9]')
+        self.assertIn("jobportal_page_cache_misses", body)
+
+    def test_sampler_sees_other_threads(self):
+        done = threading.Event()
+        worker = threading.Thread(target=_spin_until, args=(done,), name="db-executor")
+        sampler = StackSampler(interval=1).start()
+        worker.start()
+        time.sleep(0.05)
+        done.set()
+        worker.join()
+        sampler.stop()
+        self.assertRegex(sampler.collapsed(), r"(?m)^db-executor;.*:_spin_until:\d+ \d+$")
+
+    def test_forced_profile_written(self):
+        with tempfile.TemporaryDirectory() as profiles, override_settings(
+            PROFILE_TOKEN="secret", PROFILE_DIR=profiles, PROFILE_INTERVAL_MS=1
+        ):
+            self.client.get(reverse("jobs:list"), headers={"x-profile": "wrong"})
+            self.assertEqual(os.listdir(profiles), [])
+            self.client.get(reverse("jobs:list"), headers={"x-profile": "secret"})
+            [name] = os.listdir(profiles)
+            self.assertIn("jobs.list", name)
+            with open(os.path.join(profiles, name)) as f:
+                # folded stacks: "frame;frame;... count"
+                for line in f:
+                    self.assertRegex(line, r"^\S.*;.* \d+$")
@@ -1,5 +1,13 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render, redirect
+from django.utils.crypto import constant_time_compare
 from accounts.decorators import role_required
+from jobs.matching import recommended_jobs
+from jobs.cache import cache_stats
+from jobs.models import ApplicantStats, EmployerStats, Job
+
+from .metrics import registry
 
 
 def home(request):
@@ -18,8 +26,38 @@ def home(request):
 
 @role_required("employer")
 def employer_dashboard(request):
-    return render(request, "core/employer_dashboard.html")
+    # Counts come from the denormalized stats tables (jobs.stats), so this is
+    # a fixed number of queries however many applications there are.
+    stats = EmployerStats.objects.filter(employer=request.user).first() or EmployerStats(employer=request.user)
+    jobs = Job.objects.filter(employer=request.user).select_related("stats")[:10]
+    ctx = {"stats": stats, "recent_jobs": jobs}
+    return render(request, "core/employer_dashboard.html", ctx)
 
 @role_required("applicant")
 def applicant_dashboard(request):
-    return render(request, "core/applicant_dashboard.html")
\ No newline at end of file
+    stats = ApplicantStats.objects.filter(applicant=request.user).first() or ApplicantStats(applicant=request.user)
+    return render(
+        request,
+        "core/applicant_dashboard.html",
+        {
+            "recommendations": recommended_jobs(request.user),
+            "status_counts": stats.status_breakdown(),
+        },
+    )
+
+
+def metrics(request):
+    """Prometheus scrape endpoint for this process's request metrics."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        allowed = constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = request.user.is_authenticated and request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden("Metrics require a token or a staff login.")
+    page_cache = cache_stats()
+    body = registry.render(gauges=[
+        ("jobportal_page_cache_hits", "Anonymous page cache hits (shared cache).", page_cache["hits"]),
+        ("jobportal_page_cache_misses", "Anonymous page cache misses (shared cache).", page_cache["misses"]),
+    ])
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
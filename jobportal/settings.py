@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import copy
 import os
 from dotenv import load_dotenv
 
@@ -46,15 +47,19 @@ INSTALLED_APPS = [
     "accounts",
     "core",
     "jobs",
+    "benchmarks",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # AuthenticationMiddleware with request.user served from the principal cache
+    "accounts.middleware.CachedAuthenticationMiddleware",
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,7 +68,8 @@ ROOT_URLCONF = 'jobportal.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # django.template.backends.django.DjangoTemplates plus render timing
+        'BACKEND': 'core.templates.DjangoTemplates',
         'DIRS': [BASE_DIR / "templates"],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -82,15 +88,156 @@ WSGI_APPLICATION = 'jobportal.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_ENGINE=postgresql (or mysql) reads DB_NAME, DB_USER, DB_PASSWORD, DB_HOST
+# and DB_PORT. PostgreSQL uses a psycopg connection pool per process unless
+# DB_POOL=0, in which case connections persist for DB_CONN_MAX_AGE seconds.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE in ("postgresql", "mysql"):
+    DB_POOL = DB_ENGINE == "postgresql" and os.getenv("DB_POOL", "1") == "1"
+    DATABASES = {
+        "default": {
+            "ENGINE": f"django.db.backends.{DB_ENGINE}",
+            "NAME": os.getenv("DB_NAME", "jobportal"),
+            "USER": os.getenv("DB_USER", ""),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", ""),
+            # the pool manages connection lifetime itself
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
     }
-}
+    if DB_POOL:
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+else:
+    # WAL lets reads run while a write is in progress; IMMEDIATE takes the
+    # write lock when a transaction starts, so concurrent writers wait on the
+    # busy timeout instead of failing with "database is locked" on upgrade.
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=134217728;"
+        "PRAGMA cache_size=-20000;"
+    )
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                "init_command": SQLITE_PRAGMAS,
+                "transaction_mode": "IMMEDIATE",
+                "timeout": int(os.getenv("DB_BUSY_TIMEOUT", "20")),
+            },
+        }
+    }
+
+# Read replicas: DB_REPLICAS lists replica hosts (for SQLite, database files),
+# comma separated. They become aliases replica1, replica2, ... with the
+# primary's other settings. Views marked @read_from_replica read from them;
+# a client that just wrote stays on the primary for REPLICA_STICKY_SECONDS.
+DB_REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+DATABASE_REPLICAS = []
+for n, target in enumerate(DB_REPLICAS, start=1):
+    replica = copy.deepcopy(DATABASES["default"])
+    replica["NAME" if DB_ENGINE == "sqlite" else "HOST"] = target
+    DATABASES[f"replica{n}"] = replica
+    DATABASE_REPLICAS.append(f"replica{n}")
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+
 AUTH_USER_MODEL = "accounts.User"
 
 
+# Cache
+# CACHE_BACKEND=file keeps entries in CACHE_LOCATION, shared by all workers
+# on the host; the default local-memory cache is per process.
+
+if os.getenv("CACHE_BACKEND", "locmem") == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "/var/tmp/jobportal_cache"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "jobportal",
+        }
+    }
+JOB_CACHE_TIMEOUT = int(os.getenv("JOB_CACHE_TIMEOUT", "300"))
+
+# Sessions are read from the cache and written through to the database, so
+# they survive a cache restart. request.user comes from a cached principal
+# (accounts.principal) that saving the User invalidates.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db")
+AUTH_PRINCIPAL_TIMEOUT = int(os.getenv("AUTH_PRINCIPAL_TIMEOUT", "300"))
+
+# /metrics (Prometheus text format) requires "Authorization: Bearer <METRICS_TOKEN>"
+# when set, otherwise a logged-in staff user.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Sampling profiler (core.profiling): requests sent with "X-Profile: <PROFILE_TOKEN>"
+# or picked at PROFILE_SAMPLE_RATE are sampled; those slower than
+# PROFILE_SLOW_MS (or forced) are dumped as folded stacks into PROFILE_DIR.
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = int(os.getenv("PROFILE_SLOW_MS", "500"))
+PROFILE_INTERVAL_MS = int(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "core.log.JSONFormatter"},
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+            "level": "DEBUG",
+        },
+    },
+    "root": {"handlers": ["console"], "level": os.getenv("LOG_LEVEL", "WARNING")},
+    "loggers": {
+        # one record per request from core.middleware
+        "jobportal.requests": {
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "handlers": ["console"],
+            "propagate": False,
+        },
+        "accounts": {"level": "INFO"},
+        "core": {"level": "INFO"},
+        "jobs": {"level": "INFO"},
+    },
+}
+
+# How long closed jobs stay in the hot tables before `manage.py expire_jobs`
+# archives them (0 = never archive).
+JOB_ARCHIVE_AFTER_DAYS = int(os.getenv("JOB_ARCHIVE_AFTER_DAYS", "0"))
+
+# How long the change feed waits for a gap in its sequence numbers (an
+# insert still committing) before skipping it; see jobs.feed.
+JOB_FEED_SETTLE_SECONDS = int(os.getenv("JOB_FEED_SETTLE_SECONDS", "30"))
+
+# Typeahead snapshot written by `manage.py build_typeahead --loop` (the
+# Procfile `typeahead` process) and mmapped by every worker. Until it exists,
+# or when set to "", each worker builds its own index in the background.
+# Workers look for a newer snapshot (or feed changes) every CHECK seconds.
+TYPEAHEAD_SNAPSHOT = os.getenv("TYPEAHEAD_SNAPSHOT", str(BASE_DIR / "typeahead.idx"))
+TYPEAHEAD_CHECK_SECONDS = float(os.getenv("TYPEAHEAD_CHECK_SECONDS", "5"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -136,6 +283,16 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Resume downloads: "nginx" (X-Accel-Redirect to RESUME_SENDFILE_PREFIX, an
+# internal location aliased to MEDIA_ROOT) or "apache" (X-Sendfile). Empty
+# serves files from Django.
+RESUME_SENDFILE_BACKEND = os.getenv("RESUME_SENDFILE_BACKEND", "")
+RESUME_SENDFILE_PREFIX = os.getenv("RESUME_SENDFILE_PREFIX", "/protected/")
+
+# Processes used by `manage.py extract_resumes` to parse uploaded PDFs.
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+RESUME_EXTRACT_TIMEOUT = float(os.getenv("RESUME_EXTRACT_TIMEOUT", "60"))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
@@ -0,0 +1,19 @@
+"""
+Settings for ``manage.py test`` (manage.py selects them for that command).
+"""
+import copy
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, DB_ENGINE, DB_REPLICAS, LOGGING
+
+# Keep test output readable; expected 403/404s would log warnings.
+LOGGING["handlers"]["console"]["level"] = "ERROR"
+
+# Tests build their own typeahead index from the test database.
+TYPEAHEAD_SNAPSHOT = ""
+
+if DB_ENGINE == "sqlite" and not DB_REPLICAS:
+    # A second SQLite database for jobs.tests.ReplicaRoutingTests, which
+    # enables it with override_settings(DATABASE_REPLICAS=["replica1"]). The
+    # test runner replaces it with an in-memory database.
+    DATABASES["replica1"] = {**copy.deepcopy(DATABASES["default"]), "NAME": ":memory:"}
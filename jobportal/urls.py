@@ -16,13 +16,15 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from core.views import employer_dashboard, applicant_dashboard, home
+from core.views import employer_dashboard, applicant_dashboard, home, metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("", home, name="home"),
     path('', include('accounts.urls')),
     path("jobs/", include("jobs.urls")), 
+    path("api/v1/", include("jobs.api_urls")),
     path("dashboard/employer/", employer_dashboard, name="employer_dashboard"),
     path("dashboard/applicant/", applicant_dashboard, name="applicant_dashboard"),  
+    path("metrics", metrics, name="metrics"),
 ]
\ No newline at end of file
@@ -1,8 +1,16 @@
 from django.contrib import admin
-from .models import Job
+from .models import ArchivedJob, Job
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = ("title", "employer", "job_type", "is_open", "deadline", "created_at")
+    list_select_related = ("employer",)
     list_filter = ("job_type", "is_open", "deadline", "created_at")
-    search_fields = ("title", "description", "location", "skills", "employer__username")
\ No newline at end of file
+    search_fields = ("title", "description", "location", "skills", "employer__username")
+
+
+@admin.register(ArchivedJob)
+class ArchivedJobAdmin(admin.ModelAdmin):
+    list_display = ("title", "employer", "deadline", "archived_at")
+    list_select_related = ("employer",)
+    search_fields = ("title", "employer__username")
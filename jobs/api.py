@@ -0,0 +1,205 @@
+"""
+Read-only JSON API over open jobs, for aggregator partners.
+
+/api/v1/jobs/ takes the job_list filters (q, location, job_type, skills,
+skills_match) plus:
+
+  * ``fields=title,location`` to return only those fields (``id`` is always
+    included; ``description`` only when asked for),
+  * ``cursor`` / ``limit`` for keyset pages (jobs.pagination), newest first.
+
+Rows are fetched with values() over just the columns the requested fields
+need, never as model instances. Every response carries a strong ETag built
+from the requested fields and the (id, updated_at) of each row on the page,
+so a client sending If-None-Match for an unchanged page gets a 304 and
+nothing is serialized. Employer renames do not touch Job.updated_at and
+only show up once a job on the page changes.
+
+/api/v1/jobs/changes/?since=N is the change feed (jobs.feed): the job
+writes after sequence number N, each with the job's current fields (or
+null once deleted), and the ``since`` to ask with next.
+"""
+import hashlib
+import json
+
+from django.http import HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.utils.http import parse_etags, quote_etag
+
+from core.models import parse_skills
+from core.replicas import read_from_replica
+
+from . import feed
+from .filters import filter_jobs, job_filters
+from .models import Job
+from .pagination import CursorPaginator
+
+API_VERSION = "v1"
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+FEED_DEFAULT_LIMIT = 100
+FEED_MAX_LIMIT = 1000
+
+
+def _company(row):
+    return row["company_name"] or row["employer__company"] or row["employer__username"]
+
+
+# API field -> (values() columns, row -> value)
+FIELDS = {
+    "id": (("pk",), lambda row: row["pk"]),
+    "title": (("title",), lambda row: row["title"]),
+    "company": (("company_name", "employer__company", "employer__username"), _company),
+    "location": (("location",), lambda row: row["location"]),
+    "job_type": (("job_type",), lambda row: row["job_type"]),
+    "salary_min": (("salary_min",), lambda row: row["salary_min"]),
+    "salary_max": (("salary_max",), lambda row: row["salary_max"]),
+    "skills": (("skills",), lambda row: parse_skills(row["skills"])),
+    "deadline": (("deadline",), lambda row: row["deadline"]),
+    "created_at": (("created_at",), lambda row: row["created_at"]),
+    "updated_at": (("updated_at",), lambda row: row["updated_at"]),
+    "url": (("pk",), lambda row: reverse("jobs:detail", args=[row["pk"]])),
+    "description": (("description",), lambda row: row["description"]),
+}
+DEFAULT_FIELDS = [name for name in FIELDS if name != "description"]
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def requested_fields(params) -> list:
+    """Field names from ``?fields=``, ``id`` first; BadRequest for unknown names."""
+    raw = params.get("fields", "")
+    if not raw.strip():
+        return DEFAULT_FIELDS
+    names = ["id"] + [name for name in dict.fromkeys(n.strip() for n in raw.split(",")) if name and name != "id"]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(FIELDS)}.")
+    return names
+
+
+def _int_param(params, name, default):
+    try:
+        return int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer.")
+
+
+def _limit(params, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    return max(1, min(_int_param(params, "limit", default), maximum))
+
+
+def _columns(fields):
+    # pk, created_at and updated_at drive the cursor and the ETag.
+    columns = {"pk": None, "created_at": None, "updated_at": None}
+    for name in fields:
+        columns.update(dict.fromkeys(FIELDS[name][0]))
+    return list(columns)
+
+
+def page_etag(fields, rows, *extra) -> str:
+    digest = hashlib.sha1(API_VERSION.encode())
+    digest.update(json.dumps([fields, *extra]).encode())
+    for row in rows:
+        digest.update(f"|{row['pk']}:{row['updated_at'].isoformat()}".encode())
+    return quote_etag(digest.hexdigest())
+
+
+def _not_modified(request, etag):
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    return etag in if_none_match or "*" in if_none_match
+
+
+def _serialize(fields, row):
+    return {name: FIELDS[name][1](row) for name in fields}
+
+
+def _respond(request, etag, build):
+    """304 when the client has ``etag``, otherwise JSON from ``build()``."""
+    response = HttpResponseNotModified() if _not_modified(request, etag) else JsonResponse(build())
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, no-cache"
+    return response
+
+
+def _page_url(request, cursor):
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return f"{request.path}?{params.urlencode()}"
+
+
+@read_from_replica
+async def job_collection(request):
+    try:
+        fields = requested_fields(request.GET)
+        limit = _limit(request.GET)
+    except BadRequest as e:
+        return _error(str(e))
+
+    qs = filter_jobs(Job.objects.open(), job_filters(request.GET)).values(*_columns(fields))
+    page = await CursorPaginator(qs, limit).apage(request.GET.get("cursor"))
+    etag = page_etag(fields, page.object_list, page.next_cursor, page.previous_cursor)
+    return _respond(request, etag, lambda: {
+        "results": [_serialize(fields, row) for row in page.object_list],
+        "next": _page_url(request, page.next_cursor),
+        "previous": _page_url(request, page.previous_cursor),
+    })
+
+
+@read_from_replica
+async def job_item(request, pk):
+    try:
+        fields = requested_fields(request.GET)
+    except BadRequest as e:
+        return _error(str(e))
+
+    row = await Job.objects.open().filter(pk=pk).values(*_columns(fields)).afirst()
+    if row is None:
+        return _error("Not found.", status=404)
+    return _respond(request, page_etag(fields, [row]), lambda: _serialize(fields, row))
+
+
+def change_entries(since, limit, fields) -> tuple[list, int]:
+    """
+    Feed entries after ``since`` and the sequence number to continue from:
+    one query for the changes and one for the current rows of their jobs.
+    """
+    changes = feed.changes_since(since, limit)
+    job_ids = {change["job_id"] for change in changes}
+    rows = {row["pk"]: row for row in Job.objects.filter(pk__in=job_ids).values(*_columns(fields))} if job_ids else {}
+    entries = [
+        {
+            "seq": change["pk"],
+            "id": change["job_id"],
+            "change": change["kind"],
+            "changed_at": change["changed_at"],
+            "job": _serialize(fields, rows[change["job_id"]]) if change["job_id"] in rows else None,
+        }
+        for change in changes
+    ]
+    return entries, changes[-1]["pk"] if changes else since
+
+
+@read_from_replica
+def job_changes(request):
+    try:
+        fields = requested_fields(request.GET)
+        limit = _limit(request.GET, FEED_DEFAULT_LIMIT, FEED_MAX_LIMIT)
+        since = max(0, _int_param(request.GET, "since", 0))
+    except BadRequest as e:
+        return _error(str(e))
+
+    entries, next_since = change_entries(since, limit, fields)
+    params = request.GET.copy()
+    params["since"] = next_since
+    response = JsonResponse({"changes": entries, "since": next_since, "next": f"{request.path}?{params.urlencode()}"})
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import api
+
+app_name = "jobs_api"
+
+urlpatterns = [
+    path("jobs/", api.job_collection, name="job_list"),
+    path("jobs/<int:pk>/", api.job_item, name="job_detail"),
+    path("jobs/changes/", api.job_changes, name="job_changes"),
+]
@@ -0,0 +1,148 @@
+"""
+Response caching for anonymous job_list/job_detail traffic.
+
+Keys embed version counters instead of being deleted on writes: saving or
+deleting any Job bumps the list version (every cached list page goes stale
+at once) and that job's own version. The current date is part of every key
+so pages drop expired postings at midnight without a write. Use a shared
+backend (file, memcached, redis) when running several worker processes;
+the default local-memory cache is per process.
+"""
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from accounts.decorators import aresolve_user
+
+from .filters import canonical_filters, job_filters
+
+CACHE_TIMEOUT = getattr(settings, "JOB_CACHE_TIMEOUT", 300)
+LIST_VERSION_KEY = "jobs:list:version"
+PAGING_PARAMS = ("page", "paging", "cursor", "count")
+
+
+def get_cache():
+    return caches[getattr(settings, "JOB_CACHE_ALIAS", "default")]
+
+
+def _version(key):
+    return get_cache().get_or_set(key, 1, timeout=None)
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Unknown key: any fresh value invalidates entries built on the old one.
+        cache.set(key, int(timezone.now().timestamp() * 1000), timeout=None)
+
+
+def _job_version_key(pk):
+    return f"jobs:job:{pk}:version"
+
+
+def bump_list_version():
+    _bump(LIST_VERSION_KEY)
+
+
+def bump_job_version(pk):
+    _bump(_job_version_key(pk))
+
+
+def job_list_key(request):
+    filters = canonical_filters(job_filters(request.GET))
+    paging = tuple((p, request.GET.get(p, "")) for p in PAGING_PARAMS)
+    digest = hashlib.sha1(repr(filters + paging).encode()).hexdigest()
+    return f"jobs:list:{_version(LIST_VERSION_KEY)}:{timezone.now().date()}:{digest}"
+
+
+def facets_key(filters):
+    # Sorting does not change the counts.
+    digest = hashlib.sha1(repr(canonical_filters({**filters, "sort": ""})).encode()).hexdigest()
+    return f"jobs:facets:{_version(LIST_VERSION_KEY)}:{timezone.now().date()}:{digest}"
+
+
+def job_detail_key(request, pk):
+    return f"jobs:detail:{pk}:{_version(_job_version_key(pk))}:{timezone.now().date()}"
+
+
+def _count(outcome):
+    cache = get_cache()
+    key = f"jobs:cache:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First count (or a backend that stores nothing, e.g. DummyCache).
+        cache.add(key, 1, timeout=None)
+
+
+def cache_stats() -> dict:
+    values = get_cache().get_many(["jobs:cache:hits", "jobs:cache:misses"])
+    return {"hits": values.get("jobs:cache:hits", 0), "misses": values.get("jobs:cache:misses", 0)}
+
+
+def _cacheable(request):
+    # Pages are identical for every anonymous visitor unless a flash
+    # message is pending for them.
+    return (
+        request.method == "GET"
+        and not request.user.is_authenticated
+        and "messages" not in request.COOKIES
+    )
+
+
+def _lookup(key_func, request, args, kwargs):
+    key = key_func(request, *args, **kwargs)
+    response = get_cache().get(key)
+    _count("misses" if response is None else "hits")
+    return key, response
+
+
+def _cacheable_response(response):
+    return response.status_code == 200 and not response.streaming
+
+
+def cache_anonymous_page(key_func, timeout=None):
+    """
+    Serve successful responses to anonymous GETs from the cache under
+    ``key_func(request, ...)``. Async views get an async wrapper whose cache
+    round trips run in a worker thread.
+    """
+
+    def outer(view_func):
+        timeout_ = CACHE_TIMEOUT if timeout is None else timeout
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _awrapped(request, *args, **kwargs):
+                await aresolve_user(request)
+                if not _cacheable(request):
+                    return await view_func(request, *args, **kwargs)
+                key, response = await sync_to_async(_lookup)(key_func, request, args, kwargs)
+                if response is not None:
+                    return response
+                response = await view_func(request, *args, **kwargs)
+                if _cacheable_response(response):
+                    await get_cache().aset(key, response, timeout_)
+                return response
+            return _awrapped
+
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if not _cacheable(request):
+                return view_func(request, *args, **kwargs)
+            key, response = _lookup(key_func, request, args, kwargs)
+            if response is not None:
+                return response
+            response = view_func(request, *args, **kwargs)
+            if _cacheable_response(response):
+                get_cache().set(key, response, timeout_)
+            return response
+        return _wrapped
+    return outer
@@ -1,26 +1,17 @@
 # jobs/emails.py
-from django.core.mail import send_mail
-from django.conf import settings
+from core.mail import enqueue_mail, enqueue_mass_mail
+from core.metrics import timed
 
-def _safe_send_mail(subject: str, message: str, recipient_list: list[str]) -> None:
+def _queue_mail(subject: str, message: str, recipient_list: list[str]) -> None:
     """
-    Wrapper around send_mail that skips empty emails and fails silently.
+    Queue the email in the outbox (see core.mail) in the caller's
+    transaction; the worker does the SMTP delivery and its retries. Empty
+    recipients are skipped.
     """
-    recipient_list = [e for e in recipient_list if e]
-    if not recipient_list:
-        return
-
-    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@jobportal.local")
-
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=from_email,
-        recipient_list=recipient_list,
-        fail_silently=False,  # in dev we don't want crashes on email issues
-    )
+    enqueue_mail(subject, message, recipient_list)
 
 
+@timed("email")
 def send_application_submitted_email(application) -> None:
     """Notify the employer and confirm to the applicant when a new application is submitted."""
     job = application.job
@@ -39,7 +30,7 @@ def send_application_submitted_email(application) -> None:
         f"- Job Portal"
     )
 
-    _safe_send_mail(subject_employer, message_employer, [employer.email])
+    _queue_mail(subject_employer, message_employer, [employer.email])
 
     # Confirmation email to applicant
     subject_applicant = f"Application received for '{job.title}'"
@@ -51,23 +42,40 @@ def send_application_submitted_email(application) -> None:
         f"- Job Portal"
     )
 
-    _safe_send_mail(subject_applicant, message_applicant, [applicant.email])
+    _queue_mail(subject_applicant, message_applicant, [applicant.email])
+
+
+def _status_changed_message(job_title, username, status_display):
+    subject = f"Your application status for '{job_title}' has changed"
+    message = (
+        f"Hello {username},\n\n"
+        f"The status of your application for the job '{job_title}' has been updated.\n"
+        f"New status: {status_display}\n\n"
+        f"Log in to your dashboard to see more details.\n\n"
+        f"- Job Portal"
+    )
+    return subject, message
 
 
+@timed("email")
 def send_application_status_changed_email(application) -> None:
     """
     Notify the applicant that their application status has changed.
     """
-    job = application.job
-    applicant = application.applicant
-
-    subject = f"Your application status for '{job.title}' has changed"
-    message = (
-        f"Hello {applicant.username},\n\n"
-        f"The status of your application for the job '{job.title}' has been updated.\n"
-        f"New status: {application.get_status_display()}\n\n"
-        f"Log in to your dashboard to see more details.\n\n"
-        f"- Job Portal"
+    subject, message = _status_changed_message(
+        application.job.title, application.applicant.username, application.get_status_display()
     )
+    _queue_mail(subject, message, [application.applicant.email])
+
 
-    _safe_send_mail(subject, message, [applicant.email])
\ No newline at end of file
+@timed("email")
+def send_status_changed_emails(changes) -> int:
+    """
+    One queue INSERT for many status changes. ``changes`` are
+    (job title, applicant username, applicant email, status display) tuples.
+    """
+    datatuple = []
+    for job_title, username, email, status_display in changes:
+        subject, message = _status_changed_message(job_title, username, status_display)
+        datatuple.append((subject, message, None, [email]))
+    return enqueue_mass_mail(datatuple)
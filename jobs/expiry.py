@@ -0,0 +1,100 @@
+"""
+Materialized job closure.
+
+JobQuerySet.open() and Job.is_active compare deadlines on every read, so
+expired postings used to stay is_open=True, and in the partial "open"
+index, forever. close_expired() flips them to is_open=False in short
+chunked UPDATEs and sends ``jobs_closed`` for each chunk so receivers can
+drop cached pages and recommendations. archive_closed() moves jobs whose
+deadline passed long ago, with their applications and the applications'
+status history and resume text, into the Archived* tables.
+
+Both run from ``manage.py expire_jobs --loop``, the ``sweeper`` process in
+the Procfile. Both steps are idempotent, so concurrent sweepers are
+harmless.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Application,
+    ApplicationStatusChange,
+    ArchivedApplication,
+    ArchivedJob,
+    ArchivedResumeText,
+    ArchivedStatusChange,
+    Job,
+    ResumeText,
+)
+from .signals import jobs_closed
+
+ARCHIVE_AFTER_DAYS = getattr(settings, "JOB_ARCHIVE_AFTER_DAYS", 0)
+
+JOB_FIELDS = [f.attname for f in ArchivedJob._meta.concrete_fields if f.name != "archived_at"]
+APPLICATION_FIELDS = [f.attname for f in ArchivedApplication._meta.concrete_fields]
+STATUS_CHANGE_FIELDS = [f.attname for f in ArchivedStatusChange._meta.concrete_fields]
+RESUME_TEXT_FIELDS = [f.attname for f in ArchivedResumeText._meta.concrete_fields]
+
+
+def close_expired(batch_size=500, today=None) -> int:
+    """Set is_open=False on open jobs past their deadline; returns the number closed."""
+    today = today or timezone.now().date()
+    closed = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Job.objects.filter(is_open=True, deadline__lt=today)
+                .order_by()
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return closed
+            closed += Job.objects.filter(pk__in=ids, is_open=True).update(is_open=False, updated_at=timezone.now())
+            jobs_closed.send(sender=Job, job_ids=ids)
+
+
+def _copy(rows, model, fields):
+    model.objects.bulk_create(
+        (model(**dict(zip(fields, row))) for row in rows.order_by().values_list(*fields).iterator()),
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def archive_closed(older_than_days=None, batch_size=200, today=None) -> int:
+    """
+    Move closed jobs whose deadline is more than ``older_than_days`` ago
+    (default JOB_ARCHIVE_AFTER_DAYS), their applications and the
+    applications' status history and resume text to the archive tables.
+    Returns the number of jobs archived.
+    """
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = (today or timezone.now().date()) - timedelta(days=days)
+    archived = 0
+    while True:
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.filter(is_open=False, deadline__lt=cutoff)
+                .order_by()
+                .values_list(*JOB_FIELDS)[:batch_size]
+            )
+            if not jobs:
+                return archived
+            ids = [row[0] for row in jobs]
+            ArchivedJob.objects.bulk_create(
+                [ArchivedJob(**dict(zip(JOB_FIELDS, row))) for row in jobs],
+                ignore_conflicts=True,
+            )
+            _copy(Application.objects.filter(job_id__in=ids), ArchivedApplication, APPLICATION_FIELDS)
+            _copy(
+                ApplicationStatusChange.objects.filter(application__job_id__in=ids),
+                ArchivedStatusChange,
+                STATUS_CHANGE_FIELDS,
+            )
+            _copy(ResumeText.objects.filter(application__job_id__in=ids), ArchivedResumeText, RESUME_TEXT_FIELDS)
+            # Regular deletes, so the search index, stats and caches follow.
+            Job.objects.filter(pk__in=ids).delete()
+            archived += len(ids)
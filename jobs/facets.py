@@ -0,0 +1,115 @@
+"""
+Facet counts for the job list filters.
+
+For the current filters, get_facets() returns:
+
+  * ``job_types``: jobs per job type, with every filter except job_type
+    applied, so the select shows what each choice would yield,
+  * ``locations``: the most common locations, without the location filter
+    (a location link replaces it),
+  * ``skills``: the most common skill tags in the result set (a skill link
+    narrows it),
+  * ``salaries``: result counts per SALARY_BUCKETS range of the advertised
+    top salary (salary_max, else salary_min), plus "not specified".
+
+Job types and salary buckets come from one GROUP BY over (job_type,
+salary bucket), and locations and skills from one GROUP BY each. That
+makes three queries however many values there are, not one COUNT per
+value. Results are cached per normalized filter set (jobs.cache) and
+go stale with the job list pages.
+"""
+from collections import Counter
+
+from django.db.models import Case, Count, Value, When
+
+from core.models import parse_skills
+
+from .cache import CACHE_TIMEOUT, facets_key, get_cache
+from .filters import filter_jobs
+from .models import SALARY_TOP, Job
+
+TOP_LOCATIONS = 8
+TOP_SKILLS = 10
+# (label, low, high): low <= salary < high; None is unbounded
+SALARY_BUCKETS = [
+    ("Under 30k", None, 30000),
+    ("30k–60k", 30000, 60000),
+    ("60k–100k", 60000, 100000),
+    ("100k+", 100000, None),
+]
+
+
+def _salary_bucket():
+    """Index into SALARY_BUCKETS of the advertised top salary; -1 when not given."""
+    whens = [When(facet_salary__isnull=True, then=Value(-1))]
+    whens += [When(facet_salary__lt=high, then=Value(i)) for i, (_, _, high) in enumerate(SALARY_BUCKETS) if high]
+    return Case(*whens, default=Value(len(SALARY_BUCKETS) - 1))
+
+
+def _type_and_salary_counts(filters):
+    # One GROUP BY (job_type, salary bucket) over the results without the
+    # job_type filter; both facets are sums over its few rows.
+    qs = filter_jobs(Job.objects.open(), {**filters, "job_type": ""}).order_by()
+    rows = (
+        qs.annotate(facet_salary=SALARY_TOP, bucket=_salary_bucket())
+        .values_list("job_type", "bucket")
+        .annotate(n=Count("pk"))
+    )
+
+    types, buckets = Counter(), Counter()
+    for job_type, i, n in rows:
+        types[job_type] += n
+        if not filters["job_type"] or job_type == filters["job_type"]:
+            buckets[i] += n
+    job_types = [(key, label, types[key]) for key, label in Job.JOB_TYPES]
+    salaries = [(label, low, high, buckets[i]) for i, (label, low, high) in enumerate(SALARY_BUCKETS)]
+    salaries.append(("Not specified", None, None, buckets[-1]))
+    return job_types, salaries
+
+
+def _top_locations(filters):
+    qs = filter_jobs(Job.objects.open(), {**filters, "location": ""}).order_by()
+    rows = (
+        qs.exclude(location="")
+        .values("location")
+        .annotate(n=Count("pk"))
+        .order_by("-n", "location")[:TOP_LOCATIONS]
+    )
+    return [(row["location"], row["n"]) for row in rows]
+
+
+def _top_skills(filters):
+    matching = filter_jobs(Job.objects.open(), filters).order_by().values("pk")
+    rows = (
+        Job.skill_tags.through.objects.filter(job_id__in=matching)
+        .values("skill__name")
+        .annotate(n=Count("job_id"))
+        .order_by("-n", "skill__name")[:TOP_SKILLS]
+    )
+    return [(row["skill__name"], row["n"]) for row in rows]
+
+
+def compute_facets(filters) -> dict:
+    job_types, salaries = _type_and_salary_counts(filters)
+    return {
+        "job_types": job_types,
+        "locations": _top_locations(filters),
+        "skills": _top_skills(filters),
+        "salaries": salaries,
+    }
+
+
+def get_facets(filters) -> dict:
+    """compute_facets() through the cache."""
+    key = facets_key(filters)
+    facets = get_cache().get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        get_cache().set(key, facets, CACHE_TIMEOUT)
+    return facets
+
+
+def skill_links(facets, filters) -> list:
+    """(skill, count, skills filter value with the skill added) for skills not already filtered on."""
+    current = parse_skills(filters["skills"])
+    return [(name, n, ", ".join(current + [name])) for name, n in facets["skills"] if name not in current]
@@ -0,0 +1,67 @@
+"""
+Change feed for job postings.
+
+Every job write appends a JobChange row (created, updated, closed or
+deleted) in the same transaction as the write. The JobChange id is a
+monotonic sequence number. Partners keep the last number they saw and ask
+for what came after it (/api/v1/jobs/changes/?since=N or
+``manage.py export_job_changes --since N``). A sync therefore reads only
+the changes, not the whole job list.
+
+Writers are covered by:
+
+  * the Job post_save/post_delete receivers (jobs.signals), for job_create,
+    job_edit, the admin and the regular deletes in jobs.expiry.archive_closed,
+  * jobs_closed, for expiry sweeps,
+  * jobs.importers, whose bulk writes send no signals.
+
+Ids are allocated when a row is inserted, but transactions commit in their
+own order. On PostgreSQL a reader can therefore see id 12 before id 11 has
+committed. changes_since() stops at a gap in the sequence until the gap is
+SETTLE_SECONDS old, including before the first row of a sync from 0. After
+that the missing id is taken to be a rolled-back insert. SQLite serializes
+writers, so its ids commit in order.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import JobChange
+
+SETTLE_SECONDS = getattr(settings, "JOB_FEED_SETTLE_SECONDS", 30)
+
+
+def record(kind, job_ids, changed_at=None):
+    """Append one ``kind`` change per job id; call inside the writing transaction."""
+    changed_at = changed_at or timezone.now()
+    JobChange.objects.bulk_create(
+        [JobChange(job_id=pk, kind=kind, changed_at=changed_at) for pk in job_ids]
+    )
+
+
+def save_kind(job, created):
+    if created:
+        return "created"
+    if getattr(job, "_loaded_is_open", None) and not job.is_open:
+        return "closed"
+    return "updated"
+
+
+def changes_since(since=0, limit=500, now=None) -> list:
+    """Up to ``limit`` changes after sequence number ``since``, oldest first."""
+    settled = (now or timezone.now()) - timedelta(seconds=SETTLE_SECONDS)
+    rows = JobChange.objects.filter(pk__gt=since).order_by("pk").values("pk", "job_id", "kind", "changed_at")
+    changes = []
+    expected = since + 1
+    for row in rows[:limit]:
+        if row["pk"] != expected and row["changed_at"] > settled:
+            break  # an earlier id may still be committing
+        changes.append(row)
+        expected = row["pk"] + 1
+    return changes
+
+
+def latest_sequence() -> int:
+    """Sequence number to start a fresh sync from (after a full export)."""
+    return JobChange.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
@@ -0,0 +1,84 @@
+from core.models import parse_skills
+
+from .search import get_search_backend
+
+
+SORTS = ("relevance", "recent", "salary")
+MAX_AMOUNT = 2147483647  # the salary columns' PositiveIntegerField range
+
+
+def _amount(value):
+    """A salary bound as a digit string, or "" when missing or out of range."""
+    value = value.strip().replace(",", "")
+    if not (value.isascii() and value.isdigit()) or len(value) > len(str(MAX_AMOUNT)) or int(value) > MAX_AMOUNT:
+        return ""
+    return value
+
+
+def job_filters(params) -> dict:
+    """Search filters from a GET QueryDict, as shown back in the filter form."""
+    sort = params.get("sort", "")
+    return {
+        "q": " ".join(params.get("q", "").split()),
+        "location": params.get("location", "").strip(),
+        "job_type": params.get("job_type", "").strip(),
+        "skills": params.get("skills", "").strip(),
+        "skills_match": "any" if params.get("skills_match") == "any" else "all",
+        "salary_min": _amount(params.get("salary_min", "")),
+        "salary_max": _amount(params.get("salary_max", "")),
+        "sort": sort if sort in SORTS else "",
+    }
+
+
+def filter_jobs(qs, filters):
+    if filters["q"]:
+        qs = get_search_backend().search(qs, filters["q"])
+    if filters["location"]:
+        qs = qs.filter(location__icontains=filters["location"])
+    if filters["job_type"]:
+        qs = qs.filter(job_type=filters["job_type"])
+    if filters["skills"]:
+        qs = qs.with_skills(parse_skills(filters["skills"]), match=filters["skills_match"])
+    if filters["salary_min"] or filters["salary_max"]:
+        qs = qs.with_salary(
+            low=int(filters["salary_min"]) if filters["salary_min"] else None,
+            high=int(filters["salary_max"]) if filters["salary_max"] else None,
+        )
+    return qs
+
+
+def effective_sort(filters) -> str:
+    """The sort in use: the one asked for, else relevance with a query and recent without."""
+    return filters["sort"] or ("relevance" if filters["q"] else "recent")
+
+
+def sort_jobs(qs, filters):
+    """
+    Order filtered jobs: by search rank ("relevance"), newest first
+    ("recent") or by salary. Cursor pages are keyed on recency, so only
+    "recent" can be paged by cursor.
+    """
+    sort = effective_sort(filters)
+    if sort == "salary":
+        return qs.by_salary(high=int(filters["salary_max"]) if filters["salary_max"] else None)
+    if sort == "recent" or not filters["q"]:
+        return qs.order_by("-created_at")
+    return qs  # the search backend orders by rank
+
+
+def canonical_filters(filters) -> tuple:
+    """
+    Filters reduced to what changes the result set (case, skill order and
+    duplicates don't), for use in cache keys.
+    """
+    skills = tuple(sorted(parse_skills(filters["skills"])))
+    return (
+        ("q", filters["q"].lower()),
+        ("location", filters["location"].lower()),
+        ("job_type", filters["job_type"]),
+        ("skills", skills),
+        ("skills_match", filters["skills_match"] if skills else ""),
+        ("salary_min", filters["salary_min"]),
+        ("salary_max", filters["salary_max"]),
+        ("sort", filters["sort"]),
+    )
@@ -1,6 +1,7 @@
 from django import forms
 from django.utils import timezone
 from .models import Job, Application
+from .triage import MAX_APPLICATIONS, TARGET_STATUSES
 
 MAX_RESUME_MB = 5
 
@@ -32,11 +33,29 @@ class JobForm(forms.ModelForm):
             if deadline < timezone.now().date():
                 self.add_error("deadline", "Deadline must be today or a future date.")
 
-        # Normalize skills
-        skills = cleaned.get("skills", "")
-        cleaned["skills"] = ", ".join([s.strip() for s in skills.split(",") if s.strip()])
+        # Normalize skills (dropping case-insensitive duplicates); the saved
+        # string is what Job.skill_tags is synced from.
+        skills = cleaned.get("skills") or ""
+        unique = {}
+        for s in skills.split(","):
+            if s.strip():
+                unique.setdefault(s.strip().lower(), s.strip())
+        cleaned["skills"] = ", ".join(unique.values())
         return cleaned
     
+class JobImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="CSV with a header row of job fields, or JSON Lines (.jsonl). "
+        "Rows with an external_id update the job previously imported with that id."
+    )
+
+    def clean_file(self):
+        f = self.cleaned_data["file"]
+        if not f.name.lower().endswith((".csv", ".jsonl", ".ndjson")):
+            raise forms.ValidationError("Upload a .csv or .jsonl file.")
+        return f
+
+
 class ApplicationForm(forms.ModelForm):
     class Meta:
         model = Application
@@ -72,4 +91,38 @@ class ApplicationForm(forms.ModelForm):
 class ApplicationStatusForm(forms.ModelForm):
     class Meta:
         model = Application
-        fields = ["status"]
\ No newline at end of file
+        fields = ["status"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the current status and the moves allowed from it.
+        current = self.instance.status
+        allowed = {current, *Application.STATUS_TRANSITIONS.get(current, ())}
+        self.fields["status"].choices = [(k, v) for k, v in Application.STATUS_CHOICES if k in allowed]
+
+
+class ApplicationIdsField(forms.Field):
+    """The ``applications`` checkboxes of the bulk form, as a list of ids."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return sorted({int(v) for v in value or ()})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Invalid application id.")
+
+    def validate(self, value):
+        if not value:
+            raise forms.ValidationError("Select at least one application.")
+
+
+class BulkStatusForm(forms.Form):
+    applications = ApplicationIdsField()
+    status = forms.ChoiceField(choices=[(k, v) for k, v in Application.STATUS_CHOICES if k in TARGET_STATUSES])
+
+    def clean_applications(self):
+        ids = self.cleaned_data["applications"]
+        if len(ids) > MAX_APPLICATIONS:
+            raise forms.ValidationError(f"Select at most {MAX_APPLICATIONS} applications.")
+        return ids
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Bulk job import from partner feeds.
+
+Rows are read one at a time from CSV (header row of JobForm field names) or
+JSON Lines, validated with JobForm and written ``batch_size`` at a time with
+one bulk INSERT per batch, each batch in its own transaction. Rows carrying
+an ``external_id`` are upserted on (employer, external_id). Only the current
+batch and the first MAX_ERRORS row errors are held in memory, so file size
+does not matter.
+
+bulk_create bypasses the Job signals, so every committed batch updates the
+search index, skill tags, stats, page cache, change feed and matches
+(inline or through the match queue) itself.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+
+from core.models import bulk_sync_skill_tags
+
+from . import cache, feed, matching, stats
+from .forms import JobForm
+from .models import Job
+from .search import get_search_backend
+
+FORMATS = ("csv", "jsonl")
+MAX_ERRORS = 100
+EXTERNAL_ID_MAX_LENGTH = Job._meta.get_field("external_id").max_length
+
+NOT_UTF8 = "\ufffd"  # what undecodable bytes are replaced with
+NOT_UTF8_ERROR = "Not UTF-8 text; save the file as UTF-8."
+
+_FALSE = {"", "0", "false", "no", "n", "off"}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []  # (line, message) for the first MAX_ERRORS failures
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        return f"{self.created} created, {self.updated} updated, {self.error_count} rejected"
+
+
+def guess_format(filename):
+    name = (filename or "").lower()
+    return "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_rows(f, fmt):
+    """
+    Yield ``(line, row_dict_or_error)`` from a binary file object. Rows with
+    bytes that are not UTF-8 are rejected; a CSV the csv module cannot parse
+    ends with one error for the line it stopped at.
+    """
+    lines = codecs.iterdecode(iter(f), "utf-8-sig", errors="replace")
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        try:
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, "Too many columns."
+                elif any(NOT_UTF8 in (value or "") for value in row.values()):
+                    yield reader.line_num, NOT_UTF8_ERROR
+                else:
+                    yield reader.line_num, row
+        except csv.Error as e:
+            yield reader.line_num, f"Unreadable CSV, import stopped: {e}"
+        return
+    for n, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        if NOT_UTF8 in text:
+            yield n, NOT_UTF8_ERROR
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield n, f"Invalid JSON: {e}"
+            continue
+        yield n, row if isinstance(row, dict) else "Expected a JSON object."
+
+
+def _form_data(row):
+    data = {k.strip(): ("" if v is None else str(v)).strip() for k, v in row.items() if k}
+    # Columns the feed leaves out take the model default, as on a new Job.
+    for name in JobForm._meta.fields:
+        field = Job._meta.get_field(name)
+        if not data.get(name) and field.has_default():
+            data[name] = str(field.get_default())
+    # A checkbox missing from a POST means False; in a feed it means "open".
+    is_open = data.get("is_open", "true")
+    data["is_open"] = "false" if is_open.lower() in _FALSE else "true"
+    return data
+
+
+def build_job(row, employer):
+    """Validate one row; returns (unsaved Job, None) or (None, error message)."""
+    data = _form_data(row)
+    external_id = data.get("external_id") or None
+    if external_id and len(external_id) > EXTERNAL_ID_MAX_LENGTH:
+        return None, f"external_id: longer than {EXTERNAL_ID_MAX_LENGTH} characters."
+    form = JobForm(data)
+    if not form.is_valid():
+        errors = "; ".join(f"{field}: {' '.join(msgs)}" for field, msgs in form.errors.items())
+        return None, errors
+    job = form.save(commit=False)
+    job.employer = employer
+    job.external_id = external_id
+    return job, None
+
+
+def _write_batch(batch, employer, result, refresh_matches):
+    keyed = {job.external_id: job for job in batch if job.external_id}  # last row wins
+    plain = [job for job in batch if not job.external_id]
+    update_fields = JobForm._meta.fields + ["updated_at"]
+
+    with transaction.atomic():
+        existing = dict(
+            Job.objects.filter(employer=employer, external_id__in=list(keyed)).values_list("external_id", "is_open")
+        )
+        Job.objects.bulk_create(plain, batch_size=len(batch))
+        if keyed:
+            Job.objects.bulk_create(
+                list(keyed.values()),
+                update_conflicts=True,
+                unique_fields=["employer", "external_id"],
+                update_fields=update_fields,
+            )
+            # Upserted rows do not get their pk back on every backend.
+            ids = dict(
+                Job.objects.filter(employer=employer, external_id__in=list(keyed)).values_list("external_id", "pk")
+            )
+            for external_id, job in keyed.items():
+                job.pk = ids[external_id]
+
+        jobs = plain + list(keyed.values())
+        created = plain + [job for job in keyed.values() if job.external_id not in existing]
+        updated = [job for job in keyed.values() if job.external_id in existing]
+
+        bulk_sync_skill_tags(jobs)
+        # As feed.save_kind: an upsert that closes an open job is a closure.
+        closed = {job.pk for job in updated if existing[job.external_id] and not job.is_open}
+        feed.record("created", [job.pk for job in created])
+        feed.record("updated", [job.pk for job in updated if job.pk not in closed])
+        feed.record("closed", sorted(closed))
+        backend = get_search_backend()
+        for job in jobs:
+            backend.index_job(job)
+        if created:
+            stats.jobs_created(employer.pk, created)
+        opened = sum(job.is_open - existing[job.external_id] for job in updated)
+        if opened:
+            stats.jobs_opened(employer.pk, opened)
+        cache.bump_list_version()
+        for job in updated:
+            cache.bump_job_version(job.pk)
+        if refresh_matches:
+            for job in jobs:
+                matching.refresh_job(job)
+        else:
+            matching.queue_on_commit(job_ids=[job.pk for job in jobs])
+
+    result.created += len(created)
+    result.updated += len(updated)
+
+
+def import_jobs(f, employer, fmt="csv", batch_size=500, refresh_matches=True) -> ImportResult:
+    """
+    Import jobs for ``employer`` from the binary file ``f``. Invalid rows are
+    reported in the result and skipped; valid rows are committed per batch.
+    ``refresh_matches=False`` leaves recommendation updates to the match
+    queue (``manage.py refresh_matches --loop``) instead of making them per
+    batch; web uploads use it so the request does not score every job.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format {fmt!r}; expected one of {FORMATS}.")
+    result = ImportResult()
+    batch = []
+    for line, row in read_rows(f, fmt):
+        if isinstance(row, str):
+            result.add_error(line, row)
+            continue
+        job, error = build_job(row, employer)
+        if error:
+            result.add_error(line, error)
+            continue
+        batch.append(job)
+        if len(batch) >= batch_size:
+            _write_batch(batch, employer, result, refresh_matches)
+            batch = []
+    if batch:
+        _write_batch(batch, employer, result, refresh_matches)
+    return result
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.typeahead import SNAPSHOT_PATH, Builder, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the typeahead snapshot the web workers mmap (TYPEAHEAD_SNAPSHOT). "
+        "Use --loop to keep it current from the job change feed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=SNAPSHOT_PATH, help="Snapshot file (default TYPEAHEAD_SNAPSHOT).")
+        parser.add_argument("--loop", action="store_true", help="Keep following job changes.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between feed polls.")
+
+    def handle(self, *args, **options):
+        path = options["output"]
+        if not path:
+            raise CommandError("Set TYPEAHEAD_SNAPSHOT or pass --output.")
+        builder = Builder()
+        builder.load()
+        data = builder.snapshot()
+        write_snapshot(data, path)
+        self.stdout.write(f"Wrote {len(data)} bytes at change {builder.sequence} to {path}.")
+        while options["loop"]:
+            time.sleep(options["interval"])
+            applied = builder.refresh()
+            if applied:
+                write_snapshot(builder.snapshot(), path)
+                self.stdout.write(f"Applied {applied} job changes, now at change {builder.sequence}.")
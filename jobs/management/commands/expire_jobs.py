@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import ARCHIVE_AFTER_DAYS, archive_closed, close_expired
+
+
+class Command(BaseCommand):
+    help = "Close jobs past their deadline and optionally archive long-closed ones. Use --loop to run periodically."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--archive-after",
+            type=int,
+            default=ARCHIVE_AFTER_DAYS,
+            help="Archive closed jobs whose deadline is more than this many days ago (0 = never).",
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep sweeping.")
+        parser.add_argument("--interval", type=float, default=3600.0, help="Seconds between sweeps.")
+
+    def handle(self, *args, **options):
+        while True:
+            closed = close_expired(batch_size=options["batch_size"])
+            archived = archive_closed(options["archive_after"]) if options["archive_after"] else 0
+            if closed or archived or not options["loop"]:
+                self.stdout.write(f"Closed {closed} expired jobs, archived {archived}.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
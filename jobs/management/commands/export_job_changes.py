@@ -0,0 +1,41 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from jobs.api import BadRequest, change_entries, requested_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Write job changes after a sequence number as JSON Lines, the same entries as "
+        "/api/v1/jobs/changes/. Use --loop to keep following the feed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=int, default=0, help="Last sequence number already synced.")
+        parser.add_argument("--fields", default="", help="Comma-separated job fields, as ?fields= in the API.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new changes.")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds to sleep when idle.")
+
+    def handle(self, *args, **options):
+        try:
+            fields = requested_fields({"fields": options["fields"]})
+        except BadRequest as e:
+            raise CommandError(str(e))
+        since = options["since"]
+        total = 0
+        while True:
+            entries, since = change_entries(since, options["batch_size"], fields)
+            for entry in entries:
+                self.stdout.write(json.dumps(entry, cls=DjangoJSONEncoder))
+            total += len(entries)
+            if entries:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        # stderr, so stdout stays pure JSON Lines
+        self.stderr.write(f"Exported {total} changes; next --since {since}.")
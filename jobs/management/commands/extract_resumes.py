@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.resume_index import TIMEOUT, WORKERS, extract_pending
+
+
+class Command(BaseCommand):
+    help = "Extract text and skills from new resumes and index them. Use --loop to keep processing uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--workers", type=int, default=WORKERS, help="Parser processes (0 = parse in this process)."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=TIMEOUT, help="Seconds a file may take before it is failed."
+        )
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry resumes that failed before.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new resumes.")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds to sleep when idle.")
+
+    def handle(self, *args, **options):
+        retry_before = timezone.now() if options["retry_failed"] else None
+        total = failed_total = 0
+        while True:
+            extracted, failed = extract_pending(
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                retry_failed_before=retry_before,
+                timeout=options["timeout"],
+            )
+            total += extracted
+            failed_total += failed
+            if extracted or failed:
+                if options["loop"]:
+                    self.stdout.write(f"Extracted {extracted} resumes, {failed} failed.")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Extracted {total} resumes, {failed_total} failed."))
@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.importers import FORMATS, guess_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = "Import jobs for an employer from a CSV or JSON Lines file, upserting on external_id."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--employer", required=True, help="Username of the owning employer.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--skip-matches",
+            action="store_true",
+            help="Do not update recommendations per batch; queue them for refresh_matches --loop.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            employer = get_user_model().objects.get(username=options["employer"], role="employer")
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No employer named {options['employer']!r}.")
+        fmt = options["format"] or guess_format(options["path"])
+        try:
+            with open(options["path"], "rb") as f:
+                result = import_jobs(
+                    f, employer, fmt=fmt,
+                    batch_size=options["batch_size"],
+                    refresh_matches=not options["skip_matches"],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more errors")
+        self.stdout.write(self.style.SUCCESS(f"Imported jobs: {result}."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all jobs (and extracted resume text)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{type(backend).__name__}: indexed {count} jobs."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-job, per-employer and per-applicant application counters."
+
+    def handle(self, *args, **options):
+        count = reconcile()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled stats for {count} jobs."))
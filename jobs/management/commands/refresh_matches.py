@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from jobs import matching
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute all job recommendations and application match scores. "
+        "Use --queued or --loop to work through the queue of changed jobs instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queued", action="store_true", help="Only refresh queued jobs and applicants.")
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue (implies --queued).")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when idle.")
+
+    def handle(self, *args, **options):
+        if not (options["queued"] or options["loop"]):
+            applicants = get_user_model().objects.filter(role="applicant")
+            for user in applicants.iterator():
+                matching.refresh_applicant(user)
+            self.stdout.write(self.style.SUCCESS(f"Refreshed matches for {applicants.count()} applicants."))
+            return
+
+        total = 0
+        while True:
+            done = matching.refresh_queued(batch_size=options["batch_size"])
+            total += done
+            if done:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} queued matches."))
@@ -0,0 +1,216 @@
+"""
+Skill-based matching between applicants and jobs.
+
+Jobs and users are sparse binary vectors over core.Skill, stored as rows of
+the skill_tags join tables. The Jaccard similarity |A ∩ B| / |A ∪ B| of one
+vector against every vector sharing at least one skill is computed in a
+single grouped query over the join table, so the database does the scoring
+instead of a Python loop over rows.
+
+Two results are precomputed:
+  * Recommendation rows: the top MATCH_TOP_N open jobs per applicant.
+  * Application.match_score: used to rank applicants on job_applicants.
+Both are refreshed incrementally from the Job/User/Application signals.
+
+Scoring a job runs against every applicant, so job writes do not do it
+themselves: they queue a MatchRefresh row once they commit, and a worker
+(``manage.py refresh_matches --loop``) drains the queue. Refreshes are
+idempotent, so concurrent workers are harmless.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Min, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+from .models import Application, Job, MatchRefresh, Recommendation
+
+TOP_N = getattr(settings, "MATCH_TOP_N", 20)
+
+
+def _skill_ids(instance):
+    return list(instance.skill_tags.values_list("id", flat=True))
+
+
+def jaccard_scores(through, owner_field, skill_ids, owners=None):
+    """
+    Queryset of ``{owner_field, score}`` rows: the Jaccard score of
+    ``skill_ids`` against every owner in ``through`` sharing one of them,
+    optionally restricted to ``owners`` (ids or a subquery).
+    """
+    owner_size = (
+        through.objects.filter(**{owner_field: OuterRef(owner_field)})
+        .values(owner_field)
+        .annotate(n=Count("skill_id"))
+        .values("n")
+    )
+    rows = through.objects.filter(skill_id__in=skill_ids)
+    if owners is not None:
+        rows = rows.filter(**{f"{owner_field}__in": owners})
+    return (
+        rows.values(owner_field)
+        .annotate(overlap=Count("skill_id"), size=Subquery(owner_size))
+        .annotate(
+            score=Cast("overlap", FloatField()) / (F("size") + len(skill_ids) - F("overlap")),
+        )
+        .values(owner_field, "score")
+    )
+
+
+def refresh_applicant(user) -> None:
+    """Recompute one applicant's recommendations and application scores."""
+    skill_ids = _skill_ids(user)
+    job_skills = Job.skill_tags.through
+
+    top = []
+    if skill_ids:
+        scores = jaccard_scores(job_skills, "job_id", skill_ids, owners=Job.objects.open().values("pk"))
+        top = list(scores.order_by("-score", "-job_id")[:TOP_N])
+
+    with transaction.atomic():
+        Recommendation.objects.filter(applicant=user).delete()
+        Recommendation.objects.bulk_create(
+            [Recommendation(applicant=user, job_id=r["job_id"], score=r["score"]) for r in top]
+        )
+
+    apps = list(Application.objects.filter(applicant=user).only("pk", "job_id", "match_score"))
+    if apps:
+        by_job = {}
+        if skill_ids:
+            by_job = {
+                r["job_id"]: r["score"]
+                for r in jaccard_scores(job_skills, "job_id", skill_ids, owners=[a.job_id for a in apps])
+            }
+        for app in apps:
+            app.match_score = by_job.get(app.job_id, 0.0)
+        Application.objects.bulk_update(apps, ["match_score"], batch_size=500)
+
+
+def refresh_job(job) -> None:
+    """
+    Rescore one job's applications and merge the job into the recommendation
+    lists of applicants it now ranks for. Applicants it drops out of are
+    refreshed so their lists fill back up to MATCH_TOP_N.
+    """
+    skill_ids = _skill_ids(job)
+    user_skills = get_user_model().skill_tags.through
+
+    applicant_ids = job.applications.values("applicant_id")
+    by_user = {}
+    if skill_ids:
+        by_user = {
+            r["user_id"]: r["score"]
+            for r in jaccard_scores(user_skills, "user_id", skill_ids, owners=applicant_ids)
+        }
+    apps = list(job.applications.only("pk", "applicant_id", "match_score"))
+    for app in apps:
+        app.match_score = by_user.get(app.applicant_id, 0.0)
+    Application.objects.bulk_update(apps, ["match_score"], batch_size=500)
+
+    with transaction.atomic():
+        recommendations = Recommendation.objects.filter(job=job)
+        listed = set(recommendations.values_list("applicant_id", flat=True))
+        recommendations.delete()
+        winners = _merge(job, skill_ids) if skill_ids and job.is_active else {}
+        for user in get_user_model().objects.filter(pk__in=listed - set(winners)):
+            refresh_applicant(user)
+
+
+def _merge(job, skill_ids) -> dict:
+    """Add ``job`` to the lists of applicants it ranks for; returns {applicant id: score}."""
+    user_skills = get_user_model().skill_tags.through
+    applicants = get_user_model().objects.filter(role="applicant").values("pk")
+    candidates = {
+        r["user_id"]: r["score"]
+        for r in jaccard_scores(user_skills, "user_id", skill_ids, owners=applicants)
+    }
+    if not candidates:
+        return {}
+    # Applicants whose list is already full only take the job if it beats
+    # their current N-th best score.
+    full = dict(
+        Recommendation.objects.filter(applicant_id__in=list(candidates))
+        .values("applicant_id")
+        .annotate(n=Count("pk"), lowest=Min("score"))
+        .filter(n__gte=TOP_N)
+        .values_list("applicant_id", "lowest")
+    )
+    winners = {uid: score for uid, score in candidates.items() if uid not in full or score > full[uid]}
+    Recommendation.objects.bulk_create(
+        [Recommendation(applicant_id=uid, job=job, score=score) for uid, score in winners.items()],
+        batch_size=500,
+    )
+    for uid in set(winners) & set(full):
+        _trim(uid)
+    return winners
+
+
+def _trim(applicant_id) -> None:
+    recommendations = Recommendation.objects.filter(applicant_id=applicant_id)
+    keep = list(recommendations.order_by("-score", "-job_id").values_list("pk", flat=True)[:TOP_N])
+    recommendations.exclude(pk__in=keep).delete()
+
+
+def score_application(application) -> None:
+    """Set match_score for a newly created application."""
+    skill_ids = _skill_ids(application.applicant)
+    score = 0.0
+    if skill_ids:
+        rows = jaccard_scores(Job.skill_tags.through, "job_id", skill_ids, owners=[application.job_id])
+        score = next((r["score"] for r in rows), 0.0)
+    Application.objects.filter(pk=application.pk).update(match_score=score)
+    application.match_score = score
+
+
+def drop_jobs(job_ids) -> None:
+    """
+    Take closed or deleted jobs off recommendation lists and queue the
+    applicants who had them, so their lists are filled back up.
+    """
+    recommendations = Recommendation.objects.filter(job_id__in=job_ids)
+    applicant_ids = set(recommendations.values_list("applicant_id", flat=True))
+    recommendations.delete()
+    queue_on_commit(applicant_ids=applicant_ids)
+
+
+def queue(job_ids=(), applicant_ids=()) -> None:
+    """Queue jobs and applicants for refresh_queued."""
+    MatchRefresh.objects.bulk_create(
+        [MatchRefresh(job_id=pk) for pk in job_ids] + [MatchRefresh(applicant_id=pk) for pk in applicant_ids],
+        batch_size=500,
+    )
+
+
+def queue_on_commit(job_ids=(), applicant_ids=()) -> None:
+    """queue() once the current transaction commits; nothing if it rolls back."""
+    job_ids, applicant_ids = list(job_ids), list(applicant_ids)
+    if job_ids or applicant_ids:
+        transaction.on_commit(lambda: queue(job_ids, applicant_ids))
+
+
+def refresh_queued(batch_size=100) -> int:
+    """
+    Refresh the jobs and applicants in the oldest ``batch_size`` queue rows,
+    each once however often it was queued. Returns the number of rows done;
+    rows queued meanwhile are left for the next call.
+    """
+    rows = list(MatchRefresh.objects.order_by("pk").values_list("pk", "job_id", "applicant_id")[:batch_size])
+    if not rows:
+        return 0
+    job_ids = {job_id for _, job_id, _ in rows if job_id}
+    applicant_ids = {applicant_id for _, _, applicant_id in rows if applicant_id}
+    for job in Job.objects.filter(pk__in=job_ids):
+        refresh_job(job)
+    for user in get_user_model().objects.filter(pk__in=applicant_ids, role="applicant"):
+        refresh_applicant(user)
+    MatchRefresh.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+    return len(rows)
+
+
+def recommended_jobs(user, limit=10):
+    """Open, not-yet-applied jobs from the applicant's precomputed list."""
+    return (
+        Recommendation.objects.filter(applicant=user, job__in=Job.objects.open())
+        .exclude(job__applications__applicant=user)
+        .select_related("job", "job__employer")[:limit]
+    )
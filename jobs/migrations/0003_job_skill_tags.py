@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+def backfill_skill_tags(apps, schema_editor):
+    Skill = apps.get_model("core", "Skill")
+    Job = apps.get_model("jobs", "Job")
+    Through = Job.skill_tags.through
+
+    rows = []
+    for pk, skills in Job.objects.values_list("id", "skills").iterator():
+        names = {n.strip().lower()[:100] for n in (skills or "").split(",") if n.strip()}
+        rows.extend((pk, name) for name in names)
+    if not rows:
+        return
+    Skill.objects.bulk_create([Skill(name=n) for n in {name for _, name in rows}], ignore_conflicts=True)
+    ids = dict(Skill.objects.values_list("name", "id"))
+    Through.objects.bulk_create(
+        [Through(job_id=pk, skill_id=ids[name]) for pk, name in rows],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('jobs', '0002_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='jobs', to='core.skill'),
+        ),
+        migrations.RunPython(backfill_skill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+STATUSES = ["applied", "under_review", "shortlisted", "rejected", "hired", "withdrawn"]
+
+
+def backfill_stats(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("jobs", "Application")
+    JobStats = apps.get_model("jobs", "JobStats")
+    EmployerStats = apps.get_model("jobs", "EmployerStats")
+
+    per_job = {
+        pk: dict.fromkeys(STATUSES + ["total"], 0)
+        for pk in Job.objects.values_list("pk", flat=True)
+    }
+    counts = Application.objects.order_by().values_list("job_id", "status").annotate(n=models.Count("pk"))
+    for job_id, status, n in counts:
+        per_job[job_id][status] += n
+        per_job[job_id]["total"] += n
+    JobStats.objects.bulk_create([JobStats(job_id=pk, **c) for pk, c in per_job.items()], batch_size=500)
+
+    per_employer = {}
+    for job_id, employer_id in Job.objects.values_list("pk", "employer_id"):
+        totals = per_employer.setdefault(employer_id, dict.fromkeys(STATUSES + ["total", "jobs"], 0))
+        totals["jobs"] += 1
+        for field, n in per_job[job_id].items():
+            totals[field] += n
+    EmployerStats.objects.bulk_create(
+        [EmployerStats(employer_id=pk, **c) for pk, c in per_employer.items()], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_skill_tags'),
+        ('jobs', '0004_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployerStats',
+            fields=[
+                ('applied', models.PositiveIntegerField(default=0)),
+                ('under_review', models.PositiveIntegerField(default=0)),
+                ('shortlisted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('hired', models.PositiveIntegerField(default=0)),
+                ('withdrawn', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('employer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='job_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('jobs', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='JobStats',
+            fields=[
+                ('applied', models.PositiveIntegerField(default=0)),
+                ('under_review', models.PositiveIntegerField(default=0)),
+                ('shortlisted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('hired', models.PositiveIntegerField(default=0)),
+                ('withdrawn', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='jobs.job')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:10
+
+import django.core.validators
+import jobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(storage=jobs.storage.ContentAddressedStorage(), upload_to='resumes/%Y/%m/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_resume_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_resume_fts USING fts5("
+            "text, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    elif vendor == "postgresql":
+        # Same expression as jobs.search.PostgresSearchBackend.RESUME_VECTOR_SQL.
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_resume_search_gin ON jobs_resumetext "
+            "USING GIN ((to_tsvector('english', text)))"
+        )
+
+
+def drop_resume_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_resume_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS jobs_resume_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outboundemail'),
+        ('jobs', '0009_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_text', serialize=False, to='jobs.application')),
+                ('text', models.TextField(blank=True)),
+                ('page_count', models.PositiveIntegerField(default=0)),
+                ('skills', models.TextField(blank=True, help_text='Comma-separated skills found in the text')),
+                ('status', models.CharField(choices=[('done', 'Extracted'), ('failed', 'Failed')], default='done', max_length=10)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('skill_tags', models.ManyToManyField(blank=True, related_name='resumes', to='core.skill')),
+            ],
+        ),
+        migrations.RunPython(create_resume_index, drop_resume_index),
+    ]
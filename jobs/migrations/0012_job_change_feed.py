@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_application_status_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('job_id', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('closed', 'Closed'), ('deleted', 'Deleted')], max_length=10)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
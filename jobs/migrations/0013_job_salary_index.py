@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:59
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outboundemail'),
+        ('jobs', '0012_job_change_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('salary_max', 'salary_min'), descending=True), models.OrderBy(models.F('created_at'), descending=True), django.db.models.functions.comparison.Coalesce('salary_min', 'salary_max'), models.F('deadline'), condition=models.Q(('is_open', True)), name='job_open_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Coalesce('salary_max', 'salary_min'), '-', django.db.models.functions.comparison.Coalesce('salary_min', 'salary_max')), name='job_salary_width_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+STATUSES = ["applied", "under_review", "shortlisted", "rejected", "hired", "withdrawn"]
+
+
+def backfill_stats(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("jobs", "Application")
+    EmployerStats = apps.get_model("jobs", "EmployerStats")
+    ApplicantStats = apps.get_model("jobs", "ApplicantStats")
+
+    open_jobs = Job.objects.filter(is_open=True).order_by().values_list("employer_id").annotate(n=models.Count("pk"))
+    for employer_id, n in open_jobs:
+        EmployerStats.objects.filter(employer_id=employer_id).update(open_jobs=n)
+
+    per_applicant = {}
+    counts = Application.objects.order_by().values_list("applicant_id", "status").annotate(n=models.Count("pk"))
+    for applicant_id, status, n in counts:
+        totals = per_applicant.setdefault(applicant_id, dict.fromkeys(STATUSES + ["total"], 0))
+        totals[status] += n
+        totals["total"] += n
+    ApplicantStats.objects.bulk_create(
+        [ApplicantStats(applicant_id=pk, **c) for pk, c in per_applicant.items()], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_skill_tags'),
+        ('jobs', '0013_job_salary_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantStats',
+            fields=[
+                ('applied', models.PositiveIntegerField(default=0)),
+                ('under_review', models.PositiveIntegerField(default=0)),
+                ('shortlisted', models.PositiveIntegerField(default=0)),
+                ('rejected', models.PositiveIntegerField(default=0)),
+                ('hired', models.PositiveIntegerField(default=0)),
+                ('withdrawn', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('applicant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='employerstats',
+            name='open_jobs',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_stats_open_jobs_applicant'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('applicant_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
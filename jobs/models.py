@@ -3,12 +3,82 @@ from django.urls import reverse
 from django.utils import timezone
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
+from django.db.models import Count
+from django.db.models.functions import Coalesce
+
+from core.models import parse_skills
+
+from .storage import resume_storage
+
+# A job's advertised salary range with a missing bound taken from the other
+# one. Filters and ordering must use these exact expressions to be served
+# by job_open_salary_idx.
+SALARY_TOP = Coalesce("salary_max", "salary_min")
+SALARY_BOTTOM = Coalesce("salary_min", "salary_max")
+SALARY_WIDTH = SALARY_TOP - SALARY_BOTTOM
+
 
 class JobQuerySet(models.QuerySet):
     def open(self):
         today = timezone.now().date()
         return self.filter(is_open=True, deadline__gte=today)
 
+    def for_list(self):
+        """Columns rendered by the job list templates, with the employer joined."""
+        return self.select_related("employer").only(
+            "title", "company_name", "location", "job_type", "skills", "is_open",
+            "deadline", "salary_min", "salary_max", "created_at", "updated_at",
+            "employer__username", "employer__company",
+        )
+
+    def for_detail(self):
+        return self.select_related("employer")
+
+    def with_skills(self, names, match="all"):
+        """
+        Jobs tagged with any/all of ``names`` (already normalized), resolved
+        with one indexed subquery over the job-skill join table.
+        """
+        if not names:
+            return self
+        tagged = self.model.skill_tags.through.objects.filter(skill__name__in=names)
+        if match == "all":
+            tagged = tagged.values("job_id").annotate(n=Count("skill_id")).filter(n=len(set(names)))
+        return self.filter(pk__in=tagged.values("job_id"))
+
+    def with_salary(self, low=None, high=None):
+        """
+        Jobs whose salary range overlaps [low, high] (either bound may be
+        None); jobs without any salary never match.
+        """
+        qs = self.annotate(salary_top=SALARY_TOP, salary_bottom=SALARY_BOTTOM)
+        if low is not None:
+            qs = qs.filter(salary_top__gte=low)
+        if high is not None:
+            qs = qs.filter(salary_bottom__lte=high)
+        return qs
+
+    def by_salary(self, high=None):
+        """
+        Highest advertised salary first; jobs without one last.
+
+        Pass the with_salary() ``high`` bound: an overlap is two conditions
+        on two columns, which one index cannot range-scan. The widest
+        advertised range (a subquery served by job_salary_width_idx) caps
+        the top of every matching range, so the scan of job_open_salary_idx
+        starts at high + widest instead of at the best-paid job.
+        """
+        qs = self.annotate(salary_top=SALARY_TOP)
+        if high is not None:
+            widest = (
+                self.model.objects.annotate(width=SALARY_WIDTH)
+                .filter(width__isnull=False)
+                .order_by("-width")
+                .values("width")[:1]
+            )
+            qs = qs.filter(salary_top__lte=models.Value(high, output_field=models.BigIntegerField()) + Coalesce(models.Subquery(widest), 0))
+        return qs.order_by(models.F("salary_top").desc(nulls_last=True), "-created_at")
+
 class Job(models.Model):
     JOB_TYPES = (
         ("full_time", "Full Time"),
@@ -35,6 +105,9 @@ class Job(models.Model):
         blank=True,
         help_text="Comma-separated skills (e.g., Python, SQL, Django)"
     )
+    skill_tags = models.ManyToManyField("core.Skill", related_name="jobs", blank=True)
+    # Identifier from a partner feed; bulk imports upsert on (employer, external_id).
+    external_id = models.CharField(max_length=100, null=True, blank=True)
     is_open = models.BooleanField(default=True)
     deadline = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
@@ -44,6 +117,49 @@ class Job(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # JobQuerySet.open() ordered by recency; partial where supported.
+            models.Index(
+                fields=["-created_at", "deadline"],
+                condition=models.Q(is_open=True),
+                name="job_open_recent_idx",
+            ),
+            models.Index(fields=["is_open", "deadline"], name="job_open_deadline_idx"),
+            # Salary range filters (JobQuerySet.with_salary) and sorting.
+            models.Index(
+                SALARY_TOP.desc(),
+                models.F("created_at").desc(),
+                SALARY_BOTTOM,
+                "deadline",
+                condition=models.Q(is_open=True),
+                name="job_open_salary_idx",
+            ),
+            models.Index(SALARY_WIDTH, name="job_salary_width_idx"),
+            models.Index(fields=["employer", "-created_at"], name="job_employer_recent_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["employer", "external_id"], name="job_employer_external_id_uniq"),
+        ]
+
+    # Remembered as _loaded_<name> so closing a job is recorded as such in
+    # jobs.feed, and so saves that leave these alone skip the search index
+    # and matching refresh. Instances not loaded from the database have none.
+    LOADED_FIELDS = ("is_open", "skills", "deadline", "title", "description")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Only now, so every post_save receiver sees the values from before the save.
+        self._remember_loaded()
+
+    def _remember_loaded(self):
+        for name in self.LOADED_FIELDS:
+            setattr(self, f"_loaded_{name}", self.__dict__.get(name))
 
     def __str__(self):
         return f"{self.title} — {self.employer.username}"
@@ -56,7 +172,45 @@ class Job(models.Model):
         return self.is_open and self.deadline >= timezone.now().date()
 
     def skills_list(self):
-        return [s.strip().lower() for s in self.skills.split(",") if s.strip()]
+        if "skill_tags" in getattr(self, "_prefetched_objects_cache", {}):
+            return [s.name for s in self.skill_tags.all()]
+        return parse_skills(self.skills)
+
+class JobChange(models.Model):
+    """
+    Append-only log of job writes for the change feed (jobs.feed). The id is
+    the feed's sequence number; job_id is not a foreign key so entries
+    outlive deleted and archived jobs.
+    """
+
+    KINDS = (
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("closed", "Closed"),
+        ("deleted", "Deleted"),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    job_id = models.PositiveIntegerField()
+    kind = models.CharField(max_length=10, choices=KINDS)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"#{self.pk} job {self.job_id} {self.kind}"
+
+
+class ApplicationQuerySet(models.QuerySet):
+    def for_applicant(self):
+        """Rows for an applicant's own list: job and employer joined."""
+        return self.select_related("job", "job__employer")
+
+    def for_job(self):
+        """Rows for a job's applicant list: applicant and resume summary joined."""
+        return self.select_related("applicant", "resume_text").defer("resume_text__text")
+
+    def for_detail(self):
+        return self.select_related("job", "job__employer", "applicant")
+
 
 class Application(models.Model):
     STATUS_CHOICES = (
@@ -67,6 +221,16 @@ class Application(models.Model):
         ("hired", "Hired"),
         ("withdrawn", "Withdrawn"),
     )
+    # Statuses an employer may move an application to from each status.
+    # "withdrawn" is the applicant's own decision and never set by employers.
+    STATUS_TRANSITIONS = {
+        "applied": ("under_review", "shortlisted", "rejected"),
+        "under_review": ("shortlisted", "rejected"),
+        "shortlisted": ("under_review", "hired", "rejected"),
+        "rejected": ("under_review",),
+        "hired": (),
+        "withdrawn": (),
+    }
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="applications")
     applicant = models.ForeignKey(
@@ -76,19 +240,38 @@ class Application(models.Model):
     )
     resume = models.FileField(
         upload_to="resumes/%Y/%m/",
+        storage=resume_storage,
         validators=[FileExtensionValidator(allowed_extensions=["pdf"])],
     )
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="applied")
+    match_score = models.FloatField(null=True, blank=True)  # skill overlap with the job, see jobs.matching
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ApplicationQuerySet.as_manager()
+
     class Meta:
         ordering = ["-applied_at"]
         unique_together = (("job", "applicant"),)  # prevent duplicate applications
+        indexes = [
+            models.Index(fields=["applicant", "-applied_at"], name="app_applicant_recent_idx"),
+            models.Index(fields=["job", "-applied_at"], name="app_job_recent_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so status changes can be counted in jobs.stats
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
 
     def __str__(self):
         return f"{self.applicant.username} → {self.job.title} ({self.status})"
+
+    @classmethod
+    def can_transition(cls, old, new):
+        return new in cls.STATUS_TRANSITIONS.get(old, ())
     
     @property
     def display_company(self):
@@ -96,4 +279,234 @@ class Application(models.Model):
             self.company_name
             or getattr(self.employer, "company", "") 
             or self.employer.username
-        )
\ No newline at end of file
+        )
+
+
+class MatchRefresh(models.Model):
+    """
+    A job or applicant whose matches are out of date, queued once the write
+    commits and drained by jobs.matching.refresh_queued. Ids are not foreign
+    keys; rows for deleted jobs or users are skipped.
+    """
+
+    job_id = models.PositiveIntegerField(null=True, blank=True)
+    applicant_id = models.PositiveIntegerField(null=True, blank=True)
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.pk} job {self.job_id}" if self.job_id else f"#{self.pk} applicant {self.applicant_id}"
+
+
+class ApplicationStatusChange(models.Model):
+    """One employer status change of an application, written by jobs.triage."""
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="status_changes")
+    old_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    new_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-changed_at"]
+        indexes = [models.Index(fields=["application", "-changed_at"], name="app_status_history_idx")]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.old_status} → {self.new_status}"
+
+
+class ResumeText(models.Model):
+    """
+    Text, page count and skills extracted from an application's resume by
+    jobs.resume_index. Applications without a row have not been processed.
+    """
+
+    STATUS_CHOICES = (
+        ("done", "Extracted"),
+        ("failed", "Failed"),
+    )
+
+    application = models.OneToOneField(
+        Application, on_delete=models.CASCADE, primary_key=True, related_name="resume_text"
+    )
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    skills = models.TextField(blank=True, help_text="Comma-separated skills found in the text")
+    skill_tags = models.ManyToManyField("core.Skill", related_name="resumes", blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="done")
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def skills_list(self):
+        return parse_skills(self.skills)
+
+    def __str__(self):
+        return f"Resume text for application {self.application_id} ({self.status})"
+
+
+class Recommendation(models.Model):
+    """Precomputed top-N job matches for an applicant (maintained by jobs.matching)."""
+
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="recommendations")
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-score"]
+        unique_together = (("applicant", "job"),)
+        indexes = [models.Index(fields=["applicant", "-score"])]
+
+    def __str__(self):
+        return f"{self.applicant_id} → {self.job_id} ({self.score:.2f})"
+
+
+class StatusCounts(models.Model):
+    """Application counts per status; field names match Application.STATUS_CHOICES."""
+
+    applied = models.PositiveIntegerField(default=0)
+    under_review = models.PositiveIntegerField(default=0)
+    shortlisted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    hired = models.PositiveIntegerField(default=0)
+    withdrawn = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def status_breakdown(self):
+        return [(label, getattr(self, key)) for key, label in Application.STATUS_CHOICES]
+
+
+class JobStats(StatusCounts):
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+
+    def __str__(self):
+        return f"Stats for job {self.job_id}"
+
+
+class EmployerStats(StatusCounts):
+    employer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="job_stats",
+    )
+    jobs = models.PositiveIntegerField(default=0)
+    # Jobs with is_open set; one past its deadline counts until the expiry
+    # sweep (jobs.expiry.close_expired) closes it.
+    open_jobs = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats for employer {self.employer_id}"
+
+
+class ApplicantStats(StatusCounts):
+    applicant = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="application_stats",
+    )
+
+    def __str__(self):
+        return f"Stats for applicant {self.applicant_id}"
+
+
+class ArchivedJob(models.Model):
+    """
+    Cold copy of a long-closed Job, moved out by jobs.expiry.archive_closed
+    so the hot tables only hold live postings. Keeps the original id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    employer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_jobs",
+    )
+    external_id = models.CharField(max_length=100, null=True, blank=True)
+    company_name = models.CharField(max_length=255, blank=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    location = models.CharField(max_length=200, blank=True)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    salary_min = models.PositiveIntegerField(null=True, blank=True)
+    salary_max = models.PositiveIntegerField(null=True, blank=True)
+    skills = models.TextField(blank=True)
+    deadline = models.DateField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["employer", "-created_at"], name="archived_job_employer_idx")]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class ArchivedApplication(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name="applications")
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_applications",
+    )
+    resume = models.CharField(max_length=100)  # storage name; files are shared, see jobs.storage
+    cover_letter = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    match_score = models.FloatField(null=True, blank=True)
+    applied_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-applied_at"]
+        indexes = [models.Index(fields=["applicant", "-applied_at"], name="archived_app_applicant_idx")]
+
+    def __str__(self):
+        return f"{self.applicant_id} → {self.job_id} ({self.status}, archived)"
+
+
+class ArchivedStatusChange(models.Model):
+    """ApplicationStatusChange of an archived application; keeps the original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    application = models.ForeignKey(ArchivedApplication, on_delete=models.CASCADE, related_name="status_changes")
+    old_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    new_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-changed_at"]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.old_status} → {self.new_status} (archived)"
+
+
+class ArchivedResumeText(models.Model):
+    """ResumeText of an archived application, without the skill tags (they follow from ``skills``)."""
+
+    application = models.OneToOneField(
+        ArchivedApplication, on_delete=models.CASCADE, primary_key=True, related_name="resume_text"
+    )
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    skills = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=ResumeText.STATUS_CHOICES)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Resume text for archived application {self.application_id} ({self.status})"
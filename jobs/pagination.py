@@ -0,0 +1,122 @@
+"""
+Keyset ("cursor") pagination on (created_at, id), matching Job.Meta.ordering.
+
+Each page is one indexed range query of per_page + 1 rows, with no COUNT
+and no OFFSET, so page 500 costs the same as page 1. Cursors are opaque
+URL-safe tokens.
+"""
+import base64
+import json
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj, direction):
+    """Cursor for a model instance or a values() row with created_at and pk."""
+    created_at, pk = (obj["created_at"], obj["pk"]) if isinstance(obj, dict) else (obj.created_at, obj.pk)
+    raw = json.dumps([direction, created_at.isoformat(), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        direction, created_at, pk = json.loads(raw)
+        created_at = parse_datetime(created_at)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+    if direction not in ("n", "p") or created_at is None or not isinstance(pk, int):
+        raise InvalidCursor(token)
+    return direction, created_at, pk
+
+
+def estimate_count(queryset, cap=1000):
+    """
+    Cheap result count for display. PostgreSQL uses the planner's row
+    estimate; elsewhere rows are counted up to ``cap`` (``None`` means
+    "more than cap").
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    count = queryset[: cap + 1].count()
+    return None if count > cap else count
+
+
+class CursorPage:
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator:
+    def __init__(self, queryset, per_page=10):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def _window(self, cursor):
+        """Ordered queryset for the requested page and its direction."""
+        if not cursor:
+            return "n", self.queryset.order_by("-created_at", "-pk"), False
+        direction, created_at, pk = decode_cursor(cursor)
+        if direction == "n":
+            after = Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            return direction, self.queryset.filter(after).order_by("-created_at", "-pk"), True
+        before = Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+        return direction, self.queryset.filter(before).order_by("created_at", "pk"), True
+
+    def _build(self, rows, direction, has_cursor):
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == "p":
+            rows.reverse()
+            has_next, has_previous = True, more
+        else:
+            has_next, has_previous = more, has_cursor
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1], "n") if rows and has_next else None,
+            previous_cursor=encode_cursor(rows[0], "p") if rows and has_previous else None,
+        )
+
+    def page(self, cursor=None):
+        """Page after/before ``cursor``; an invalid cursor gives the first page."""
+        try:
+            direction, qs, has_cursor = self._window(cursor)
+        except InvalidCursor:
+            direction, qs, has_cursor = self._window(None)
+        return self._build(list(qs[: self.per_page + 1]), direction, has_cursor)
+
+    async def apage(self, cursor=None):
+        """Async page() for async views."""
+        try:
+            direction, qs, has_cursor = self._window(cursor)
+        except InvalidCursor:
+            direction, qs, has_cursor = self._window(None)
+        return self._build([obj async for obj in qs[: self.per_page + 1]], direction, has_cursor)
@@ -0,0 +1,434 @@
+"""
+Pure-Python PDF text extraction for resumes.
+
+Deliberately small: it reads the objects of a PDF (including compressed
+object streams), walks the page tree and interprets the text-showing
+operators (Tj, TJ, ', ") of each page's content streams. Only FlateDecode
+and unfiltered streams are read, and only when text is read from them;
+a stream inflating past MAX_STREAM_BYTES (or all of a file's streams past
+MAX_DECODED_BYTES) makes the file unreadable.
+
+Strings in fonts with a ToUnicode CMap are mapped through it; composite
+(Identity) fonts without one are skipped and everything else is read as
+Latin-1, which covers the simple fonts most resume builders emit. Text
+inside form XObjects and annotations is not extracted.
+
+Nothing here imports Django, so the functions run in the pool worker
+processes started by jobs.resume_index.
+"""
+import re
+import zlib
+
+MAX_TEXT_CHARS = 100_000
+MAX_STREAM_BYTES = 8 * 1024 * 1024  # inflated size of one stream
+MAX_DECODED_BYTES = 32 * 1024 * 1024  # inflated size of all streams read from one file
+
+_OBJ_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+_STREAM_RE = re.compile(rb">>\s*stream(?:\r\n|\n|\r)")
+_REF = rb"\s*(\d+)\s+\d+\s+R"
+_DELIMITERS = b"()<>[]{}/%"
+_WHITESPACE = b" \t\r\n\f\x00"
+_ESCAPES = {ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b", ord("f"): b"\f"}
+_NUMBER_RE = re.compile(rb"[+-]?(\d+\.?\d*|\.\d+)$")
+_KERNING_SPACE = -200  # TJ offsets below this (thousandths of an em) read as a space
+
+
+class PDFError(ValueError):
+    pass
+
+
+class _Object:
+    """
+    A PDF object. Stream data is decoded on first access to ``stream``, so
+    only the streams text is read from (page contents, ToUnicode CMaps and
+    object streams) are ever inflated.
+    """
+
+    __slots__ = ("header", "raw", "budget", "_stream")
+
+    def __init__(self, header, raw=None, budget=None):
+        self.header = header
+        self.raw = raw
+        self.budget = budget
+        self._stream = None
+
+    @property
+    def stream(self):
+        if self._stream is None and self.raw is not None:
+            self._stream = _decode_stream(self.header, self.raw, self.budget)
+            self.raw = None
+        return self._stream
+
+
+class _Budget:
+    """Decoded bytes still allowed for one document."""
+
+    def __init__(self, total):
+        self.remaining = total
+
+    def take(self, n):
+        self.remaining -= n
+
+
+def _filters(header):
+    m = re.search(rb"/Filter\s*(\[[^\]]*\]|/\w+)", header)
+    return re.findall(rb"/(\w+)", m.group(1)) if m else []
+
+
+def _decode_stream(header, raw, budget):
+    filters = _filters(header)
+    if not filters:
+        return raw
+    if filters != [b"FlateDecode"]:
+        return b""  # images and other encodings carry no text
+    limit = min(MAX_STREAM_BYTES, budget.remaining)
+    try:
+        # decompressobj tolerates the EOL before "endstream"; max_length
+        # stops a compression bomb after ``limit`` bytes.
+        data = zlib.decompressobj().decompress(raw, limit + 1)
+    except zlib.error:
+        return b""
+    if len(data) > limit:
+        raise PDFError("Compressed stream too large.")
+    budget.take(len(data))
+    return data
+
+
+def _read_objects(data):
+    objects = {}
+    budget = _Budget(MAX_DECODED_BYTES)
+    pos = 0
+    while m := _OBJ_RE.search(data, pos):
+        start = m.end()
+        end = data.find(b"endobj", start)
+        if end < 0:
+            break
+        stream = _STREAM_RE.search(data, start, end)
+        if stream:
+            stream_end = data.find(b"endstream", stream.end())
+            if stream_end < 0:
+                break
+            header = data[start:stream.start() + 2]
+            objects[int(m.group(1))] = _Object(header, data[stream.end():stream_end], budget)
+            end = data.find(b"endobj", stream_end)
+            if end < 0:
+                break
+        else:
+            objects[int(m.group(1))] = _Object(data[start:end])
+        pos = end + len(b"endobj")
+
+    for obj in list(objects.values()):
+        if obj.raw is not None and re.search(rb"/Type\s*/ObjStm\b", obj.header):
+            _read_object_stream(obj, objects)
+    return objects
+
+
+def _read_object_stream(obj, objects):
+    first = re.search(rb"/First\s+(\d+)", obj.header)
+    if not first:
+        return
+    first = int(first.group(1))
+    numbers = [int(n) for n in obj.stream[:first].split()]
+    pairs = list(zip(numbers[::2], numbers[1::2]))
+    for i, (num, offset) in enumerate(pairs):
+        end = first + pairs[i + 1][1] if i + 1 < len(pairs) else len(obj.stream)
+        objects.setdefault(num, _Object(obj.stream[first + offset:end]))
+
+
+def _ref(header, key):
+    m = re.search(rb"/" + key + _REF, header)
+    return int(m.group(1)) if m else None
+
+
+def _inline_dict(header, key):
+    """The balanced ``<< ... >>`` following ``/key``, or None."""
+    m = re.search(rb"/" + key + rb"\s*<<", header)
+    if not m:
+        return None
+    depth, i = 1, m.end()
+    while i < len(header) and depth:
+        if header.startswith(b"<<", i):
+            depth, i = depth + 1, i + 2
+        elif header.startswith(b">>", i):
+            depth, i = depth - 1, i + 2
+        else:
+            i += 1
+    return header[m.end():i - 2]
+
+
+def _resolve_dict(objects, header, key):
+    num = _ref(header, key)
+    if num is not None:
+        return objects[num].header if num in objects else None
+    return _inline_dict(header, key)
+
+
+def _page_list(objects):
+    """[(page header, resources)] in reading order."""
+    root = next((o for o in objects.values() if re.search(rb"/Type\s*/Catalog\b", o.header)), None)
+    pages_num = _ref(root.header, b"Pages") if root else None
+    pages, seen = [], set()
+
+    def walk(num, resources):
+        if num in seen or num not in objects:
+            return
+        seen.add(num)
+        header = objects[num].header
+        resources = _resolve_dict(objects, header, b"Resources") or resources
+        kids = re.search(rb"/Kids\s*\[([^\]]*)\]", header)
+        if kids and re.search(rb"/Type\s*/Pages\b", header):
+            for kid in re.findall(rb"(\d+)\s+\d+\s+R", kids.group(1)):
+                walk(int(kid), resources)
+        else:
+            pages.append((header, resources))
+
+    if pages_num is not None:
+        walk(pages_num, None)
+    if not pages:
+        # No usable page tree (damaged or unusual file): object order.
+        for num in sorted(objects):
+            header = objects[num].header
+            if re.search(rb"/Type\s*/Page(?![a-zA-Z])", header):
+                pages.append((header, _resolve_dict(objects, header, b"Resources")))
+    return pages
+
+
+def _hex_text(value):
+    return bytes.fromhex(re.sub(rb"\s", b"", value).decode())
+
+
+def parse_cmap(data):
+    """ToUnicode CMap -> ({code bytes: text}, code length)."""
+    cmap = {}
+    for block in re.findall(rb"beginbfchar(.*?)endbfchar", data, re.S):
+        codes = re.findall(rb"<([0-9A-Fa-f\s]*)>", block)
+        for src, dst in zip(codes[::2], codes[1::2]):
+            cmap[_hex_text(src)] = _hex_text(dst).decode("utf-16-be", "replace")
+    for block in re.findall(rb"beginbfrange(.*?)endbfrange", data, re.S):
+        tokens = re.findall(rb"<[0-9A-Fa-f\s]*>|\[[^\]]*\]", block)
+        for lo, hi, dst in zip(tokens[::3], tokens[1::3], tokens[2::3]):
+            lo_code, hi_code = _hex_text(lo[1:-1]), _hex_text(hi[1:-1])
+            width = len(lo_code)
+            start, stop = int.from_bytes(lo_code, "big"), int.from_bytes(hi_code, "big")
+            if stop - start > 0xFFFF:
+                continue
+            if dst.startswith(b"["):
+                targets = [_hex_text(t) for t in re.findall(rb"<([0-9A-Fa-f\s]*)>", dst)]
+            else:
+                base = _hex_text(dst[1:-1])
+                first = int.from_bytes(base, "big")
+                targets = [(first + i).to_bytes(len(base), "big") for i in range(stop - start + 1)]
+            for i, target in enumerate(targets[: stop - start + 1]):
+                cmap[(start + i).to_bytes(width, "big")] = target.decode("utf-16-be", "replace")
+    width = max((len(code) for code in cmap), default=1)
+    return cmap, width
+
+
+def _fonts(objects, resources):
+    """{font resource name: (cmap, code length)} for fonts not read as Latin-1."""
+    fonts = {}
+    font_dict = _resolve_dict(objects, resources, b"Font") if resources else None
+    for name, num in re.findall(rb"/([^\s/<>\[\]()]+)" + _REF, font_dict or b""):
+        font = objects.get(int(num))
+        to_unicode = _ref(font.header, b"ToUnicode") if font else None
+        cmap_obj = objects.get(to_unicode)
+        if cmap_obj is not None and cmap_obj.stream:
+            fonts[name] = parse_cmap(cmap_obj.stream)
+        elif font and re.search(rb"/Encoding\s*/Identity-[HV]\b", font.header):
+            fonts[name] = ({}, 2)  # glyph ids with no mapping back to text: skip
+    return fonts
+
+
+def _literal_string(data, i):
+    """Parse ``( ... )`` starting after the opening paren; returns (bytes, next index)."""
+    out, depth = bytearray(), 1
+    while i < len(data):
+        c = data[i]
+        if c == 0x5C:  # backslash
+            i += 1
+            if i >= len(data):
+                break
+            c = data[i]
+            if c in _ESCAPES:
+                out += _ESCAPES[c]
+            elif 0x30 <= c <= 0x37:
+                digits = re.match(rb"[0-7]{1,3}", data[i:i + 3]).group()
+                out.append(int(digits, 8) & 0xFF)
+                i += len(digits) - 1
+            elif c in b"\r\n":
+                if c == 0x0D and data[i + 1:i + 2] == b"\n":
+                    i += 1
+            else:
+                out.append(c)
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), i + 1
+            out.append(c)
+        else:
+            out.append(c)
+        i += 1
+    return bytes(out), i
+
+
+def _tokens(data):
+    """Yield (kind, value) tokens of a content stream."""
+    i, n = 0, len(data)
+    while i < n:
+        c = data[i]
+        if c in _WHITESPACE:
+            i += 1
+        elif c == 0x25:  # % comment
+            end = data.find(b"\n", i)
+            i = n if end < 0 else end + 1
+        elif c == 0x28:
+            value, i = _literal_string(data, i + 1)
+            yield "str", value
+        elif data.startswith(b"<<", i) or data.startswith(b">>", i):
+            i += 2
+        elif c == 0x3C:
+            end = data.find(b">", i)
+            end = n if end < 0 else end
+            hexdigits = re.sub(rb"[^0-9A-Fa-f]", b"", data[i + 1:end])
+            yield "str", bytes.fromhex((hexdigits + b"0" * (len(hexdigits) % 2)).decode())
+            i = end + 1
+        elif c in b"[]":
+            yield chr(c), None
+            i += 1
+        elif c == 0x2F:  # /Name
+            j = i + 1
+            while j < n and data[j] not in _WHITESPACE and data[j] not in _DELIMITERS:
+                j += 1
+            yield "name", data[i + 1:j]
+            i = j
+        else:
+            j = i + 1
+            while j < n and data[j] not in _WHITESPACE and data[j] not in _DELIMITERS:
+                j += 1
+            word = data[i:j]
+            i = j
+            if _NUMBER_RE.match(word):
+                yield "num", float(word)
+            elif word == b"ID":
+                # Inline image data runs to "EI"; nothing to read in it.
+                end = re.compile(rb"\sEI(?=[\s]|$)").search(data, i)
+                i = n if end is None else end.end()
+            elif word:
+                yield "op", word
+
+
+def _decode(value, font):
+    if font is None:
+        return value.decode("latin-1")
+    cmap, width = font
+    return "".join(
+        cmap.get(value[k:k + width], "") for k in range(0, len(value) - width + 1, width)
+    )
+
+
+def _page_text(content, fonts):
+    out = []
+    operands, array = [], None
+    font = None
+    last_y = None
+    for kind, value in _tokens(content):
+        if kind == "[":
+            array = []
+            continue
+        if kind == "]":
+            operands.append(("array", array or []))
+            array = None
+            continue
+        if array is not None:
+            array.append((kind, value))
+            continue
+        if kind != "op":
+            operands.append((kind, value))
+            continue
+
+        if value == b"Tf" and len(operands) >= 2 and operands[-2][0] == "name":
+            font = fonts.get(operands[-2][1])
+        elif value == b"Tj" and operands and operands[-1][0] == "str":
+            out.append(_decode(operands[-1][1], font))
+        elif value in (b"'", b'"') and operands and operands[-1][0] == "str":
+            out.append("\n" + _decode(operands[-1][1], font))
+        elif value == b"TJ" and operands and operands[-1][0] == "array":
+            for item_kind, item in operands[-1][1]:
+                if item_kind == "str":
+                    out.append(_decode(item, font))
+                elif item_kind == "num" and item < _KERNING_SPACE:
+                    out.append(" ")
+        elif value == b"T*":
+            out.append("\n")
+        elif value in (b"Td", b"TD") and len(operands) >= 2:
+            out.append(" " if operands[-1] == ("num", 0.0) else "\n")
+        elif value == b"Tm" and operands:
+            y = operands[-1][1]
+            out.append(" " if y == last_y else "\n")
+            last_y = y
+        elif value == b"ET":
+            out.append(" ")
+        operands = []
+    return "".join(out)
+
+
+def _clean(text):
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)[:MAX_TEXT_CHARS]
+
+
+def extract_text(data):
+    """(text, page count) of the PDF in ``data``; raises PDFError when unreadable."""
+    if not data.startswith(b"%PDF-"):
+        raise PDFError("Not a PDF file.")
+    objects = _read_objects(data)
+    if not objects:
+        raise PDFError("No PDF objects found.")
+    if any(re.search(rb"/Encrypt\b", o.header) for o in objects.values()):
+        raise PDFError("Encrypted PDF.")
+    pages = _page_list(objects)
+    texts = []
+    for header, resources in pages:
+        fonts = _fonts(objects, resources)
+        contents = re.search(rb"/Contents\s*(\[[^\]]*\]|\d+\s+\d+\s+R)", header)
+        refs = re.findall(rb"(\d+)\s+\d+\s+R", contents.group(1)) if contents else []
+        streams = [objects[int(r)].stream for r in refs if int(r) in objects]
+        texts.append(_page_text(b"\n".join(s for s in streams if s), fonts))
+    return _clean("\n".join(texts)), len(pages)
+
+
+class SkillMatcher:
+    """Finds known skill names (core.Skill) as whole words in a text."""
+
+    def __init__(self, names):
+        names = sorted({n.lower() for n in names if n}, key=len, reverse=True)
+        self.pattern = (
+            re.compile(r"(?<![\w+#])(" + "|".join(map(re.escape, names)) + r")(?![\w+#])", re.IGNORECASE)
+            if names
+            else None
+        )
+
+    def find(self, text) -> list[str]:
+        if self.pattern is None:
+            return []
+        return sorted({m.group(1).lower() for m in self.pattern.finditer(text)})
+
+
+_matcher = SkillMatcher(())
+
+
+def init_worker(skill_names):
+    """Pool initializer: compile the skill vocabulary once per worker."""
+    global _matcher
+    _matcher = SkillMatcher(skill_names)
+
+
+def parse_file(path):
+    """(text, page count, detected skills) for the PDF at ``path``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    text, pages = extract_text(data)
+    return text, pages, _matcher.find(text)
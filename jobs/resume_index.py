@@ -0,0 +1,141 @@
+"""
+Background extraction of resume text.
+
+Applications without a ResumeText row are pending. extract_pending() takes
+a batch of them, parses every distinct resume file once (content-addressed
+storage means identical uploads share a file) with jobs.pdftext in a pool
+of worker processes, and stores the text, page count and the core.Skill
+names found in it. The text goes into the search index so job_applicants
+can search resumes without opening files at request time.
+
+Run ``manage.py extract_resumes --loop`` next to the web workers (see the
+Procfile). A file that takes longer than RESUME_EXTRACT_TIMEOUT seconds is
+failed and its worker replaced, so one pathological PDF cannot stall the
+queue. ResumeText rows are written with bulk_create, so skill tags and
+the index are updated here rather than from signals.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Skill, bulk_sync_skill_tags
+
+from . import pdftext
+from .models import Application, ResumeText
+from .search import get_search_backend
+
+WORKERS = getattr(settings, "RESUME_EXTRACT_WORKERS", min(4, os.cpu_count() or 1))
+TIMEOUT = getattr(settings, "RESUME_EXTRACT_TIMEOUT", 60)  # seconds per file
+MAX_ERROR_LENGTH = ResumeText._meta.get_field("error").max_length
+
+
+def pending(retry_failed_before=None):
+    """Applications to process; failures are retried if they happened before the given time."""
+    missing = Q(resume_text__isnull=True)
+    if retry_failed_before is not None:
+        missing |= Q(resume_text__status="failed", resume_text__extracted_at__lt=retry_failed_before)
+    return Application.objects.filter(missing).exclude(resume="")
+
+
+def _parse(path):
+    try:
+        return pdftext.parse_file(path)
+    except Exception as e:  # one bad upload must not sink the batch
+        return e
+
+
+def _stop(pool):
+    """Shut ``pool`` down without waiting for the files its workers are on."""
+    if hasattr(pool, "terminate_workers"):  # Python 3.14+
+        pool.terminate_workers()
+        return
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_files(paths, skill_names, workers, timeout=None):
+    """
+    {path: (text, pages, skills) or the exception}; ``workers=0`` parses
+    in-process. A file still parsing ``timeout`` seconds (default
+    RESUME_EXTRACT_TIMEOUT) after its turn came is failed with TimeoutError:
+    the pool is recycled and the files without a result yet are parsed
+    again. If a worker dies (killed for memory, say), the files without a
+    result yet are failed with BrokenProcessPool rather than raising, so the
+    batch is recorded and the queue moves past it.
+    """
+    if workers == 0:
+        pdftext.init_worker(skill_names)
+        return {path: _parse(path) for path in paths}
+    timeout = TIMEOUT if timeout is None else timeout
+    results = {}
+    todo = list(paths)
+    while todo:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(todo)), initializer=pdftext.init_worker, initargs=(skill_names,)
+        )
+        futures = [(path, pool.submit(_parse, path)) for path in todo]
+        stuck = False
+        try:
+            for path, future in futures:
+                try:
+                    results[path] = future.result(timeout=timeout)
+                except TimeoutError:
+                    results[path] = TimeoutError(f"Still parsing after {timeout} seconds.")
+                    stuck = True
+                    break
+        except BrokenProcessPool as e:
+            for path in todo:
+                results.setdefault(path, e)
+        finally:
+            if stuck:
+                _stop(pool)
+            else:
+                pool.shutdown()
+        # Keep what finished before the pool was stopped; parse the rest again.
+        for path, future in futures:
+            if path not in results and future.done() and not future.cancelled() and future.exception() is None:
+                results[path] = future.result()
+        todo = [path for path in todo if path not in results]
+    return results
+
+
+def _row(application_id, result):
+    if isinstance(result, Exception):
+        error = f"{type(result).__name__}: {result}"[:MAX_ERROR_LENGTH]
+        return ResumeText(application_id=application_id, status="failed", error=error)
+    text, pages, skills = result
+    return ResumeText(application_id=application_id, text=text, page_count=pages, skills=", ".join(skills))
+
+
+def extract_pending(batch_size=100, workers=None, retry_failed_before=None, timeout=None) -> tuple[int, int]:
+    """Process one batch of pending resumes; returns (extracted, failed)."""
+    workers = WORKERS if workers is None else workers
+    apps = list(pending(retry_failed_before).order_by("pk").values_list("pk", "resume")[:batch_size])
+    if not apps:
+        return 0, 0
+
+    storage = Application._meta.get_field("resume").storage
+    paths = {name: storage.path(name) for name in {name for _, name in apps}}
+    skill_names = list(Skill.objects.values_list("name", flat=True))
+    results = parse_files(sorted(set(paths.values())), skill_names, workers, timeout)
+
+    with transaction.atomic():
+        # Applications deleted while their files were being parsed.
+        live = set(Application.objects.filter(pk__in=[pk for pk, _ in apps]).values_list("pk", flat=True))
+        rows = [_row(pk, results[paths[name]]) for pk, name in apps if pk in live]
+        ResumeText.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["application"],
+            update_fields=["text", "page_count", "skills", "status", "error", "extracted_at"],
+        )
+        bulk_sync_skill_tags(rows)
+        get_search_backend().index_resumes((row.pk, row.text) for row in rows)
+
+    failed = sum(row.status == "failed" for row in rows)
+    return len(rows) - failed, failed
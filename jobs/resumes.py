@@ -0,0 +1,112 @@
+"""
+Resume delivery.
+
+Permission checks stay in the view; this module only builds the response.
+When RESUME_SENDFILE_BACKEND is set, Django returns headers only and the
+front web server streams the file (nginx ``X-Accel-Redirect`` from an
+``internal`` location mapped to RESUME_SENDFILE_PREFIX, or Apache/lighttpd
+``X-Sendfile``), so no app worker is held for the transfer. Otherwise the
+file is served here with single byte-range and ETag/If-None-Match support.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, parse_etags, quote_etag
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def resume_etag(field_file) -> str:
+    # Content-addressed names are the file's SHA-256; older uploads fall
+    # back to size and modification time.
+    stem = os.path.splitext(os.path.basename(field_file.name))[0]
+    if re.fullmatch(r"[0-9a-f]{64}", stem):
+        return quote_etag(stem)
+    stat = os.stat(field_file.path)
+    return quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single ``bytes=`` range, ``None`` for a
+    missing or unsupported header (serve the whole file) and ``()`` when the
+    range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(" ", "")) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return ()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return ()
+    return start, end
+
+
+def _read_range(f, start, length):
+    with f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _sendfile(field_file, filename):
+    backend = getattr(settings, "RESUME_SENDFILE_BACKEND", "")
+    response = HttpResponse(content_type="application/pdf")
+    if backend == "nginx":
+        prefix = getattr(settings, "RESUME_SENDFILE_PREFIX", "/protected/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + field_file.name
+    else:
+        response["X-Sendfile"] = field_file.path
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    return response
+
+
+def serve_resume(request, field_file, filename):
+    """Response for an already-authorized resume download."""
+    if getattr(settings, "RESUME_SENDFILE_BACKEND", ""):
+        return _sendfile(field_file, filename)
+
+    etag = resume_etag(field_file)
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    size = field_file.size
+    byte_range = None
+    if request.headers.get("If-Range", etag) == etag:
+        byte_range = parse_range(request.headers.get("Range"), size)
+
+    if byte_range == ():
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(field_file.open("rb"), start, end - start + 1),
+            status=206,
+            content_type="application/pdf",
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Disposition"] = content_disposition_header(True, filename)
+    else:
+        response = FileResponse(field_file.open("rb"), as_attachment=True, filename=filename)
+    response["ETag"] = etag
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private, no-cache"
+    return response
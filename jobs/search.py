@@ -0,0 +1,212 @@
+import re
+from functools import cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = "jobs_job_fts"
+_FTS_INSERT = f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)"
+RESUME_FTS_TABLE = "jobs_resume_fts"
+_RESUME_FTS_INSERT = f"INSERT INTO {RESUME_FTS_TABLE} (rowid, text) VALUES (%s, %s)"
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a free-text query into lowercase word terms."""
+    return _TERM_RE.findall(query.lower())
+
+
+class BaseSearchBackend:
+    """
+    Keyword search over jobs and extracted resume text. Backends filter and
+    rank a Job queryset, filter an Application queryset by resume content,
+    and keep whatever index they use in sync with the rows.
+    """
+
+    def search(self, qs, query: str):
+        raise NotImplementedError
+
+    def search_resumes(self, qs, query: str):
+        raise NotImplementedError
+
+    def index_resumes(self, rows) -> None:
+        """``rows``: (application id, text) pairs."""
+
+    def remove_resume(self, application_id: int) -> None:
+        pass
+
+    def index_job(self, job) -> None:
+        pass
+
+    def remove_job(self, job_id: int) -> None:
+        pass
+
+    def rebuild(self, batch_size: int = 500) -> int:
+        return 0
+
+
+class SubstringSearchBackend(BaseSearchBackend):
+    """Fallback without an index: LIKE over title and description."""
+
+    def search(self, qs, query):
+        return qs.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+    def search_resumes(self, qs, query):
+        return qs.filter(resume_text__text__icontains=query)
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """
+    FTS5 virtual table keyed by job id. Every term is matched as a prefix so
+    partial words still hit, and results are ordered by bm25 (title weighted
+    over description).
+    """
+
+    def match_expression(self, query):
+        return " ".join(f'"{term}"*' for term in search_terms(query))
+
+    def search(self, qs, query):
+        match = self.match_expression(query)
+        if not match:
+            return qs
+        # Joined, not a subquery: the MATCH runs once and bm25() reads the
+        # rank of the row it is on, instead of a MATCH per candidate job.
+        # The job side of the join goes through the ORM so it follows the
+        # alias jobs_job gets when the queryset is nested (jobs.facets).
+        return (
+            qs.extra(
+                tables=[FTS_TABLE],
+                where=[f"{FTS_TABLE} MATCH %s"],
+                params=[match],
+                select={"search_rank": f"bm25({FTS_TABLE}, 10.0, 1.0)"},
+            )
+            .filter(pk=RawSQL(f"{FTS_TABLE}.rowid", ()))
+            .order_by("search_rank", "-created_at")
+        )
+
+    def search_resumes(self, qs, query):
+        match = self.match_expression(query)
+        if not match:
+            return qs
+        matching = RawSQL(f"SELECT rowid FROM {RESUME_FTS_TABLE} WHERE {RESUME_FTS_TABLE} MATCH %s", (match,))
+        return qs.filter(pk__in=matching)
+
+    def index_resumes(self, rows):
+        rows = list(rows)
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {RESUME_FTS_TABLE} WHERE rowid = %s", [(pk,) for pk, _ in rows])
+            cursor.executemany(_RESUME_FTS_INSERT, [(pk, text) for pk, text in rows if text])
+
+    def remove_resume(self, application_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {RESUME_FTS_TABLE} WHERE rowid = %s", [application_id])
+
+    def index_job(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job.pk])
+            cursor.execute(_FTS_INSERT, [job.pk, job.title, job.description])
+
+    def remove_job(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_id])
+
+    def rebuild(self, batch_size=500):
+        from .models import Job, ResumeText
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {RESUME_FTS_TABLE}")
+        batch = []
+        for row in ResumeText.objects.exclude(text="").values_list("application_id", "text").iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self.index_resumes(batch)
+                batch = []
+        self.index_resumes(batch)
+
+        count = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            rows = Job.objects.order_by().values_list("id", "title", "description")
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    cursor.executemany(_FTS_INSERT, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(_FTS_INSERT, batch)
+                count += len(batch)
+        return count
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    tsvector search backed by the GIN expression index created in the
+    jobs search migration. The index is maintained by Postgres itself, so
+    index_job/remove_job have nothing to do.
+    """
+
+    # Must stay identical to the indexed expression in the migration.
+    VECTOR_SQL = (
+        "setweight(to_tsvector('english', coalesce(jobs_job.title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(jobs_job.description, '')), 'B')"
+    )
+
+    def search(self, qs, query):
+        terms = search_terms(query)
+        if not terms:
+            return qs
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        matches = RawSQL(
+            f"({self.VECTOR_SQL}) @@ to_tsquery('english', %s)",
+            (tsquery,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({self.VECTOR_SQL}, to_tsquery('english', %s))",
+            (tsquery,),
+            output_field=FloatField(),
+        )
+        return qs.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "-created_at")
+
+    # Must stay identical to the indexed expression in the resume text migration.
+    RESUME_VECTOR_SQL = "to_tsvector('english', jobs_resumetext.text)"
+
+    def search_resumes(self, qs, query):
+        terms = search_terms(query)
+        if not terms:
+            return qs
+        matching = RawSQL(
+            f"SELECT application_id FROM jobs_resumetext WHERE {self.RESUME_VECTOR_SQL} @@ to_tsquery('english', %s)",
+            (" & ".join(f"{term}:*" for term in terms),),
+        )
+        return qs.filter(pk__in=matching)
+
+    def rebuild(self, batch_size=500):
+        from .models import Job
+
+        with connection.cursor() as cursor:
+            cursor.execute("REINDEX INDEX jobs_job_search_gin")
+            cursor.execute("REINDEX INDEX jobs_resume_search_gin")
+        return Job.objects.count()
+
+
+@cache
+def get_search_backend() -> BaseSearchBackend:
+    """
+    Backend named by settings.JOB_SEARCH_BACKEND, otherwise the best one for
+    the default database.
+    """
+    path = getattr(settings, "JOB_SEARCH_BACKEND", "")
+    if path:
+        return import_string(path)()
+    if connection.vendor == "sqlite":
+        return SQLiteFTSSearchBackend()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return SubstringSearchBackend()
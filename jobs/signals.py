@@ -0,0 +1,160 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from core.models import sync_skill_tags
+
+from . import cache, feed, matching, stats
+from .models import Application, Job, ResumeText
+from .search import get_search_backend
+
+# Sent by jobs.expiry after a chunk of expired jobs was closed with a
+# queryset update (no post_save); ``job_ids`` lists the chunk.
+jobs_closed = Signal()
+
+
+@receiver(post_save, sender=Job)
+def index_job(sender, instance, raw=False, **kwargs):
+    if raw or (
+        getattr(instance, "_loaded_title", None) == instance.title
+        and getattr(instance, "_loaded_description", None) == instance.description
+    ):
+        return
+    get_search_backend().index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job(sender, instance, **kwargs):
+    get_search_backend().remove_job(instance.pk)
+
+
+@receiver(post_delete, sender=ResumeText)
+def unindex_resume(sender, instance, **kwargs):
+    get_search_backend().remove_resume(instance.pk)
+
+
+# Job.save() resets the _loaded_* values only after every receiver ran.
+# Scoring runs against every applicant, so it is queued for the match
+# worker once the write commits instead of holding up the request.
+@receiver(post_save, sender=Job)
+def sync_job_skills(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {"skills", "is_open", "deadline"} & set(update_fields)):
+        return
+    skills_changed = created or getattr(instance, "_loaded_skills", None) != instance.skills
+    if skills_changed:
+        sync_skill_tags(instance)
+    if (
+        skills_changed
+        or getattr(instance, "_loaded_is_open", None) != instance.is_open
+        or getattr(instance, "_loaded_deadline", None) != instance.deadline
+    ):
+        matching.queue_on_commit(job_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Job)
+def drop_deleted_recommendations(sender, instance, **kwargs):
+    # Closed jobs already left the lists when they were closed.
+    if instance.is_open:
+        matching.drop_jobs([instance.pk])
+
+
+# accounts.signals syncs User.skill_tags on the same signal; accounts comes
+# before jobs in INSTALLED_APPS, so the tags are current by the time this runs.
+@receiver(post_save, sender=get_user_model())
+def refresh_user_matches(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "skills" not in update_fields):
+        return
+    if instance.role == "applicant":
+        matching.refresh_applicant(instance)
+
+
+@receiver(post_save, sender=Application)
+def score_new_application(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        matching.score_application(instance)
+
+
+@receiver(post_save, sender=Job)
+def count_job(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.job_created(instance)
+    elif getattr(instance, "_loaded_is_open", None) not in (None, instance.is_open):
+        stats.jobs_opened(instance.employer_id, 1 if instance.is_open else -1)
+
+
+@receiver(post_delete, sender=Job)
+def count_deleted_job(sender, instance, **kwargs):
+    stats.job_deleted(instance)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = getattr(instance, "_loaded_status", None)
+    instance._loaded_status = instance.status
+    if created:
+        stats.application_created(instance, instance.job.employer_id)
+    elif old_status and old_status != instance.status:
+        stats.status_changed(
+            instance.job_id, instance.job.employer_id, {instance.applicant_id: (old_status, instance.status)}
+        )
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+    employer_id = Job.objects.filter(pk=instance.job_id).values_list("employer_id", flat=True).first()
+    if employer_id is not None:
+        stats.application_deleted(instance, employer_id)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_pages(sender, instance, **kwargs):
+    cache.bump_list_version()
+    cache.bump_job_version(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_employer_pages(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Job cards show the employer's company name.
+    if not raw and update_fields is None and instance.role == "employer":
+        cache.bump_list_version()
+
+
+# Same transaction as the write: job_create/job_edit save inside atomic(),
+# as do the admin and jobs.expiry.
+@receiver(post_save, sender=Job)
+def record_job_change(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    feed.record(feed.save_kind(instance, created), [instance.pk])
+
+
+@receiver(post_delete, sender=Job)
+def record_job_deletion(sender, instance, **kwargs):
+    feed.record("deleted", [instance.pk])
+
+
+@receiver(jobs_closed)
+def record_closed_jobs(sender, job_ids, **kwargs):
+    feed.record("closed", job_ids)
+
+
+@receiver(jobs_closed)
+def count_closed_jobs(sender, job_ids, **kwargs):
+    stats.jobs_closed(job_ids)
+
+
+@receiver(jobs_closed)
+def invalidate_closed_job_pages(sender, job_ids, **kwargs):
+    cache.bump_list_version()
+    for pk in job_ids:
+        cache.bump_job_version(pk)
+
+
+@receiver(jobs_closed)
+def drop_closed_recommendations(sender, job_ids, **kwargs):
+    matching.drop_jobs(job_ids)
@@ -0,0 +1,186 @@
+"""
+Denormalized application counters for the dashboards.
+
+JobStats holds per-job counts by status, EmployerStats the same totals
+per employer plus the number of jobs and of open jobs, and ApplicantStats
+each applicant's applications by status. They are adjusted with single
+``UPDATE ... SET col = col + n`` statements from the model signals and the
+bulk write paths, so the dashboards never run COUNT/GROUP BY over Job or
+Application. ``reconcile`` rebuilds them from scratch
+(``manage.py reconcile_stats``).
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import ApplicantStats, Application, EmployerStats, Job, JobStats
+
+STATUSES = [key for key, _ in Application.STATUS_CHOICES]
+
+
+def _bump(model, filters, deltas) -> int:
+    changes = {field: F(field) + n for field, n in deltas.items() if n}
+    if not changes:
+        return 1
+    return model.objects.filter(**filters).update(**changes)
+
+
+def _apply(job_id, employer_id, deltas) -> None:
+    # A missing row (e.g. data older than the stats tables) is rebuilt from
+    # Application, which already includes the change being recorded.
+    if not _bump(JobStats, {"job_id": job_id}, deltas):
+        reconcile(job_ids=[job_id])
+    _apply_employer(employer_id, deltas)
+
+
+def _apply_employer(employer_id, deltas) -> None:
+    if not _bump(EmployerStats, {"employer_id": employer_id}, deltas):
+        reconcile(employer_ids=[employer_id])
+
+
+def _apply_applicants(applicant_ids, deltas) -> None:
+    if _bump(ApplicantStats, {"applicant_id__in": applicant_ids}, deltas) < len(applicant_ids):
+        reconcile(applicant_ids=applicant_ids)
+
+
+def job_created(job) -> None:
+    JobStats.objects.get_or_create(job=job)
+    _apply_employer(job.employer_id, {"jobs": 1, "open_jobs": int(job.is_open)})
+
+
+def jobs_created(employer_id, jobs) -> None:
+    """job_created for rows written with bulk_create (no signals)."""
+    JobStats.objects.bulk_create([JobStats(job_id=job.pk) for job in jobs], ignore_conflicts=True, batch_size=500)
+    _apply_employer(employer_id, {"jobs": len(jobs), "open_jobs": sum(job.is_open for job in jobs)})
+
+
+def jobs_opened(employer_id, n) -> None:
+    """``n`` of the employer's jobs were opened (negative: closed)."""
+    _apply_employer(employer_id, {"open_jobs": n})
+
+
+def jobs_closed(job_ids) -> None:
+    """Jobs closed with a queryset update (jobs.expiry), by id."""
+    per_employer = Job.objects.filter(pk__in=job_ids).order_by().values_list("employer_id").annotate(n=Count("pk"))
+    for employer_id, n in per_employer:
+        jobs_opened(employer_id, -n)
+
+
+def job_deleted(job) -> None:
+    # The job's cascade-deleted applications were already counted down one
+    # by one (application_deleted); only the job itself is left. No repair,
+    # as in application_deleted.
+    _bump(EmployerStats, {"employer_id": job.employer_id}, {"jobs": -1, "open_jobs": -int(job.is_open)})
+
+
+def application_created(app, employer_id) -> None:
+    deltas = {app.status: 1, "total": 1}
+    _apply(app.job_id, employer_id, deltas)
+    # A first application creates the applicant's row instead of going
+    # through reconcile; a concurrent first application may win the insert.
+    if not _bump(ApplicantStats, {"applicant_id": app.applicant_id}, deltas):
+        _, created = ApplicantStats.objects.get_or_create(applicant_id=app.applicant_id, defaults=deltas)
+        if not created:
+            _bump(ApplicantStats, {"applicant_id": app.applicant_id}, deltas)
+
+
+def application_deleted(app, employer_id) -> None:
+    # No repair here: during a cascading Job or User delete the stats rows
+    # may already be gone and must not be recreated.
+    deltas = {app.status: -1, "total": -1}
+    _bump(JobStats, {"job_id": app.job_id}, deltas)
+    _bump(EmployerStats, {"employer_id": employer_id}, deltas)
+    _bump(ApplicantStats, {"applicant_id": app.applicant_id}, deltas)
+
+
+def status_changed(job_id, employer_id, moves) -> None:
+    """
+    ``moves`` maps applicant id -> (old_status, new_status) for applications
+    to one job. The applicants' rows take one UPDATE per distinct move.
+    """
+    deltas = dict.fromkeys(STATUSES, 0)
+    by_move = defaultdict(list)
+    for applicant_id, (old, new) in moves.items():
+        deltas[old] -= 1
+        deltas[new] += 1
+        by_move[old, new].append(applicant_id)
+    _apply(job_id, employer_id, deltas)
+    for (old, new), applicant_ids in by_move.items():
+        _apply_applicants(applicant_ids, {old: -1, new: 1})
+
+
+@transaction.atomic
+def reconcile(job_ids=None, employer_ids=None, applicant_ids=None) -> int:
+    """
+    Recompute stats rows from Application/Job. With no arguments every job,
+    employer and applicant is rebuilt; returns the number of JobStats rows
+    written.
+    """
+    rebuild_all = job_ids is None and employer_ids is None and applicant_ids is None
+    written = 0
+    if rebuild_all or job_ids is not None or employer_ids is not None:
+        written = _reconcile_jobs(job_ids, employer_ids)
+    if rebuild_all or applicant_ids is not None:
+        _reconcile_applicants(applicant_ids)
+    return written
+
+
+def _reconcile_jobs(job_ids, employer_ids) -> int:
+    jobs = Job.objects.order_by()
+    if job_ids is not None:
+        jobs = jobs.filter(pk__in=job_ids)
+    if employer_ids is not None:
+        jobs = jobs.filter(employer_id__in=employer_ids)
+    job_rows = {pk: (employer, is_open) for pk, employer, is_open in jobs.values_list("pk", "employer_id", "is_open")}
+
+    per_job = {pk: dict.fromkeys(STATUSES + ["total"], 0) for pk in job_rows}
+    counts = (
+        Application.objects.filter(job_id__in=list(job_rows))
+        .order_by()
+        .values_list("job_id", "status")
+        .annotate(n=Count("pk"))
+    )
+    for job_id, status, n in counts:
+        per_job[job_id][status] += n
+        per_job[job_id]["total"] += n
+
+    JobStats.objects.filter(job_id__in=list(per_job)).delete()
+    JobStats.objects.bulk_create([JobStats(job_id=pk, **c) for pk, c in per_job.items()], batch_size=500)
+
+    # Employer rows are only complete when all of an employer's jobs were counted.
+    if job_ids is None:
+        if employer_ids is None:
+            employer_ids = {employer_id for employer_id, _ in job_rows.values()}
+            EmployerStats.objects.exclude(employer_id__in=employer_ids).delete()
+        per_employer = {pk: dict.fromkeys(STATUSES + ["total", "jobs", "open_jobs"], 0) for pk in employer_ids}
+        for job_id, (employer_id, is_open) in job_rows.items():
+            totals = per_employer[employer_id]
+            totals["jobs"] += 1
+            totals["open_jobs"] += is_open
+            for field, n in per_job[job_id].items():
+                totals[field] += n
+        EmployerStats.objects.filter(employer_id__in=list(per_employer)).delete()
+        EmployerStats.objects.bulk_create(
+            [EmployerStats(employer_id=pk, **c) for pk, c in per_employer.items()], batch_size=500
+        )
+    return len(per_job)
+
+
+def _reconcile_applicants(applicant_ids) -> None:
+    applications = Application.objects.order_by()
+    if applicant_ids is not None:
+        applications = applications.filter(applicant_id__in=applicant_ids)
+    per_applicant = {pk: dict.fromkeys(STATUSES + ["total"], 0) for pk in applicant_ids or ()}
+    for applicant_id, status, n in applications.values_list("applicant_id", "status").annotate(n=Count("pk")):
+        totals = per_applicant.setdefault(applicant_id, dict.fromkeys(STATUSES + ["total"], 0))
+        totals[status] += n
+        totals["total"] += n
+
+    stale = ApplicantStats.objects.all()
+    if applicant_ids is not None:
+        stale = stale.filter(applicant_id__in=applicant_ids)
+    stale.delete()
+    ApplicantStats.objects.bulk_create(
+        [ApplicantStats(applicant_id=pk, **c) for pk, c in per_applicant.items()], batch_size=500
+    )
@@ -0,0 +1,45 @@
+import hashlib
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each upload under the SHA-256 of its content, e.g.
+    ``resumes/ab/cd/abcd….pdf``. Identical files share one copy on disk, and
+    the name doubles as a strong ETag. The name passed by the field's
+    upload_to is only used for its extension.
+    """
+
+    def __init__(self, prefix="resumes", **kwargs):
+        self.prefix = prefix
+        super().__init__(**kwargs)
+
+    def get_available_name(self, name, max_length=None):
+        # _save picks the final, content-derived name
+        return name
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        ext = os.path.splitext(name)[1].lower()
+        name = f"{self.prefix}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{ext}"
+        if self.exists(name):
+            return name
+        # Write under a unique name and rename into place: concurrent uploads
+        # of the same content then race harmlessly, and readers never see a
+        # partial file.
+        tmp_name = super()._save(f"{name}.{uuid.uuid4().hex}.tmp", content)
+        os.replace(self.path(tmp_name), self.path(name))
+        return name
+
+
+resume_storage = ContentAddressedStorage()
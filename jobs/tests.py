@@ -1,3 +1,1296 @@
-from django.test import TestCase
+import datetime
+import importlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from functools import partial
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+
+from accounts.models import User
+
+from core.models import OutboundEmail, Skill
+from core.replicas import PIN_COOKIE, ReplicaRouter
+
+from .cache import cache_stats, get_cache
+from . import feed, matching, typeahead
+from .expiry import archive_closed, close_expired
+from .facets import get_facets
+from .filters import filter_jobs, job_filters, sort_jobs
+from .importers import import_jobs
+from .matching import jaccard_scores
+from .models import (
+    Application,
+    ApplicantStats,
+    ApplicationStatusChange,
+    ArchivedApplication,
+    ArchivedJob,
+    ArchivedResumeText,
+    ArchivedStatusChange,
+    EmployerStats,
+    Job,
+    JobChange,
+    JobStats,
+    MatchRefresh,
+    Recommendation,
+    ResumeText,
+)
+from .pdftext import MAX_STREAM_BYTES, PDFError, extract_text
+from . import resume_index
+from .resume_index import extract_pending
+from .search import FTS_TABLE, SQLiteFTSSearchBackend, SubstringSearchBackend, get_search_backend
+from .stats import reconcile
+from .triage import change_status
+from .views import applicants_for
+
+
+def make_jobs(employer, count, **fields):
+    deadline = timezone.now().date() + datetime.timedelta(days=30)
+    return [
+        Job.objects.create(
+            employer=employer,
+            title=f"Python developer {i}",
+            description="Build Django services.",
+            location="Remote",
+            skills="Python, Django",
+            deadline=deadline,
+            **fields,
+        )
+        for i in range(count)
+    ]
+
+
+def make_application(job, applicant, **fields):
+    app = Application(job=job, applicant=applicant, **fields)
+    app.resume.save("resume.pdf", ContentFile(b"%PDF-1.4 test"), save=False)
+    app.save()
+    return app
+
+
+def make_pdf(pages):
+    """A minimal PDF with one Helvetica line per string and Flate-compressed pages."""
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_num = 2 * len(pages) + 2
+    for lines in pages:
+        content = b"BT /F1 12 Tf 72 720 Td " + b" ".join(b"(%s) Tj 0 -14 Td" % line.encode() for line in lines) + b" ET"
+        data = zlib.compress(content)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(data), data))
+        objects.append(b"<< /Type /Page /Parent %d 0 R /Contents %d 0 R >>" % (pages_num, len(objects)))
+    kids = b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(len(pages)))
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d /Resources << /Font << /F1 1 0 R >> >> >>" % (kids, len(pages)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_num)
+    body = b"".join(b"%d 0 obj\n%s\nendobj\n" % (i, obj) for i, obj in enumerate(objects, start=1))
+    return b"%%PDF-1.4\n%strailer\n<< /Root %d 0 R >>\n%%%%EOF\n" % (body, len(objects))
+
+
+def _kill_worker(path):
+    os._exit(1)  # a pool worker dying mid-parse, as when OOM-killed
+
+
+_parse_resume = resume_index._parse
+
+
+def _stall_on(name, path):
+    if os.path.basename(path) == name:
+        time.sleep(60)  # a pathological PDF
+    return _parse_resume(path)
+
+
+class PortalDataMixin:
+    @classmethod
+    def setUpClass(cls):
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        cls.addClassCleanup(media_settings.disable)
+        super().setUpClass()
+
+    def setUp(self):
+        get_cache().clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employers = [
+            User.objects.create(username=f"employer{i}", email=f"e{i}@example.com", role="employer", company=f"Co {i}")
+            for i in range(3)
+        ]
+        cls.applicants = [
+            User.objects.create(username=f"applicant{i}", email=f"a{i}@example.com", role="applicant", skills="Python")
+            for i in range(4)
+        ]
+        cls.jobs = []
+        for employer in cls.employers:
+            cls.jobs += make_jobs(employer, 5)
+        cls.employer = cls.employers[0]
+        cls.applicant = cls.applicants[0]
+        cls.job = cls.jobs[0]
+        for job in cls.jobs[:6]:
+            make_application(job, cls.applicant)
+        for applicant in cls.applicants[1:]:
+            make_application(cls.job, applicant)
+
+
+class SearchTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        deadline = timezone.now().date() + datetime.timedelta(days=30)
+        self.kotlin, self.android, self.ios = [
+            Job.objects.create(employer=self.employer, title=title, description=description, deadline=deadline)
+            for title, description in [
+                ("Kotlin engineer", "Server work."),
+                ("Mobile engineer", "Android apps in Kotlin, Kotlin everywhere."),
+                ("iOS engineer", "Swift apps."),
+            ]
+        ]
+
+    def search(self, query, backend=None):
+        return list((backend or get_search_backend()).search(Job.objects.all(), query))
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5")
+    def test_fts_ranks_title_matches_first(self):
+        self.assertEqual(self.search("kotlin"), [self.kotlin, self.android])
+        self.assertEqual(self.search("kotl"), [self.kotlin, self.android])  # prefix
+        self.assertEqual(self.search("engineer swift"), [self.ios])  # every term must match
+        self.assertEqual(len(self.search("!!")), Job.objects.count())  # no terms: unfiltered
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5")
+    def test_fts_follows_saves_and_deletes(self):
+        self.ios.title = "Kotlin Multiplatform engineer"
+        self.ios.save()
+        self.assertEqual(set(self.search("multiplatform")), {self.ios})
+        self.assertIn(self.ios, self.search("kotlin"))
+        self.android.delete()
+        self.assertEqual(self.search("android"), [])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+            self.assertEqual(cursor.fetchone()[0], Job.objects.count())
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5")
+    def test_fts_matches_once_and_nests(self):
+        sql = str(get_search_backend().search(Job.objects.all(), "kotlin").query)
+        self.assertEqual(sql.count("MATCH"), 1)
+        response = self.client.get(reverse("jobs:list"), {"q": "kotlin"})  # facets nest the search
+        self.assertEqual(list(response.context["jobs"]), [self.kotlin, self.android])
+
+    def test_saves_leaving_text_alone_skip_the_index(self):
+        job = Job.objects.get(pk=self.kotlin.pk)
+        with mock.patch.object(type(get_search_backend()), "index_job") as index_job:
+            job.location = "Remote"
+            job.save()
+            index_job.assert_not_called()
+            job.description = "Server work in Kotlin."
+            job.save()
+            index_job.assert_called_once_with(job)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite FTS5")
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        self.assertEqual(self.search("kotlin"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", "--batch-size", "4", stdout=out)
+        self.assertIn(f"SQLiteFTSSearchBackend: indexed {Job.objects.count()} jobs.", out.getvalue())
+        self.assertEqual(self.search("kotlin"), [self.kotlin, self.android])
+        self.assertIsInstance(get_search_backend(), SQLiteFTSSearchBackend)
+
+    def test_substring_fallback(self):
+        backend = SubstringSearchBackend()
+        self.assertEqual(set(self.search("KOTLIN", backend)), {self.kotlin, self.android})
+        self.assertEqual(self.search("swift apps", backend), [self.ios])
+        self.assertEqual(self.search("rust", backend), [])
+
+
+class SkillFilterTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        deadline = timezone.now().date() + datetime.timedelta(days=30)
+        self.java, self.js, self.both = [
+            Job.objects.create(employer=self.employer, title=title, description="-", skills=skills, deadline=deadline)
+            for title, skills in [("Java", "Java, Spring"), ("Frontend", "JavaScript, CSS"), ("Full stack", "java, javascript")]
+        ]
+
+    def tagged(self, names, match="all"):
+        return set(Job.objects.with_skills(names, match=match))
+
+    def test_whole_skill_names_only(self):
+        # "java" used to match "javascript" as a substring.
+        self.assertEqual(self.tagged(["java"]), {self.java, self.both})
+        self.assertEqual(self.tagged(["javascript"]), {self.js, self.both})
+
+    def test_all_and_any(self):
+        self.assertEqual(self.tagged(["java", "javascript"]), {self.both})
+        self.assertEqual(self.tagged(["java", "javascript"], match="any"), {self.java, self.js, self.both})
+        self.assertEqual(self.tagged(["java", "css"]), set())
+        self.assertEqual(self.tagged(["java", "java"]), {self.java, self.both})
+        self.assertEqual(len(self.tagged([])), Job.objects.count())
+
+    def test_tags_follow_edits_and_job_list_normalizes(self):
+        self.java.skills = "Kotlin,  SPRING"
+        self.java.save()
+        self.assertEqual(sorted(self.java.skill_tags.values_list("name", flat=True)), ["kotlin", "spring"])
+        response = self.client.get(reverse("jobs:list"), {"skills": " JAVA ,JavaScript", "skills_match": "all"})
+        self.assertEqual([j.pk for j in response.context["jobs"]], [self.both.pk])
+
+    def test_api_filters_on_tags(self):
+        response = self.client.get(reverse("jobs_api:job_list"), {"skills": "Java", "fields": "title"})
+        self.assertEqual({row["id"] for row in response.json()["results"]}, {self.java.pk, self.both.pk})
+        response = self.client.get(
+            reverse("jobs_api:job_list"), {"skills": "java,css", "skills_match": "any", "fields": "title"}
+        )
+        self.assertEqual({row["id"] for row in response.json()["results"]}, {self.java.pk, self.js.pk, self.both.pk})
+
+    def test_tags_follow_profile_and_import_changes(self):
+        self.applicant.skills = "Go, RUST"
+        self.applicant.save()
+        self.assertEqual(sorted(self.applicant.skill_tags.values_list("name", flat=True)), ["go", "rust"])
+        self.applicant.skills = ""
+        self.applicant.save()
+        self.assertFalse(self.applicant.skill_tags.exists())
+
+        deadline = self.java.deadline
+        import_jobs(SimpleUploadedFile("feed.jsonl", (
+            f'{{"external_id": "J1", "title": "Java", "description": "-", "skills": "Java, Spring", "deadline": "{deadline}"}}'
+        ).encode()), self.employer, fmt="jsonl")
+        import_jobs(SimpleUploadedFile("feed.jsonl", (
+            f'{{"external_id": "J1", "title": "Java", "description": "-", "skills": "Kotlin", "deadline": "{deadline}"}}'
+        ).encode()), self.employer, fmt="jsonl")
+        upserted = Job.objects.get(employer=self.employer, external_id="J1")
+        self.assertEqual(list(upserted.skill_tags.values_list("name", flat=True)), ["kotlin"])
+        self.assertNotIn(upserted, self.tagged(["java"]))
+
+    def test_backfill_migrations(self):
+        Job.skill_tags.through.objects.all().delete()
+        User.skill_tags.through.objects.all().delete()
+        Skill.objects.all().delete()
+        importlib.import_module("jobs.migrations.0003_job_skill_tags").backfill_skill_tags(django_apps, None)
+        importlib.import_module("accounts.migrations.0002_user_skill_tags").backfill_skill_tags(django_apps, None)
+        self.assertEqual(self.tagged(["java", "javascript"]), {self.both})
+        self.assertEqual(sorted(self.js.skill_tags.values_list("name", flat=True)), ["css", "javascript"])
+        self.assertEqual(list(self.applicant.skill_tags.values_list("name", flat=True)), ["python"])
+
+
+class MatchingTests(PortalDataMixin, TestCase):
+    def make_job(self, skills):
+        deadline = timezone.now().date() + datetime.timedelta(days=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(employer=self.employer, title="Job", description="-", skills=skills, deadline=deadline)
+        matching.refresh_queued()
+        return job
+
+    def save(self, job):
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+        matching.refresh_queued()
+
+    def recommended(self, applicant):
+        return list(Recommendation.objects.filter(applicant=applicant).order_by("-score", "-job_id").values_list("job_id", "score"))
+
+    def test_jaccard_scores(self):
+        ids = dict(Skill.objects.ensure(["python", "django", "go"]).values_list("name", "id"))
+        through = Job.skill_tags.through
+        scores = jaccard_scores(through, "job_id", [ids["python"]], owners=[self.job.pk])
+        self.assertEqual(list(scores), [{"job_id": self.job.pk, "score": 0.5}])  # 1 shared of 2
+        scores = jaccard_scores(through, "job_id", list(ids.values()), owners=[self.job.pk])
+        self.assertAlmostEqual(scores.get()["score"], 2 / 3)  # 2 shared of 3
+        self.assertFalse(jaccard_scores(through, "job_id", [ids["go"]]).exists())
+
+    def test_refresh_applicant_keeps_top_n(self):
+        go = self.make_job("Python, Django, Go")
+        with mock.patch.object(matching, "TOP_N", 3):
+            self.applicant.skills = "Python, Django, Go"
+            self.applicant.save()
+        top = self.recommended(self.applicant)
+        self.assertEqual(top[0], (go.pk, 1.0))
+        self.assertEqual([score for _, score in top[1:]], [2 / 3, 2 / 3])
+        self.assertEqual(len(top), 3)
+        scores = set(Application.objects.filter(applicant=self.applicant).values_list("match_score", flat=True))
+        self.assertEqual(scores, {2 / 3})
+
+    def test_refresh_job_merges_into_full_lists(self):
+        self.applicants[1].skills = "Go"
+        self.applicants[1].save()
+        self.assertEqual(self.recommended(self.applicants[1]), [])
+        with mock.patch.object(matching, "TOP_N", 1):
+            weak = self.make_job("Go, Rust")
+            self.assertEqual(self.recommended(self.applicants[1]), [(weak.pk, 0.5)])
+            strong = self.make_job("Go")
+            wide = self.make_job("Go, Rust, C")  # does not beat the list's lowest score
+            self.assertEqual(self.recommended(self.applicants[1]), [(strong.pk, 1.0)])
+
+            # Closing the job frees the slot for the best remaining one.
+            strong.is_open = False
+            self.save(strong)
+            self.assertEqual(self.recommended(self.applicants[1]), [(weak.pk, 0.5)])
+            with self.captureOnCommitCallbacks(execute=True):
+                Job.objects.get(pk=weak.pk).delete()
+            matching.refresh_queued()
+            self.assertEqual(self.recommended(self.applicants[1]), [(wide.pk, 1 / 3)])
+
+    def test_refresh_waits_for_commit_and_the_queue(self):
+        self.applicants[1].skills = "Go"
+        self.applicants[1].save()
+        deadline = timezone.now().date() + datetime.timedelta(days=30)
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = Job.objects.create(employer=self.employer, title="Job", description="-", skills="Go", deadline=deadline)
+        self.assertFalse(MatchRefresh.objects.exists())
+        callbacks[0]()
+        self.assertEqual(list(MatchRefresh.objects.values_list("job_id", flat=True)), [job.pk])
+        self.assertEqual(self.recommended(self.applicants[1]), [])
+        out = StringIO()
+        call_command("refresh_matches", "--queued", stdout=out)
+        self.assertIn("Refreshed 1 queued matches.", out.getvalue())
+        self.assertEqual(self.recommended(self.applicants[1]), [(job.pk, 1.0)])
+        self.assertFalse(MatchRefresh.objects.exists())
+
+    def test_saves_without_matching_changes_skip_refresh(self):
+        job = Job.objects.get(pk=self.job.pk)
+        with mock.patch("jobs.matching.queue_on_commit") as queue:
+            job.title = "Renamed"
+            job.save()
+            self.client.force_login(self.employer)
+            self.client.post(reverse("jobs:edit", args=[job.pk]), {
+                "title": "Renamed again", "description": job.description, "location": job.location,
+                "job_type": job.job_type, "skills": job.skills, "deadline": job.deadline, "is_open": "on",
+            })
+            self.assertEqual(Job.objects.get(pk=job.pk).title, "Renamed again")
+            queue.assert_not_called()
+            job.skills = "Python"
+            job.save()
+            job.is_open = False
+            job.save()
+            job.save()
+            self.assertEqual(queue.call_count, 2)
+        self.assertEqual(job._loaded_is_open, False)
+        self.assertEqual(JobChange.objects.filter(job_id=job.pk, kind="closed").count(), 1)
+
+
+class QueryBudgetTests(PortalDataMixin, TestCase):
+    """
+    Fixed query counts per view, none of which may depend on the number of
+    rows rendered. Authenticated views are measured warm: the session and
+    the auth principal come from the cache and cost no queries.
+    """
+
+    def assertBudget(self, n, url, user=None):
+        if user is not None:
+            self.client.force_login(user)
+            self.client.get(url)
+        with self.assertNumQueries(n):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_job_list(self):
+        # COUNT for the paginator + the page itself + 3 for the (not yet
+        # cached) facet counts, see jobs.facets
+        self.assertBudget(5, reverse("jobs:list"))
+
+    def test_job_list_filtered(self):
+        self.assertBudget(5, reverse("jobs:list") + "?q=python&location=remote&skills=python,django")
+
+    def test_job_detail(self):
+        self.assertBudget(1, self.job.get_absolute_url())
+
+    def test_employer_jobs(self):
+        self.assertBudget(2, reverse("jobs:employer_jobs"), self.employer)
+
+    def test_my_applications(self):
+        self.assertBudget(1, reverse("jobs:my_applications"), self.applicant)
+
+    def test_job_applicants(self):
+        self.assertBudget(2, reverse("jobs:job_applicants", args=[self.job.pk]), self.employer)
+
+    def test_employer_dashboard(self):
+        self.assertBudget(2, reverse("employer_dashboard"), self.employer)
+
+    def test_applicant_dashboard(self):
+        self.assertBudget(2, reverse("applicant_dashboard"), self.applicant)
+
+    def test_admin_job_changelist(self):
+        admin = User.objects.create(username="root", role="admin", is_staff=True, is_superuser=True)
+        # paginator count, unfiltered count, page, and the password hash for
+        # the admin's "Change password" link (kept out of the principal cache)
+        self.assertBudget(4, reverse("admin:jobs_job_changelist"), admin)
+
+
+class CursorPaginationTests(PortalDataMixin, TestCase):
+    def test_walks_forward_and_back(self):
+        url = reverse("jobs:list")
+        expected = list(Job.objects.open().order_by("-created_at", "-pk").values_list("pk", flat=True))
+        self.client.get(url)  # facet counts are cached per filter set, not per page
+
+        seen, pages, cursor = [], [], None
+        while True:
+            params = {"paging": "cursor", "cursor": cursor} if cursor else {"paging": "cursor"}
+            # one range query per page, however deep
+            with self.assertNumQueries(1):
+                page = self.client.get(url, params).context["jobs"]
+            pages.append([j.pk for j in page])
+            seen += pages[-1]
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, expected)
+
+        back = self.client.get(url, {"cursor": page.previous_cursor}).context["jobs"]
+        self.assertEqual([j.pk for j in back], pages[-2])
+
+    def test_invalid_cursor_gives_first_page(self):
+        page = self.client.get(reverse("jobs:list"), {"cursor": "garbage"}).context["jobs"]
+        self.assertFalse(page.has_previous())
+        self.assertEqual(len(page), 10)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite-specific")
+class QueryPlanTests(PortalDataMixin, TestCase):
+    """Every hot queryset must be served from an index, never a full table scan."""
+
+    # "SCAN <table>" without "USING ... INDEX" is a full scan; FTS5 virtual
+    # table lookups report "SCAN ... VIRTUAL TABLE INDEX".
+    FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)\S+(?!.*\b(USING|VIRTUAL TABLE)\b)")
+
+    def assertIndexed(self, qs):
+        plan = qs.explain()
+        scans = [line for line in plan.splitlines() if self.FULL_SCAN.search(line)]
+        self.assertFalse(scans, f"Full table scan in plan for:\n{qs.query}\n\n{plan}")
+
+    def test_open_jobs(self):
+        self.assertIndexed(Job.objects.open().for_list())
+        self.assertIndexed(Job.objects.open().for_list().filter(location__icontains="remote", job_type="full_time"))
+
+    def test_open_jobs_search(self):
+        self.assertIndexed(get_search_backend().search(Job.objects.open().for_list(), "python dev"))
+
+    def test_open_jobs_by_skills(self):
+        self.assertIndexed(Job.objects.open().for_list().with_skills(["python", "django"]))
+        self.assertIndexed(Job.objects.open().for_list().with_skills(["python", "django"], match="any"))
+
+    def test_open_jobs_by_salary(self):
+        qs = Job.objects.open().for_list()
+        self.assertIndexed(qs.with_salary(50000, 80000))
+        self.assertIndexed(qs.with_salary(low=50000).by_salary())
+        self.assertIndexed(qs.with_salary(high=80000).by_salary(high=80000))
+        plan = qs.with_salary(low=50000).by_salary().explain()
+        self.assertIn("job_open_salary_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)  # ordered by the index
+
+    def test_employer_jobs(self):
+        self.assertIndexed(Job.objects.filter(employer=self.employer).for_list())
+
+    def test_my_applications(self):
+        self.assertIndexed(Application.objects.filter(applicant=self.applicant).for_applicant())
+
+    def test_job_applicants(self):
+        self.assertIndexed(applicants_for(self.job))
+        self.assertIndexed(applicants_for(self.job, q="python"))
+        self.assertIndexed(applicants_for(self.job, skill="python"))
+
+    def test_recommendations(self):
+        self.assertIndexed(Recommendation.objects.filter(applicant=self.applicant))
+
+    def test_outbox_claim(self):
+        self.assertIndexed(
+            OutboundEmail.objects.filter(status="pending", next_attempt_at__lte=timezone.now()).order_by("next_attempt_at")
+        )
+
+    def test_detects_full_scan(self):
+        with self.assertRaises(AssertionError):
+            self.assertIndexed(Job.objects.filter(description__icontains="django"))
+
+
+class PageCacheTests(PortalDataMixin, TestCase):
+    def test_anonymous_list_served_from_cache(self):
+        url = reverse("jobs:list") + "?q=Python&skills=django,python"
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        # same filters, different case and skill order
+        with self.assertNumQueries(0):
+            self.client.get(reverse("jobs:list") + "?q=python&skills=Python,%20Django")
+        self.assertEqual(cache_stats(), {"hits": 2, "misses": 1})
+
+    def test_job_save_invalidates(self):
+        job = self.jobs[-1]  # newest, so on the first list page
+        url = job.get_absolute_url()
+        self.client.get(reverse("jobs:list"))
+        self.client.get(url)
+        job.title = "Senior Python developer"
+        job.save()
+        self.assertContains(self.client.get(url), "Senior Python developer")
+        self.assertContains(self.client.get(reverse("jobs:list")), "Senior Python developer")
+
+    def test_employer_rename_refreshes_job_cards(self):
+        self.client.force_login(self.applicant)  # no page cache, only the card fragments
+        employer = self.jobs[-1].employer
+        self.assertContains(self.client.get(reverse("jobs:list")), employer.company)
+        employer.company = "Renamed Co"
+        employer.save()
+        response = self.client.get(reverse("jobs:list"))
+        self.assertContains(response, "Renamed Co")
+        self.assertNotContains(response, "Co 2<")
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_login(self.applicant)
+        self.client.get(reverse("jobs:list"))
+        self.client.get(reverse("jobs:list"))
+        self.assertEqual(cache_stats(), {"hits": 0, "misses": 0})
+
+
+class ResumeDeliveryTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.app = self.job.applications.get(applicant=self.applicant)
+        self.url = reverse("jobs:download_resume", args=[self.app.pk])
+        self.client.force_login(self.applicant)
+
+    def test_identical_uploads_share_one_file(self):
+        names = set(Application.objects.values_list("resume", flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertRegex(names.pop(), r"^resumes/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$")
+
+    def test_full_download_and_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4 test")
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, headers={"range": "bytes=1-3"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 1-3/13")
+        self.assertEqual(b"".join(response.streaming_content), b"PDF")
+        suffix = self.client.get(self.url, headers={"range": "bytes=-4"})
+        self.assertEqual(b"".join(suffix.streaming_content), b"test")
+        self.assertEqual(self.client.get(self.url, headers={"range": "bytes=50-"}).status_code, 416)
+        # stale If-Range falls back to the whole file
+        stale = self.client.get(self.url, headers={"range": "bytes=1-3", "if-range": '"old"'})
+        self.assertEqual(stale.status_code, 200)
+
+    @override_settings(RESUME_SENDFILE_BACKEND="nginx", RESUME_SENDFILE_PREFIX="/protected/")
+    def test_sendfile_offload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/" + self.app.resume.name)
+        self.assertEqual(response.content, b"")
+
+    def test_other_applicants_forbidden(self):
+        self.client.force_login(self.applicants[1])
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class JobImportTests(PortalDataMixin, TestCase):
+    def csv_file(self, *rows):
+        deadline = (timezone.now().date() + datetime.timedelta(days=10)).isoformat()
+        lines = ["external_id,title,description,location,skills,salary_min,salary_max,deadline"]
+        lines += [",".join(row).replace("{deadline}", deadline) for row in rows]
+        return SimpleUploadedFile("feed.csv", "\n".join(lines).encode())
+
+    def test_import_reports_errors_and_upserts(self):
+        feed = self.csv_file(
+            ("A1", "Rust engineer", "Systems work", "Berlin", '"Rust, rust, Go"', "", "", "{deadline}"),
+            ("A2", "Data analyst", "SQL", "Remote", "SQL", "90", "50", "{deadline}"),
+            ("", "Go developer", "Services", "Remote", "Go", "", "", "2000-01-01"),
+        )
+        result = import_jobs(feed, self.employer, batch_size=1)
+        self.assertEqual((result.created, result.updated, result.error_count), (1, 0, 2))
+        self.assertEqual([line for line, _ in result.errors], [3, 4])
+        self.assertIn("salary_max", result.errors[0][1])
+
+        job = Job.objects.get(employer=self.employer, external_id="A1")
+        self.assertEqual(job.skills, "Rust, Go")
+        self.assertEqual(sorted(job.skill_tags.values_list("name", flat=True)), ["go", "rust"])
+        self.assertTrue(JobStats.objects.filter(job=job).exists())
+        self.assertIn(job, get_search_backend().search(Job.objects.all(), "rust"))
+
+        again = import_jobs(self.csv_file(("A1", "Senior Rust engineer", "Systems", "Berlin", "Rust", "", "", "{deadline}")), self.employer)
+        self.assertEqual((again.created, again.updated), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.title, "Senior Rust engineer")
+        self.assertEqual(self.employer.job_stats.jobs, 6)
+
+        closing = f"external_id,title,description,deadline,is_open\nA1,Rust engineer,Systems,{job.deadline},no\n"
+        import_jobs(SimpleUploadedFile("feed.csv", closing.encode()), self.employer)
+        kinds = list(JobChange.objects.filter(job_id=job.pk).order_by("pk").values_list("kind", flat=True))
+        self.assertEqual(kinds, ["created", "updated", "closed"])
+
+    def test_undecodable_and_malformed_files(self):
+        deadline = (timezone.now().date() + datetime.timedelta(days=10)).isoformat()
+        feed = SimpleUploadedFile("feed.csv", (
+            "title,description,location,deadline\n"
+            f"Barista,Coffee,Caf\xe9 Central,{deadline}\n"
+            f"Baker,Bread,Paris,{deadline}\n"
+        ).encode("latin-1"))
+        result = import_jobs(feed, self.employer)
+        self.assertEqual((result.created, result.error_count), (1, 1))
+        self.assertEqual(result.errors[0][0], 2)
+        self.assertIn("UTF-8", result.errors[0][1])
+
+        feed = SimpleUploadedFile("feed.jsonl", b'{"title": "Caf\xe9"}\n')
+        self.assertIn("UTF-8", import_jobs(feed, self.employer, fmt="jsonl").errors[0][1])
+
+        feed = SimpleUploadedFile("feed.csv", b"title,description\nA,\"" + b"x" * 200_000 + b"\"\n")  # over the csv field limit
+        result = import_jobs(feed, self.employer)
+        self.assertEqual(result.error_count, 1)
+        self.assertIn("Unreadable CSV", result.errors[0][1])
+
+    def test_upload_view(self):
+        self.client.force_login(self.employer)
+        feed = SimpleUploadedFile(
+            "feed.jsonl",
+            b'{"title": "QA", "description": "Tests", "deadline": "2999-01-01"}\nnot json\n',
+        )
+        with mock.patch("jobs.matching.refresh_job") as refresh_job, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("jobs:import"), {"file": feed})
+        refresh_job.assert_not_called()
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertContains(response, "Line 2: Invalid JSON")
+        job = Job.objects.get(title="QA")
+        self.assertTrue(job.is_open)
+        self.assertEqual(list(MatchRefresh.objects.values_list("job_id", flat=True)), [job.pk])
+
+
+class StatsTests(PortalDataMixin, TestCase):
+    def counts(self, model, **filters):
+        row = model.objects.get(**filters)
+        return {key: getattr(row, key) for key in ("applied", "under_review", "rejected", "total")}
+
+    def test_apply_updates_every_counter(self):
+        self.client.force_login(self.applicants[1])
+        resume = SimpleUploadedFile("cv.pdf", make_pdf([["Python"]]), content_type="application/pdf")
+        self.client.post(reverse("jobs:apply", args=[self.jobs[1].pk]), {"cover_letter": "Hi", "resume": resume})
+        self.assertEqual(self.counts(JobStats, job=self.jobs[1])["applied"], 2)
+        self.assertEqual(self.counts(EmployerStats, employer=self.employer)["total"], 9)
+        self.assertEqual(self.counts(ApplicantStats, applicant=self.applicants[1]), {
+            "applied": 2, "under_review": 0, "rejected": 0, "total": 2,
+        })
+
+    def test_first_application_creates_the_applicant_row(self):
+        newcomer = User.objects.create_user("newcomer", password="pw", role="applicant")
+        self.client.force_login(newcomer)
+        resume = SimpleUploadedFile("cv.pdf", make_pdf([["Python"]]), content_type="application/pdf")
+        with mock.patch("jobs.stats.reconcile") as reconcile_:
+            self.client.post(reverse("jobs:apply", args=[self.jobs[1].pk]), {"resume": resume})
+        reconcile_.assert_not_called()
+        self.assertEqual(self.counts(ApplicantStats, applicant=newcomer)["applied"], 1)
+
+    def test_apply_rolls_back_as_a_whole(self):
+        self.client.force_login(self.applicants[1])
+        resume = SimpleUploadedFile("cv.pdf", make_pdf([["Python"]]), content_type="application/pdf")
+        with mock.patch("jobs.views.send_application_submitted_email", side_effect=RuntimeError("outbox")):
+            with self.assertRaises(RuntimeError), self.assertLogs("django.request", "ERROR"):
+                self.client.post(reverse("jobs:apply", args=[self.jobs[1].pk]), {"resume": resume})
+        self.assertFalse(Application.objects.filter(job=self.jobs[1], applicant=self.applicants[1]).exists())
+        self.assertEqual(self.counts(JobStats, job=self.jobs[1])["applied"], 1)
+        self.assertEqual(self.counts(ApplicantStats, applicant=self.applicants[1])["total"], 1)
+
+    def test_status_change_moves_counts(self):
+        apps = list(Application.objects.filter(job=self.job))
+        change_status(self.employer, self.job.pk, [a.pk for a in apps], "under_review")
+        app = Application.objects.get(pk=apps[0].pk)
+        app.status = "rejected"
+        app.save()
+        self.assertEqual(self.counts(JobStats, job=self.job), {"applied": 0, "under_review": 3, "rejected": 1, "total": 4})
+        self.assertEqual(self.counts(ApplicantStats, applicant=app.applicant)["rejected"], 1)
+        for applicant in self.applicants[1:]:
+            self.assertEqual(self.counts(ApplicantStats, applicant=applicant)["under_review"], int(applicant != app.applicant))
+
+    def test_delete_decrements(self):
+        Application.objects.get(job=self.jobs[1], applicant=self.applicant).delete()
+        self.assertEqual(self.counts(ApplicantStats, applicant=self.applicant)["total"], 5)
+        self.assertEqual(self.counts(EmployerStats, employer=self.employer)["total"], 7)
+        self.assertEqual(self.counts(JobStats, job=self.jobs[1])["total"], 0)
+
+    def test_job_delete_counts_down_without_recounting(self):
+        with mock.patch("jobs.stats.reconcile") as reconcile_:
+            Job.objects.filter(pk__in=[self.job.pk, self.jobs[1].pk]).delete()
+        reconcile_.assert_not_called()
+        rows = list(EmployerStats.objects.values())
+        reconcile()
+        self.assertEqual(list(EmployerStats.objects.values()), rows)
+        self.assertEqual((rows[0]["jobs"], rows[0]["open_jobs"]), (3, 3))
+
+    def test_open_jobs(self):
+        def stats():
+            return EmployerStats.objects.get(employer=self.employer).open_jobs
+
+        self.assertEqual(stats(), 5)
+        self.job.is_open = False
+        self.job.save()
+        self.assertEqual(stats(), 4)
+        self.job.is_open = True
+        self.job.save()
+        Job.objects.filter(pk=self.jobs[1].pk).update(deadline=timezone.now().date() - datetime.timedelta(days=1))
+        close_expired()
+        self.assertEqual(stats(), 4)
+        self.client.force_login(self.employer)
+        self.assertContains(self.client.get(reverse("employer_dashboard")), "<h3>4 / 5</h3>", html=True)
+
+    def test_reconcile_fixes_drift(self):
+        expected = {
+            model: list(model.objects.order_by("pk").values()) for model in (JobStats, EmployerStats, ApplicantStats)
+        }
+        JobStats.objects.update(applied=99)
+        EmployerStats.objects.update(open_jobs=0, total=1)
+        ApplicantStats.objects.filter(applicant=self.applicant).delete()
+        ApplicantStats.objects.update(under_review=7)
+        self.assertEqual(reconcile(), 15)
+        for model, rows in expected.items():
+            self.assertEqual(list(model.objects.order_by("pk").values()), rows)
+
+        ApplicantStats.objects.filter(applicant=self.applicant).delete()
+        self.client.force_login(self.applicant)
+        self.assertContains(self.client.get(reverse("applicant_dashboard")), "Applied: 0")
+        reconcile(applicant_ids=[self.applicant.pk])
+        self.assertContains(self.client.get(reverse("applicant_dashboard")), "Applied: 6")
+
+
+class ExpiryTests(PortalDataMixin, TestCase):
+    def test_close_expired_then_archive(self):
+        past = timezone.now().date() - datetime.timedelta(days=40)
+        Job.objects.filter(pk=self.job.pk).update(deadline=past)
+        Recommendation.objects.update_or_create(applicant=self.applicant, job=self.job, defaults={"score": 1.0})
+        app = Application.objects.filter(job=self.job).first()
+        change_status(self.employer, self.job.pk, [app.pk], "under_review")
+        ResumeText.objects.create(application=app, text="Python", page_count=1, skills="python")
+
+        self.assertEqual(close_expired(batch_size=1), 1)
+        self.assertEqual(close_expired(), 0)
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.is_open)
+        self.assertFalse(Recommendation.objects.filter(job=self.job).exists())
+
+        self.assertEqual(archive_closed(older_than_days=60), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_closed(older_than_days=30), 1)
+        self.assertFalse(Job.objects.filter(pk=self.job.pk).exists())
+        archived = ArchivedJob.objects.get(pk=self.job.pk)
+        self.assertEqual(archived.title, self.job.title)
+        self.assertEqual(ArchivedApplication.objects.filter(job=archived).count(), 4)
+        history = ArchivedStatusChange.objects.get(application_id=app.pk)
+        self.assertEqual((history.old_status, history.new_status, history.changed_by), ("applied", "under_review", self.employer))
+        self.assertEqual(ArchivedResumeText.objects.get(application_id=app.pk).text, "Python")
+        self.assertFalse(ApplicationStatusChange.objects.exists())
+        self.employer.job_stats.refresh_from_db()
+        self.assertEqual((self.employer.job_stats.jobs, self.employer.job_stats.total), (4, 4))
+
+
+class AsyncViewTests(PortalDataMixin, TestCase):
+    """The async views served through the ASGI handler."""
+
+    async def test_anonymous_pages(self):
+        response = await self.async_client.get(reverse("jobs:list"), {"paging": "cursor"})
+        self.assertEqual(len(response.context["jobs"]), 10)
+        response = await self.async_client.get(self.job.get_absolute_url())
+        self.assertContains(response, self.job.title)
+
+    async def test_my_applications(self):
+        await self.async_client.aforce_login(self.applicant)
+        response = await self.async_client.get(reverse("jobs:my_applications"))
+        self.assertEqual(len(response.context["applications"]), 6)
+        await self.async_client.aforce_login(self.employer)
+        response = await self.async_client.get(reverse("jobs:my_applications"))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_closed_job_visible_to_owner_only(self):
+        await Job.objects.filter(pk=self.job.pk).aupdate(is_open=False)
+        response = await self.async_client.get(self.job.get_absolute_url())
+        self.assertEqual(response.status_code, 403)
+        await self.async_client.aforce_login(self.employer)
+        response = await self.async_client.get(self.job.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRoutingTests(PortalDataMixin, TestCase):
+    """replica1 is a second SQLite database holding a deliberately stale copy."""
+
+    databases = {"default", "replica1"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # bulk_create: no signals, so nothing leaks into the primary
+        employer = User.objects.using("replica1").bulk_create(
+            [User(pk=9001, username="replica_employer", role="employer")]
+        )[0]
+        Job.objects.using("replica1").bulk_create([
+            Job(pk=9001, employer=employer, title="Replica only job", description="Stale copy.",
+                location="Remote", deadline=timezone.now().date() + datetime.timedelta(days=30)),
+        ])
+
+    def test_listing_reads_from_replica(self):
+        response = self.client.get(reverse("jobs:list"))
+        self.assertContains(response, "Replica only job")
+        self.assertNotContains(response, self.job.title)
+        self.assertEqual(self.client.get(self.job.get_absolute_url()).status_code, 404)
+
+    def test_writes_go_to_primary_and_pin_the_client(self):
+        applicant = self.applicants[1]
+        self.client.force_login(applicant)
+        response = self.client.get(reverse("jobs:my_applications"))
+        self.assertEqual(len(response.context["applications"]), 0)  # replica has none
+
+        resume = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv", content_type="application/pdf")
+        response = self.client.post(reverse("jobs:apply", args=[self.jobs[10].pk]), {"resume": resume}, follow=True)
+        self.assertIn(PIN_COOKIE, response.client.cookies)
+        self.assertTrue(Application.objects.using("default").filter(applicant=applicant, job=self.jobs[10]).exists())
+        self.assertEqual(len(response.context["applications"]), 2)  # read back from the primary
+
+    def test_primary_outside_marked_views(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Job), "default")
+        self.assertEqual(router.db_for_write(Job), "default")
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse("jobs:employer_jobs"))
+        self.assertEqual(len(response.context["jobs"]), 5)
+
+
+class ResumeExtractionTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = self.jobs[1]
+        Skill.objects.ensure(["python", "django", "kubernetes", "c++"])
+        resumes = {
+            self.applicants[1]: make_pdf([["Ada Lovelace", "Senior Python and Django engineer"], ["Kubernetes, C++"]]),
+            self.applicants[2]: make_pdf([["Grace Hopper", "COBOL compilers"]]),
+        }
+        for applicant, data in resumes.items():
+            app = Application(job=self.target, applicant=applicant)
+            app.resume.save("cv.pdf", ContentFile(data), save=False)
+            app.save()
+
+    def test_extract_text(self):
+        text, pages = extract_text(make_pdf([["Hello (world)"], ["Second page"]]))
+        self.assertEqual((text, pages), ("Hello (world)\nSecond page", 2))
+        with self.assertRaises(PDFError):
+            extract_text(b"%PDF-1.4 test")
+
+    def test_compression_bombs(self):
+        bomb = zlib.compress(b"\0" * (MAX_STREAM_BYTES + 1))
+        stream = b"99 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream\nendobj\n" % (len(bomb), bomb)
+        pdf = make_pdf([["Hello"]])
+        # Never inflated: no text is read from it.
+        unused = pdf.replace(b"trailer", stream + b"trailer")
+        self.assertEqual(extract_text(unused), ("Hello", 1))
+        with self.assertRaisesMessage(PDFError, "too large"):
+            extract_text(unused.replace(b"/Contents 2 0 R", b"/Contents 99 0 R"))
+
+    def test_dead_worker_fails_the_batch(self):
+        with mock.patch("jobs.resume_index._parse", _kill_worker):
+            self.assertEqual(extract_pending(workers=2), (0, 11))
+        self.assertIn("BrokenProcessPool", ResumeText.objects.first().error)
+        self.assertEqual(extract_pending(workers=2), (0, 0))
+
+    def test_slow_file_times_out_and_the_rest_are_parsed(self):
+        ada = Application.objects.get(applicant=self.applicants[1], job=self.target)
+        stall = partial(_stall_on, os.path.basename(ada.resume.path))
+        with mock.patch("jobs.resume_index._parse", stall):
+            self.assertEqual(extract_pending(workers=2, timeout=1), (1, 10))
+        stuck = ResumeText.objects.get(application=ada)
+        self.assertEqual(stuck.status, "failed")
+        self.assertIn("TimeoutError", stuck.error)
+        self.assertEqual(ResumeText.objects.filter(status="done").count(), 1)
+
+    def test_pipeline_stores_text_skills_and_failures(self):
+        self.assertEqual(extract_pending(workers=0), (2, 9))  # the fixture resumes are stubs
+        ada = ResumeText.objects.get(application__applicant=self.applicants[1], application__job=self.target)
+        self.assertEqual((ada.page_count, ada.status), (2, "done"))
+        self.assertIn("Senior Python and Django engineer", ada.text)
+        self.assertEqual(ada.skills_list(), ["c++", "django", "kubernetes", "python"])
+        self.assertEqual(set(ada.skill_tags.values_list("name", flat=True)), set(ada.skills_list()))
+        stub = ResumeText.objects.get(application__applicant=self.applicant, application__job=self.job)
+        self.assertEqual(stub.status, "failed")
+        self.assertEqual(extract_pending(workers=0), (0, 0))
+
+    def test_command_uses_process_pool(self):
+        out = StringIO()
+        call_command("extract_resumes", "--workers", "2", stdout=out)
+        self.assertIn("Extracted 2 resumes, 9 failed.", out.getvalue())
+
+    def test_applicants_filtered_by_resume_content(self):
+        extract_pending(workers=0)
+        self.client.force_login(self.target.employer)
+        url = reverse("jobs:job_applicants", args=[self.target.pk])
+        response = self.client.get(url, {"q": "kubernetes"})
+        self.assertEqual([a.applicant for a in response.context["applications"]], [self.applicants[1]])
+        response = self.client.get(url, {"q": "compilers"})
+        self.assertEqual([a.applicant for a in response.context["applications"]], [self.applicants[2]])
+        response = self.client.get(url, {"skill": "Django"})
+        self.assertEqual([a.applicant for a in response.context["applications"]], [self.applicants[1]])
+        self.assertContains(self.client.get(url), '<span class="tag-pill">kubernetes</span>', html=True)
+
+
+class TriageTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.apps = list(self.job.applications.order_by("pk"))
+        hired = self.apps[0]
+        hired.status = "hired"
+        hired.save()
+        self.url = reverse("jobs:bulk_update_status", args=[self.job.pk])
+        self.client.force_login(self.employer)
+
+    def test_bulk_move_skips_disallowed_transitions(self):
+        emails = OutboundEmail.objects.count()
+        response = self.client.post(self.url, {"applications": [a.pk for a in self.apps], "status": "rejected"})
+        self.assertRedirects(response, reverse("jobs:job_applicants", args=[self.job.pk]), fetch_redirect_response=False)
+
+        statuses = dict(Application.objects.filter(job=self.job).values_list("pk", "status"))
+        self.assertEqual(statuses[self.apps[0].pk], "hired")
+        self.assertEqual(sorted(statuses.values()), ["hired", "rejected", "rejected", "rejected"])
+        history = ApplicationStatusChange.objects.filter(application__job=self.job, new_status="rejected")
+        self.assertEqual(set(history.values_list("old_status", "changed_by")), {("applied", self.employer.pk)})
+        self.assertEqual(history.count(), 3)
+        self.assertEqual(OutboundEmail.objects.count(), emails + 3)
+        job_stats = JobStats.objects.get(job=self.job)
+        self.assertEqual((job_stats.applied, job_stats.rejected, job_stats.hired), (0, 3, 1))
+
+    def test_query_count_does_not_grow_with_selection(self):
+        # savepoint, SELECT, UPDATE, history, job + employer + applicant stats
+        # (one applicant UPDATE per distinct old status), outbox, release
+        with self.assertNumQueries(9):
+            change_status(self.employer, self.job.pk, [self.apps[1].pk], "under_review")
+        with self.assertNumQueries(9):
+            change_status(self.employer, self.job.pk, [a.pk for a in self.apps[2:]], "under_review")
+
+    def test_foreign_applications_are_refused(self):
+        foreign = Application.objects.exclude(job__employer=self.employer).first() or make_application(
+            self.jobs[5], self.applicants[1]
+        )
+        response = self.client.post(self.url, {"applications": [self.apps[1].pk, foreign.pk], "status": "rejected"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Application.objects.get(pk=self.apps[1].pk).status, "applied")
+        self.assertFalse(ApplicationStatusChange.objects.exists())
+
+    def test_employers_cannot_set_withdrawn(self):
+        self.client.post(self.url, {"applications": [self.apps[1].pk], "status": "withdrawn"})
+        self.assertEqual(Application.objects.get(pk=self.apps[1].pk).status, "applied")
+
+    def test_single_update_enforces_rules_and_records_history(self):
+        url = reverse("jobs:update_application_status", args=[self.apps[1].pk])
+        response = self.client.post(url, {"status": "hired"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].errors)
+        self.client.post(url, {"status": "under_review"})
+        self.assertEqual(Application.objects.get(pk=self.apps[1].pk).status, "under_review")
+        response = self.client.get(url)
+        self.assertEqual([c.new_status for c in response.context["history"]], ["under_review"])
+
+
+class JobApiTests(PortalDataMixin, TestCase):
+    url = reverse_lazy("jobs_api:job_list")
+
+    def test_sparse_fields_and_filters(self):
+        Job.objects.filter(pk=self.jobs[1].pk).update(location="Berlin")
+        response = self.client.get(self.url, {"fields": "title,location", "location": "berlin"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"], [{"id": self.jobs[1].pk, "title": self.jobs[1].title, "location": "Berlin"}]
+        )
+        self.assertEqual(self.client.get(self.url, {"fields": "title,secret"}).status_code, 400)
+
+    def test_cursor_pages_cover_open_jobs_once(self):
+        self.jobs[2].is_open = False
+        self.jobs[2].save()
+        seen, url, params = [], self.url, {"limit": 4}
+        while url:
+            with self.assertNumQueries(1):
+                body = self.client.get(url, params).json()
+            seen += [row["id"] for row in body["results"]]
+            url, params = body["next"], None
+        expected = Job.objects.open().order_by("-created_at", "-pk").values_list("pk", flat=True)
+        self.assertEqual(seen, list(expected))
+        self.assertNotIn("description", body["results"][0])
+
+    def test_unchanged_page_is_not_modified(self):
+        first = self.client.get(self.url, {"fields": "title"})
+        etag = first["ETag"]
+        cached = self.client.get(self.url, {"fields": "title"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertNotEqual(self.client.get(self.url, {"fields": "location"})["ETag"], etag)
+
+        job = Job.objects.get(pk=first.json()["results"][0]["id"])
+        job.title = "Senior Python developer"
+        job.save()
+        changed = self.client.get(self.url, {"fields": "title"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["results"][0]["title"], "Senior Python developer")
+
+    def test_detail(self):
+        url = reverse("jobs_api:job_detail", args=[self.job.pk])
+        response = self.client.get(url, {"fields": "description,skills"})
+        self.assertEqual(
+            response.json(), {"id": self.job.pk, "description": self.job.description, "skills": ["python", "django"]}
+        )
+        again = self.client.get(url, {"fields": "description,skills"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+        Job.objects.filter(pk=self.job.pk).update(is_open=False)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class JobFeedTests(PortalDataMixin, TestCase):
+    url = reverse_lazy("jobs_api:job_changes")
+
+    def setUp(self):
+        super().setUp()
+        self.since = feed.latest_sequence()
+        self.client.force_login(self.employer)
+
+    def changes(self):
+        return [(c["job_id"], c["kind"]) for c in feed.changes_since(self.since)]
+
+    def job_data(self, **fields):
+        data = {
+            "title": "Go developer", "description": "Services", "location": "Remote",
+            "job_type": "full_time", "skills": "Go", "is_open": "on",
+            "deadline": (timezone.now().date() + datetime.timedelta(days=10)).isoformat(),
+        }
+        data.update(fields)
+        return data
+
+    def test_writes_are_logged(self):
+        self.client.post(reverse("jobs:create"), self.job_data())
+        job = Job.objects.get(title="Go developer")
+        self.client.post(reverse("jobs:edit", args=[job.pk]), self.job_data(title="Go engineer"))
+        self.client.post(reverse("jobs:edit", args=[job.pk]), self.job_data(is_open=""))
+        deleted = self.jobs[1].pk
+        self.jobs[1].delete()
+        Job.objects.filter(pk=self.jobs[2].pk).update(deadline=timezone.now().date() - datetime.timedelta(days=1))
+        close_expired()
+        upload = SimpleUploadedFile("feed.jsonl", b'{"title": "QA", "description": "Tests", "deadline": "2999-01-01"}')
+        import_jobs(upload, self.employer, fmt="jsonl")
+        qa = Job.objects.get(title="QA")
+        self.assertEqual(self.changes(), [
+            (job.pk, "created"), (job.pk, "updated"), (job.pk, "closed"),
+            (deleted, "deleted"), (self.jobs[2].pk, "closed"), (qa.pk, "created"),
+        ])
+
+    def test_feed_pages_with_current_job_rows(self):
+        self.jobs[3].title = "Renamed"
+        self.jobs[3].save()
+        self.jobs[4].delete()
+        with self.assertNumQueries(2):
+            body = self.client.get(self.url, {"since": self.since, "limit": 1, "fields": "title"}).json()
+        self.assertEqual(
+            body["changes"][0] | {"changed_at": None},
+            {"seq": self.since + 1, "id": self.jobs[3].pk, "change": "updated", "changed_at": None,
+             "job": {"id": self.jobs[3].pk, "title": "Renamed"}},
+        )
+        body = self.client.get(body["next"]).json()
+        self.assertEqual([(c["change"], c["job"]) for c in body["changes"]], [("deleted", None)])
+        self.assertEqual(self.client.get(body["next"]).json()["changes"], [])
+
+        out = StringIO()
+        call_command("export_job_changes", since=self.since, fields="title", stdout=out, stderr=StringIO())
+        self.assertEqual([json.loads(line)["change"] for line in out.getvalue().splitlines()], ["updated", "deleted"])
+
+    def test_feed_waits_for_uncommitted_sequence_numbers(self):
+        now = timezone.now()
+        JobChange.objects.create(pk=self.since + 2, job_id=self.job.pk, kind="updated", changed_at=now)
+        self.assertEqual(feed.changes_since(self.since, now=now), [])
+        later = now + datetime.timedelta(seconds=feed.SETTLE_SECONDS + 1)
+        self.assertEqual([c["pk"] for c in feed.changes_since(self.since, now=later)], [self.since + 2])
+
+    def test_first_sync_waits_for_uncommitted_sequence_numbers(self):
+        JobChange.objects.all().delete()
+        now = timezone.now()
+        JobChange.objects.create(pk=2, job_id=self.job.pk, kind="created", changed_at=now)
+        self.assertEqual(feed.changes_since(0, now=now), [])
+        later = now + datetime.timedelta(seconds=feed.SETTLE_SECONDS + 1)
+        self.assertEqual([c["pk"] for c in feed.changes_since(0, now=later)], [2])
+
+
+class TypeaheadTests(PortalDataMixin, TestCase):
+    url = reverse_lazy("jobs:typeahead")
+
+    def setUp(self):
+        super().setUp()
+        typeahead.reset()
+        self.addCleanup(typeahead.reset)
+        typeahead.get_index(wait=True)
+
+    def suggest(self, field, prefix):
+        return self.client.get(self.url, {"field": field, "prefix": prefix}).json()["suggestions"]
+
+    def test_suggestions_by_field(self):
+        Job.objects.filter(pk=self.job.pk).update(location="Berlin")
+        self.assertEqual(self.suggest("q", "pyth")[:2], ["Python developer 0", "Python developer 1"])
+        self.assertEqual(len(self.suggest("q", "DEVEL")), 5)  # any word of the title
+        self.assertEqual(self.suggest("location", "re"), ["Remote"])
+        self.assertEqual(self.suggest("skills", "dj"), ["django"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest("skills", "rust"), [])
+        self.assertEqual(self.client.get(self.url, {"field": "description"}).status_code, 400)
+
+    def test_builder_follows_job_changes(self):
+        builder = typeahead.Builder()
+        builder.load()
+        rust = Job.objects.create(
+            employer=self.employer, title="Rust engineer", description="Systems", location="Berlin",
+            skills="Rust", deadline=self.job.deadline,
+        )
+        self.jobs[0].is_open = False
+        self.jobs[0].save()
+        self.assertEqual(builder.refresh(), 2)
+        index = typeahead.Index(builder.snapshot())
+        self.assertEqual(index.suggest("title", "eng"), ["Rust engineer"])
+        self.assertEqual(index.suggest("location", "b"), ["Berlin"])
+        self.assertEqual(index.suggest("skill", "ru"), ["rust"])
+        self.assertEqual(index.sequence, feed.latest_sequence())
+
+        rust.delete()
+        builder.refresh()
+        index = typeahead.Index(builder.snapshot())
+        self.assertEqual(index.suggest("title", "rust"), [])
+        self.assertEqual(builder.counts["title"]["python developer 0"], 2)
+
+    def test_requests_never_wait_for_a_build(self):
+        typeahead.reset()
+        started, release = threading.Event(), threading.Event()
+        builders = []
+
+        def build(provider):
+            builders.append(threading.current_thread())
+            started.set()
+            release.wait(5)
+            provider.index = typeahead.Index(typeahead.serialize({"skill": [("rust", "rust", 1)]}, 0))
+
+        with mock.patch.object(typeahead._Provider, "_build", build):
+            self.assertEqual(self.suggest("skills", "ru"), [])  # nothing built yet
+            started.wait(5)
+            self.assertEqual(self.suggest("skills", "ru"), [])  # still building
+            release.set()
+            typeahead._provider.building.join(5)
+        self.assertEqual(self.suggest("skills", "ru"), ["rust"])
+        self.assertEqual(len(builders), 1)
+        self.assertIsNot(builders[0], threading.current_thread())
+
+    def test_refresh_keeps_keys_sorted(self):
+        builder = typeahead.Builder()
+        builder.load()
+        for title in ("Zig hacker", "Ada developer", "Python developer 2"):
+            Job.objects.create(
+                employer=self.employer, title=title, description="-", skills="Zig, Ada", deadline=self.job.deadline
+            )
+        Job.objects.filter(title="Python developer 4").delete()
+        builder.refresh()
+        reloaded = typeahead.Builder()
+        reloaded.load()
+        self.assertEqual(builder.keys, reloaded.keys)
+        self.assertEqual(builder.snapshot(), reloaded.snapshot())
+
+    def test_snapshot_file_is_mapped(self):
+        builder = typeahead.Builder()
+        builder.load()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/typeahead.idx"
+            typeahead.write_snapshot(builder.snapshot(), path)
+            index = typeahead.open_snapshot(path)
+            self.assertEqual(index.suggest("title", "python developer 3"), ["Python developer 3"])
+            index.buf.close()
+
+
+class FacetTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Job.objects.filter(pk__in=[j.pk for j in self.jobs[:3]]).update(job_type="contract", location="Berlin")
+        Job.objects.filter(pk=self.jobs[0].pk).update(salary_min=40000, salary_max=70000)
+        Job.objects.filter(pk=self.jobs[1].pk).update(salary_min=20000)
+        Job.objects.filter(pk=self.jobs[5].pk).update(salary_max=150000)
+
+    def test_counts_for_filtered_results(self):
+        facets = get_facets(job_filters(QueryDict("job_type=contract")))
+        types = {key: n for key, _, n in facets["job_types"]}
+        # other job types are counted as if the job_type filter were not set
+        self.assertEqual((types["contract"], types["full_time"], types["remote"]), (3, 12, 0))
+        self.assertEqual(facets["locations"], [("Berlin", 3)])
+        self.assertEqual(facets["skills"], [("django", 3), ("python", 3)])
+        self.assertEqual([n for *_, n in facets["salaries"]], [1, 0, 1, 0, 1])
+
+        facets = get_facets(job_filters(QueryDict("location=berlin")))
+        self.assertEqual(facets["locations"], [("Remote", 12), ("Berlin", 3)])
+        self.assertEqual([n for *_, n in facets["salaries"]], [1, 0, 1, 0, 1])
+
+    def test_cached_per_normalized_filters(self):
+        with self.assertNumQueries(3):
+            get_facets(job_filters(QueryDict("skills=Python,Django")))
+        with self.assertNumQueries(0):
+            facets = get_facets(job_filters(QueryDict("skills=django, python")))
+        self.assertEqual(facets["skills"], [("django", 15), ("python", 15)])
+
+        self.jobs[0].skills = "Go"
+        self.jobs[0].save()
+        facets = get_facets(job_filters(QueryDict("skills=Python,Django")))
+        self.assertEqual(facets["skills"], [("django", 14), ("python", 14)])
+
+    def test_job_list_shows_counts(self):
+        response = self.client.get(reverse("jobs:list"), {"skills": "python"})
+        self.assertContains(response, "Contract (3)")
+        self.assertContains(response, "Berlin (3)")
+        self.assertNotContains(response, "python (15)")  # already filtered on
+        self.assertContains(response, "django (15)")
+
+
+class SalaryFilterTests(PortalDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        salaries = [(40000, 60000), (70000, None), (None, 45000), (90000, 120000)]
+        for job, (low, high) in zip(self.jobs, salaries):
+            Job.objects.filter(pk=job.pk).update(salary_min=low, salary_max=high)
+
+    def pks(self, query):
+        filters = job_filters(QueryDict(query))
+        return [j.pk for j in sort_jobs(filter_jobs(Job.objects.open(), filters), filters)]
+
+    def test_ranges_overlap(self):
+        jobs = [j.pk for j in self.jobs]
+        self.assertEqual(set(self.pks("salary_min=50000&salary_max=75000")), {jobs[0], jobs[1]})
+        self.assertEqual(set(self.pks("salary_min=100000")), {jobs[3]})
+        self.assertEqual(set(self.pks("salary_max=44,000")), {jobs[0]})
+        self.assertEqual(set(self.pks("salary_max=45000")), {jobs[0], jobs[2]})
+        self.assertEqual(len(self.pks("salary_min=abc")), 15)  # ignored
+        self.assertEqual(len(self.pks("salary_min=2147483648")), 15)  # out of range: ignored
+        self.assertEqual(len(self.pks("salary_max=%C2%B2")), 15)
+
+    def test_sort_by_salary(self):
+        jobs = [j.pk for j in self.jobs]
+        ordered = self.pks("sort=salary")
+        self.assertEqual(ordered[:4], [jobs[3], jobs[1], jobs[0], jobs[2]])
+        self.assertEqual(len(ordered), 15)  # jobs without a salary last
+        self.assertEqual(self.pks("sort=salary&location=remote&salary_min=60000"), [jobs[3], jobs[1], jobs[0]])
+
+    def test_job_list(self):
+        response = self.client.get(reverse("jobs:list"), {"salary_min": "50000", "sort": "salary"})
+        self.assertEqual([j.pk for j in response.context["jobs"]], [self.jobs[3].pk, self.jobs[1].pk, self.jobs[0].pk])
+        self.assertContains(response, "Salary: 90000–120000")
+        self.assertContains(response, 'value="salary" selected')
+
+        # Cursor pages are newest first, so salary order keeps offset pages.
+        response = self.client.get(reverse("jobs:list"), {"salary_min": "50000", "sort": "salary", "paging": "cursor"})
+        self.assertFalse(response.context["cursor_mode"])
+        self.assertEqual([j.pk for j in response.context["jobs"]], [self.jobs[3].pk, self.jobs[1].pk, self.jobs[0].pk])
+        self.assertTrue(self.client.get(reverse("jobs:list"), {"paging": "cursor"}).context["cursor_mode"])
+        self.assertFalse(self.client.get(reverse("jobs:list"), {"q": "python", "paging": "cursor"}).context["cursor_mode"])
+
+        response = self.client.get(reverse("jobs:list"), {"salary_max": "9" * 30, "sort": "salary"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["salary_max"], "")
+
+        response = self.client.get(reverse("jobs:list"), {"salary_max": "65000", "sort": "salary"})
+        self.assertEqual([j.pk for j in response.context["jobs"]], [self.jobs[0].pk, self.jobs[2].pk])
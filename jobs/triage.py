@@ -0,0 +1,97 @@
+"""
+Employer status changes, for one application or a whole selection.
+
+change_status() is the single write path behind update_application_status
+and the bulk form on job_applicants. However many applications are
+selected it issues:
+
+  * one SELECT that loads them and checks they belong to the job and to
+    the employer (rows are locked FOR UPDATE where the database can),
+  * one UPDATE for those whose current status allows the move
+    (Application.STATUS_TRANSITIONS), the rest are reported as skipped,
+  * one INSERT of ApplicationStatusChange history rows,
+  * the jobs.stats counter updates for the job, its employer and the
+    applicants, and
+  * one INSERT queueing every notification email in the outbox.
+
+QuerySet.update() sends no post_save, so the stats update the signal would
+have made is done here, in the same transaction.
+"""
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
+
+from . import stats
+from .emails import send_status_changed_emails
+from .models import Application, ApplicationStatusChange
+
+MAX_APPLICATIONS = 500
+STATUS_LABELS = dict(Application.STATUS_CHOICES)
+TARGET_STATUSES = [
+    key for key, _ in Application.STATUS_CHOICES
+    if any(key in targets for targets in Application.STATUS_TRANSITIONS.values())
+]
+
+
+class TriageResult:
+    def __init__(self):
+        self.changed = 0
+        self.skipped = []  # (application id, current status) the move is not allowed from
+
+    def __str__(self):
+        return f"{self.changed} updated, {len(self.skipped)} skipped"
+
+
+def change_status(user, job_id, application_ids, new_status) -> TriageResult:
+    """
+    Move the applications ``application_ids`` of job ``job_id`` to
+    ``new_status`` on behalf of ``user``. Raises PermissionDenied if any of
+    them is not an application to that job or the job is not the user's.
+    """
+    if new_status not in TARGET_STATUSES:
+        raise ValueError(f"Employers cannot set the status {new_status!r}.")
+    ids = set(application_ids)
+    if len(ids) > MAX_APPLICATIONS:
+        raise ValueError(f"At most {MAX_APPLICATIONS} applications can be changed at once.")
+
+    rows = Application.objects.filter(pk__in=ids, job_id=job_id)
+    if not user.is_superuser:
+        rows = rows.filter(job__employer=user)
+    result = TriageResult()
+
+    with transaction.atomic():
+        rows = list(
+            rows.order_by()
+            .select_for_update(of=("self",))
+            .values_list(
+                "pk", "status", "job__title", "job__employer_id", "applicant_id", "applicant__username", "applicant__email"
+            )
+        )
+        if len(rows) != len(ids):
+            raise PermissionDenied("Some applications do not belong to this job or employer.")
+
+        allowed = []
+        for row in rows:
+            if Application.can_transition(row[1], new_status):
+                allowed.append(row)
+            else:
+                result.skipped.append((row[0], row[1]))
+        if not allowed:
+            return result
+
+        now = timezone.now()
+        Application.objects.filter(pk__in=[row[0] for row in allowed]).update(status=new_status, updated_at=now)
+        ApplicationStatusChange.objects.bulk_create([
+            ApplicationStatusChange(
+                application_id=pk, old_status=old, new_status=new_status, changed_by=user, changed_at=now
+            )
+            for pk, old, *_ in allowed
+        ])
+        employer_id = allowed[0][3]
+        stats.status_changed(job_id, employer_id, {row[4]: (row[1], new_status) for row in allowed})
+        send_status_changed_emails(
+            (title, username, email, STATUS_LABELS[new_status]) for _, _, title, _, _, username, email in allowed
+        )
+
+    result.changed = len(allowed)
+    return result
@@ -0,0 +1,333 @@
+"""
+Typeahead suggestions for the job list's keyword, location and skills inputs.
+
+Suggestions come from a sorted array of (key, label, weight) records per
+field, searched with bisect: the first key >= the typed prefix, then a
+short forward scan while keys still start with it. Weights are the number
+of open jobs with the label, and the best MAX_RESULTS are returned. Titles
+are indexed under every word, so "dev" suggests "Python developer".
+
+The array is a compact binary snapshot (see Index for the layout) that is
+read in place, without unpacking it into Python objects:
+
+  * ``manage.py build_typeahead --loop`` (the ``typeahead`` process in the
+    Procfile) writes TYPEAHEAD_SNAPSHOT and every web worker mmaps it, so
+    all workers share one copy in the page cache and pick up a new file
+    within TYPEAHEAD_CHECK_SECONDS;
+  * until that file exists, or with TYPEAHEAD_SNAPSHOT empty, each process
+    builds its own snapshot on a background thread. Requests never wait for
+    a build: they answer from the previous snapshot, or with no suggestions
+    before the first one is ready.
+
+Either way the builder keeps each open job's contribution, and the index
+keys in sorted order, and follows the change feed (jobs.feed). Only the
+jobs that changed are re-read from the database and re-sorted, so keeping
+the index current costs O(changes) plus writing out the snapshot. Jobs
+past their deadline drop out when the expiry sweep closes them.
+"""
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+from core.models import parse_skills
+
+from . import feed
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("title", "location", "skill")
+SNAPSHOT_PATH = getattr(settings, "TYPEAHEAD_SNAPSHOT", "")
+CHECK_SECONDS = getattr(settings, "TYPEAHEAD_CHECK_SECONDS", 5)
+MAX_RESULTS = 10
+MAX_SCAN = 1000  # records looked at per query; short prefixes stop here
+
+MAGIC = b"JPTA"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # magic, version, field count, feed sequence
+SECTION = struct.Struct("<II")  # record count, records size in bytes
+UINT = struct.Struct("<I")
+
+
+def normalize(text) -> str:
+    return " ".join(text.lower().split())
+
+
+class Section:
+    """
+    One field's records as a read-only sequence of keys (for bisect).
+
+    Layout: record count and size, ``count + 1`` uint32 offsets, then the
+    records, each ``<uint32 weight><key>\\0<label>`` in UTF-8, sorted by key.
+    """
+
+    def __init__(self, buf, start):
+        self.buf = buf
+        self.count, size = SECTION.unpack_from(buf, start)
+        self.offsets = start + SECTION.size
+        self.data = self.offsets + UINT.size * (self.count + 1)
+        self.end = self.data + size
+
+    def __len__(self):
+        return self.count
+
+    def _bounds(self, i):
+        start = self.data + UINT.unpack_from(self.buf, self.offsets + UINT.size * i)[0]
+        end = self.data + UINT.unpack_from(self.buf, self.offsets + UINT.size * (i + 1))[0]
+        return start, end
+
+    def __getitem__(self, i):
+        start, end = self._bounds(i)
+        return bytes(self.buf[start + UINT.size : self.buf.find(b"\0", start + UINT.size, end)]).decode()
+
+    def record(self, i):
+        """(key, label, weight) of record ``i``."""
+        start, end = self._bounds(i)
+        split = self.buf.find(b"\0", start + UINT.size, end)
+        return (
+            bytes(self.buf[start + UINT.size : split]).decode(),
+            bytes(self.buf[split + 1 : end]).decode(),
+            UINT.unpack_from(self.buf, start)[0],
+        )
+
+
+class Index:
+    """A snapshot: header, then one Section per field in FIELDS order."""
+
+    def __init__(self, buf):
+        magic, version, count, self.sequence = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or count != len(FIELDS):
+            raise ValueError("Not a typeahead snapshot of this version.")
+        self.buf = buf
+        self.sections = {}
+        position = HEADER.size
+        for field in FIELDS:
+            section = Section(buf, position)
+            self.sections[field] = section
+            position = section.end
+
+    def suggest(self, field, prefix, limit=MAX_RESULTS) -> list:
+        """Labels whose key starts with ``prefix``, most open jobs first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        section = self.sections[field]
+        best = {}
+        i = bisect_left(section, prefix)
+        for i in range(i, min(i + MAX_SCAN, len(section))):
+            key, label, weight = section.record(i)
+            if not key.startswith(prefix):
+                break
+            best[label] = max(weight, best.get(label, 0))
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [label for label, _ in ranked[: max(0, min(limit, MAX_RESULTS))]]
+
+
+def index_keys(field, key):
+    """Keys a label is found under: every word start for titles."""
+    if field != "title":
+        return [key]
+    words = key.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def serialize(records, sequence) -> bytes:
+    """Snapshot bytes from ``{field: [(key, label, weight), ...]}``, each list sorted by key."""
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, len(FIELDS), sequence)]
+    for field in FIELDS:
+        offsets, data, size = [0], [], 0
+        for key, label, weight in records.get(field, ()):
+            record = UINT.pack(weight) + key.encode() + b"\0" + label.encode()
+            data.append(record)
+            size += len(record)
+            offsets.append(size)
+        parts.append(SECTION.pack(len(data), size))
+        parts.append(struct.pack(f"<{len(offsets)}I", *offsets))
+        parts.extend(data)
+    return b"".join(parts)
+
+
+class Builder:
+    """
+    Per-field label counts over open jobs, kept current from the change
+    feed: ``load()`` once, then ``refresh()`` re-reads only changed jobs.
+    """
+
+    def __init__(self):
+        self._clear()
+
+    def _clear(self):
+        self.sequence = 0
+        self.counts = {field: Counter() for field in FIELDS}
+        self.labels = {field: {} for field in FIELDS}
+        self.jobs = {}  # job id -> ((field, key), ...) it counts towards
+        # Sorted (index key, key) pairs of every counted key; None while load() scans.
+        self.keys = {field: [] for field in FIELDS}
+
+    def _terms(self, title, location, skills):
+        terms = [("title", " ".join(title.split())), ("location", " ".join(location.split()))]
+        terms += [("skill", name) for name in parse_skills(skills)]
+        return [(field, label) for field, label in terms if label]
+
+    def _add(self, pk, title, location, skills):
+        keys = []
+        for field, label in self._terms(title, location, skills):
+            key = normalize(label)
+            self.counts[field][key] += 1
+            if self.counts[field][key] == 1:
+                self.labels[field][key] = label
+                if self.keys is not None:
+                    for index_key in index_keys(field, key):
+                        insort(self.keys[field], (index_key, key))
+            keys.append((field, key))
+        self.jobs[pk] = keys
+
+    def _remove(self, pk):
+        for field, key in self.jobs.pop(pk, ()):
+            self.counts[field][key] -= 1
+            if self.counts[field][key] <= 0:
+                del self.counts[field][key]
+                del self.labels[field][key]
+                for index_key in index_keys(field, key):
+                    keys = self.keys[field]
+                    del keys[bisect_left(keys, (index_key, key))]
+
+    def _rows(self, qs):
+        return qs.values_list("pk", "title", "location", "skills")
+
+    def load(self):
+        # Sequence first: changes made during the scan are applied again by
+        # the next refresh(), which is harmless.
+        self._clear()
+        self.sequence = feed.latest_sequence()
+        self.keys = None  # sorted once below rather than inserted one by one
+        for row in self._rows(Job.objects.open().order_by()).iterator(chunk_size=2000):
+            self._add(*row)
+        self.keys = {
+            field: sorted((index_key, key) for key in self.counts[field] for index_key in index_keys(field, key))
+            for field in FIELDS
+        }
+
+    def refresh(self, batch_size=5000) -> int:
+        """Apply the change feed; returns the number of changes applied."""
+        applied = 0
+        while True:
+            changes = feed.changes_since(self.sequence, batch_size)
+            if not changes:
+                return applied
+            ids = {change["job_id"] for change in changes}
+            for pk in ids:
+                self._remove(pk)
+            for row in self._rows(Job.objects.open().filter(pk__in=ids)):
+                self._add(*row)
+            self.sequence = changes[-1]["pk"]
+            applied += len(changes)
+
+    def records(self):
+        return {
+            field: [
+                (index_key, self.labels[field][key], self.counts[field][key])
+                for index_key, key in self.keys[field]
+            ]
+            for field in FIELDS
+        }
+
+    def snapshot(self) -> bytes:
+        return serialize(self.records(), self.sequence)
+
+
+def write_snapshot(data, path):
+    """Replace ``path`` atomically, so readers map either the old or the new file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+EMPTY = Index(serialize({}, 0))
+
+
+def open_snapshot(path) -> Index:
+    with open(path, "rb") as f:
+        return Index(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class _Provider:
+    """The process's current Index, re-checked at most every CHECK_SECONDS."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.index = None
+        self.builder = None
+        self.building = None
+        self.stamp = None
+        self.checked_at = 0.0
+
+    def _from_file(self, path, wait):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return self._in_process(wait)  # builder not run yet
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self.stamp:
+            self.index, self.stamp = open_snapshot(path), stamp
+        return self.index
+
+    def _in_process(self, wait):
+        if wait:
+            self._build()
+        elif self.building is None or not self.building.is_alive():
+            self.building = threading.Thread(target=self._build_in_background, name="typeahead-build", daemon=True)
+            self.building.start()
+        return self.index or EMPTY
+
+    def _build(self):
+        with self.build_lock:
+            if self.builder is None:
+                builder = Builder()
+                builder.load()
+                self.builder = builder
+            elif not self.builder.refresh() and self.index is not None:
+                return
+            self.index = Index(self.builder.snapshot())
+
+    def _build_in_background(self):
+        try:
+            self._build()
+        except Exception:
+            logger.exception("Building the typeahead index failed")
+        finally:
+            connections.close_all()  # this thread's connections
+
+    def get(self, wait=False) -> Index:
+        if not wait and self.index is not None and time.monotonic() - self.checked_at < CHECK_SECONDS:
+            return self.index
+        with self.lock:
+            index = self._from_file(SNAPSHOT_PATH, wait) if SNAPSHOT_PATH else self._in_process(wait)
+            self.checked_at = time.monotonic()
+            return index
+
+
+_provider = _Provider()
+
+
+def get_index(wait=False) -> Index:
+    """The current index; ``wait=True`` brings it up to date first, on this thread."""
+    return _provider.get(wait)
+
+
+def reset():
+    """Forget the current index (tests)."""
+    _provider.reset()
@@ -7,16 +7,21 @@ urlpatterns = [
     
     path("", views.job_list, name="list"),
     path("<int:pk>/", views.job_detail, name="detail"),
+    path("typeahead/", views.typeahead, name="typeahead"),
 
    
     path("employer/mine/", views.employer_jobs, name="employer_jobs"),
     path("employer/create/", views.job_create, name="create"),
+    path("employer/import/", views.job_import, name="import"),
     path("employer/<int:pk>/edit/", views.job_edit, name="edit"),
 
 
     path("<int:pk>/apply/", views.apply_to_job, name="apply"),  # pk = job id
     path("applications/mine/", views.my_applications, name="my_applications"),
     path("employer/<int:pk>/applicants/", views.job_applicants, name="job_applicants"),  # pk = job id
+    path("employer/<int:pk>/applicants/status/", views.bulk_update_status, name="bulk_update_status"),  # pk = job id
     path("applications/<int:app_id>/resume/", views.download_resume, name="download_resume"),
     path("applications/<int:app_id>/status/", views.update_application_status, name="update_application_status"),
+
+    path("cache/stats/", views.page_cache_stats, name="cache_stats"),
 ]
\ No newline at end of file
@@ -1,48 +1,98 @@
+from asgiref.sync import sync_to_async
 from django.core.paginator import Paginator
-from django.db.models import Q
-from django.shortcuts import get_object_or_404, redirect, render
-from django.http import FileResponse, HttpResponseForbidden, Http404
+from django.db.models import F
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.http import HttpResponseForbidden, Http404, JsonResponse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from .emails import (
-    send_application_submitted_email,
-    send_application_status_changed_email,
-)
+from django.views.decorators.http import require_POST
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from .emails import send_application_submitted_email
 
 from accounts.decorators import role_required
+from core.replicas import read_from_replica
 from .models import Job, Application
-from .forms import JobForm
-from .forms import ApplicationForm, ApplicationStatusForm
+from .pagination import CursorPaginator, estimate_count
+from .resumes import serve_resume
+from .search import get_search_backend
+from .cache import cache_anonymous_page, cache_stats, job_detail_key, job_list_key
+from .facets import get_facets, skill_links
+from .filters import effective_sort, filter_jobs, job_filters, sort_jobs
+from .forms import JobForm, JobImportForm
+from .importers import guess_format, import_jobs
+from .forms import ApplicationForm, ApplicationStatusForm, BulkStatusForm
+from .triage import change_status
+from .typeahead import get_index as get_typeahead_index
 
+ESTIMATE_CAP = 1000
 
-def job_list(request):
-    qs = Job.objects.open()
-    q = request.GET.get("q", "").strip()
-    location = request.GET.get("location", "").strip()
-    job_type = request.GET.get("job_type", "").strip()
-    skills = request.GET.get("skills", "").strip()
 
-    if q:
-        qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
-    if location:
-        qs = qs.filter(location__icontains=location)
-    if job_type:
-        qs = qs.filter(job_type=job_type)
-    if skills:
-        wanted = [s.strip().lower() for s in skills.split(",") if s.strip()]
-        for s in wanted:
-            qs = qs.filter(skills__icontains=s)
-
-    paginator = Paginator(qs, 10)
-    page = request.GET.get("page")
-    jobs = paginator.get_page(page)
-
-    ctx = {"jobs": jobs, "q": q, "location": location, "job_type": job_type, "skills": skills}
+def _wants_cursor(request):
+    return request.GET.get("paging") == "cursor" or "cursor" in request.GET
+
+
+def _paginate(request, qs, per_page=10, cursor=True):
+    """
+    Offset pages by default; ``?paging=cursor`` (or any ``cursor``) switches
+    to keyset pages ordered by recency, with ``?count=estimate`` for an
+    approximate total. Pass ``cursor=False`` when ``qs`` has another order:
+    cursor pages would silently re-order it, so offset pages are used.
+    """
+    ctx = {"cursor_mode": False}
+    if cursor and _wants_cursor(request):
+        ctx["cursor_mode"] = True
+        ctx["jobs"] = CursorPaginator(qs, per_page).page(request.GET.get("cursor"))
+        if request.GET.get("count") == "estimate":
+            estimate = estimate_count(qs, cap=ESTIMATE_CAP)
+            ctx["estimated_count"] = f"{ESTIMATE_CAP}+" if estimate is None else estimate
+    else:
+        ctx["jobs"] = Paginator(qs, per_page).get_page(request.GET.get("page"))
+    return ctx
+
+
+async def _apaginate(request, qs, per_page=10, cursor=True):
+    """_paginate for async views: same context, rows fetched with the async ORM."""
+    ctx = {"cursor_mode": False}
+    if cursor and _wants_cursor(request):
+        ctx["cursor_mode"] = True
+        ctx["jobs"] = await CursorPaginator(qs, per_page).apage(request.GET.get("cursor"))
+        if request.GET.get("count") == "estimate":
+            estimate = await sync_to_async(estimate_count)(qs, cap=ESTIMATE_CAP)
+            ctx["estimated_count"] = f"{ESTIMATE_CAP}+" if estimate is None else estimate
+    else:
+        paginator = Paginator(qs, per_page)
+        paginator.count = await qs.acount()  # primes the cached_property
+        page = paginator.get_page(request.GET.get("page"))
+        page.object_list = [obj async for obj in page.object_list]
+        ctx["jobs"] = page
+    return ctx
+
+
+# job_list, job_detail and my_applications are async: under an ASGI server
+# (see README) a worker keeps serving other clients while these wait on the
+# database or on a slow client. Templates only see evaluated rows and the
+# resolved user, so rendering never queries.
+#
+# Read-only views are marked @read_from_replica (core.replicas); every other
+# view, and anything after a write, reads from the primary.
+@cache_anonymous_page(job_list_key)
+@read_from_replica
+async def job_list(request):
+    filters = job_filters(request.GET)
+    qs = sort_jobs(filter_jobs(Job.objects.open().for_list(), filters), filters)
+
+    ctx = await _apaginate(request, qs, cursor=effective_sort(filters) == "recent")
+    ctx.update(filters)
+    ctx["facets"] = await sync_to_async(get_facets)(filters)
+    ctx["skill_links"] = skill_links(ctx["facets"], filters)
     return render(request, "jobs/job_list.html", ctx)
 
-def job_detail(request, pk):
-    job = get_object_or_404(Job, pk=pk)
+@cache_anonymous_page(job_detail_key)
+@read_from_replica
+async def job_detail(request, pk):
+    job = await aget_object_or_404(Job.objects.for_detail(), pk=pk)
     # hide fully closed/expired job unless employer owner or admin
     if not job.is_active:
         if not request.user.is_authenticated or (not request.user.is_superuser and request.user != job.employer):
@@ -53,11 +103,8 @@ def job_detail(request, pk):
 
 @role_required("employer")
 def employer_jobs(request):
-    qs = Job.objects.filter(employer=request.user)
-    paginator = Paginator(qs, 10)
-    page = request.GET.get("page")
-    jobs = paginator.get_page(page)
-    return render(request, "jobs/employer_jobs.html", {"jobs": jobs})
+    qs = Job.objects.filter(employer=request.user).for_list()
+    return render(request, "jobs/employer_jobs.html", _paginate(request, qs))
 
 @role_required("employer")
 def job_create(request):
@@ -66,22 +113,38 @@ def job_create(request):
         if form.is_valid():
             job = form.save(commit=False)
             job.employer = request.user  # enforce ownership server-side
-            job.save()
+            with transaction.atomic():  # with its jobs.feed entry
+                job.save()
             messages.success(request, "Job created.")
             return redirect(job.get_absolute_url())
     else:
         form = JobForm()
     return render(request, "jobs/job_form.html", {"form": form, "mode": "create"})
 
+@role_required("employer")
+def job_import(request):
+    result = None
+    if request.method == "POST":
+        form = JobImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            f = form.cleaned_data["file"]
+            result = import_jobs(f, request.user, fmt=guess_format(f.name), refresh_matches=False)
+            if result.created or result.updated:
+                messages.success(request, f"Imported jobs: {result}.")
+    else:
+        form = JobImportForm()
+    return render(request, "jobs/job_import.html", {"form": form, "result": result})
+
 @role_required("employer")
 def job_edit(request, pk):
     job = get_object_or_404(Job, pk=pk)
-    if job.employer != request.user and not request.user.is_superuser:
+    if job.employer_id != request.user.pk and not request.user.is_superuser:
         return HttpResponseForbidden("You cannot edit another employer's job.")
     if request.method == "POST":
         form = JobForm(request.POST, instance=job)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             messages.success(request, "Job updated.")
             return redirect(job.get_absolute_url())
     else:
@@ -90,7 +153,7 @@ def job_edit(request, pk):
 
 @role_required("applicant")
 def apply_to_job(request, pk):
-    job = get_object_or_404(Job, pk=pk)
+    job = get_object_or_404(Job.objects.for_detail(), pk=pk)
 
     if not job.is_active:
         return HttpResponseForbidden("This job is closed or expired.")
@@ -105,12 +168,10 @@ def apply_to_job(request, pk):
             app = form.save(commit=False)
             app.job = job
             app.applicant = request.user
-            app.save()
-
-            try:
+            # The row, its stats and its outbox emails commit together.
+            with transaction.atomic():
+                app.save()
                 send_application_submitted_email(app)
-            except Exception as e:
-                print("Email failed:", e)
 
             messages.success(request, "Application submitted successfully.")
             return redirect("jobs:my_applications")
@@ -120,35 +181,59 @@ def apply_to_job(request, pk):
     return render(request, "jobs/application_form.html", {"form": form, "job": job})
 
 @role_required("applicant")
-def my_applications(request):
-    apps = Application.objects.filter(applicant=request.user).select_related("job", "job__employer")
+@read_from_replica
+async def my_applications(request):
+    apps = [a async for a in Application.objects.filter(applicant=request.user).for_applicant()]
     return render(request, "jobs/my_applications.html", {"applications": apps})
 
 
+def applicants_for(job, q="", skill=""):
+    """
+    job_applicants' rows: best match first. Resume search and skill filters
+    run against text extracted in the background (jobs.resume_index); no
+    file is opened here.
+    """
+    apps = job.applications.for_job()
+    if q:
+        apps = get_search_backend().search_resumes(apps, q)
+    if skill:
+        apps = apps.filter(resume_text__skill_tags__name=skill)
+    return apps.order_by(F("match_score").desc(nulls_last=True), "-applied_at")
+
+
 @role_required("employer")
+@read_from_replica
 def job_applicants(request, pk):
-    job = get_object_or_404(Job, pk=pk)
+    job = get_object_or_404(Job.objects.for_detail(), pk=pk)
     if job.employer != request.user and not request.user.is_superuser:
         return HttpResponseForbidden("You cannot view applicants for another employer's job.")
-    apps = job.applications.select_related("applicant")
-    return render(request, "jobs/job_applicants.html", {"job": job, "applications": apps})
+    q = request.GET.get("q", "").strip()
+    skill = request.GET.get("skill", "").strip().lower()
+    apps = applicants_for(job, q, skill)
+    return render(request, "jobs/job_applicants.html", {
+        "job": job,
+        "applications": apps,
+        "q": q,
+        "skill": skill,
+        "bulk_statuses": BulkStatusForm.base_fields["status"].choices,
+    })
 
 
 @login_required
 def download_resume(request, app_id):
-    app = get_object_or_404(Application, pk=app_id)
+    app = get_object_or_404(Application.objects.for_detail(), pk=app_id)
 
     
     if request.user.is_superuser or app.applicant == request.user or app.job.employer == request.user:
         if not app.resume:
             raise Http404("Resume not found.")
-        return FileResponse(app.resume.open("rb"), as_attachment=True, filename=f"{app.applicant.username}_resume.pdf")
+        return serve_resume(request, app.resume, f"{app.applicant.username}_resume.pdf")
     return HttpResponseForbidden("You are not allowed to download this resume.")
 
 
 @role_required("employer")
 def update_application_status(request, app_id):
-    app = get_object_or_404(Application, pk=app_id)
+    app = get_object_or_404(Application.objects.for_detail(), pk=app_id)
 
    
     if app.job.employer != request.user and not request.user.is_superuser:
@@ -157,14 +242,55 @@ def update_application_status(request, app_id):
     if request.method == "POST":
         form = ApplicationStatusForm(request.POST, instance=app)
         if form.is_valid():
-            form.save()
-            try:
-                send_application_status_changed_email(app)
-            except Exception as e:
-                print("Email failed:", e)
+            status = form.cleaned_data["status"]
+            if status != app._loaded_status:
+                change_status(request.user, app.job_id, [app.pk], status)
             messages.success(request, "Application status updated.")
             return redirect("jobs:job_applicants", pk=app.job.pk)
     else:
         form = ApplicationStatusForm(instance=app)
 
-    return render(request, "jobs/application_status_form.html", {"form": form, "application": app})
\ No newline at end of file
+    history = app.status_changes.select_related("changed_by")[:20]
+    return render(
+        request, "jobs/application_status_form.html", {"form": form, "application": app, "history": history}
+    )
+
+
+@role_required("employer")
+@require_POST
+def bulk_update_status(request, pk):
+    form = BulkStatusForm(request.POST)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            messages.error(request, " ".join(errors))
+        return redirect("jobs:job_applicants", pk=pk)
+    try:
+        result = change_status(request.user, pk, form.cleaned_data["applications"], form.cleaned_data["status"])
+    except PermissionDenied:
+        return HttpResponseForbidden("You cannot update these applications.")
+
+    label = dict(Application.STATUS_CHOICES)[form.cleaned_data["status"]]
+    if result.changed:
+        messages.success(request, f"Moved {result.changed} application(s) to {label}.")
+    if result.skipped:
+        messages.warning(request, f"Skipped {len(result.skipped)} application(s) that cannot move to {label}.")
+    return redirect("jobs:job_applicants", pk=pk)
+
+
+TYPEAHEAD_FIELDS = {"q": "title", "location": "location", "skills": "skill"}
+
+
+def typeahead(request):
+    """Suggestions for a job list filter input: ``?field=q|location|skills&prefix=...``."""
+    field = TYPEAHEAD_FIELDS.get(request.GET.get("field", ""))
+    if field is None:
+        return JsonResponse({"error": f"field must be one of {', '.join(TYPEAHEAD_FIELDS)}."}, status=400)
+    prefix = request.GET.get("prefix", "")[:100]
+    response = JsonResponse({"suggestions": get_typeahead_index().suggest(field, prefix)})
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+@role_required("admin")
+def page_cache_stats(request):
+    return JsonResponse(cache_stats())